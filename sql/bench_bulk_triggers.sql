@@ -0,0 +1,153 @@
+-- Benchmark: bulk DML cost of the business-rule triggers
+-- Compares the set-based compound triggers in oracle_triggers.sql with the previous
+-- row-level versions (one or two singleton SELECTs per row), recreated here as *_row.
+-- Each measured statement is rolled back; the script leaves data unchanged. The experiment_40k
+-- case runs one statement over more than 32767 rows, the limit of the old VARRAY id lists.
+-- Requires a populated schema (insert_auto.sql) and the privilege to create triggers.
+
+set serveroutput on
+whenever sqlerror continue
+
+prompt Creating legacy row-level triggers (disabled)
+
+CREATE OR REPLACE TRIGGER trg_experiment_date_vs_disease_row
+BEFORE INSERT OR UPDATE OF exper_date, disease_ref ON experiment_tab
+FOR EACH ROW
+DISABLE
+DECLARE
+  v_discovery_date DATE;
+BEGIN
+  SELECT d.discovery_date INTO v_discovery_date FROM disease_tab d WHERE REF(d) = :NEW.disease_ref;
+  IF :NEW.exper_date < v_discovery_date THEN
+    RAISE_APPLICATION_ERROR(-20001, 'Experiment date must be on or after the Disease discovery_date');
+  END IF;
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_future_work_requires_positive_exp_row
+BEFORE INSERT OR UPDATE OF exp_ref ON future_work_tab
+FOR EACH ROW
+DISABLE
+DECLARE
+  v_is_pos CHAR(1);
+BEGIN
+  SELECT e.is_positive INTO v_is_pos FROM experiment_tab e WHERE REF(e) = :NEW.exp_ref;
+  IF UPPER(v_is_pos) <> 'Y' THEN
+    RAISE_APPLICATION_ERROR(-20011, 'FutureWork requires a positive Experiment');
+  END IF;
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_analyze_consistency_row
+BEFORE INSERT OR UPDATE OF bio_ref, exp_ref ON analyze_tab
+FOR EACH ROW
+DISABLE
+DECLARE
+  v_condition VARCHAR2(200);
+  v_cnt NUMBER;
+BEGIN
+  SELECT b.condition INTO v_condition FROM biological_data_tab b WHERE REF(b) = :NEW.bio_ref;
+  IF LOWER(v_condition) = 'control' THEN
+    RAISE_APPLICATION_ERROR(-20005, 'Control BiologicalData cannot be analyzed in experiments attempting a disease');
+  END IF;
+  SELECT COUNT(*) INTO v_cnt
+    FROM affected_tab a
+   WHERE a.bio_ref = :NEW.bio_ref
+     AND a.disease_ref = (SELECT e.disease_ref FROM experiment_tab e WHERE REF(e) = :NEW.exp_ref);
+  IF v_cnt = 0 THEN
+    RAISE_APPLICATION_ERROR(-20006, 'BiologicalData must be affected by the same disease attempted by the Experiment');
+  END IF;
+END;
+/
+
+prompt Running bulk insert benchmark
+
+DECLARE
+  TYPE case_rec IS RECORD (label VARCHAR2(30), tab VARCHAR2(30), compound_trg VARCHAR2(60), stmt VARCHAR2(4000));
+  TYPE case_tab IS TABLE OF case_rec INDEX BY PLS_INTEGER;
+  c_cases case_tab;
+
+  FUNCTION time_stmt(p_stmt VARCHAR2, p_rows OUT NUMBER) RETURN NUMBER IS
+    v_t0 NUMBER;
+  BEGIN
+    v_t0 := DBMS_UTILITY.GET_TIME;
+    EXECUTE IMMEDIATE p_stmt;
+    p_rows := SQL%ROWCOUNT;
+    v_t0 := DBMS_UTILITY.GET_TIME - v_t0;
+    ROLLBACK;
+    RETURN v_t0 / 100;
+  END;
+
+  PROCEDURE run_case(p_case case_rec) IS
+    v_rows NUMBER;
+    v_compound NUMBER;
+    v_row NUMBER;
+  BEGIN
+    v_compound := time_stmt(p_case.stmt, v_rows);
+
+    EXECUTE IMMEDIATE 'ALTER TRIGGER ' || p_case.compound_trg || ' DISABLE';
+    EXECUTE IMMEDIATE 'ALTER TRIGGER ' || p_case.compound_trg || '_row ENABLE';
+    BEGIN
+      v_row := time_stmt(p_case.stmt, v_rows);
+    EXCEPTION WHEN OTHERS THEN
+      ROLLBACK;
+      v_row := NULL;
+      DBMS_OUTPUT.PUT_LINE(p_case.label || ': row-level run failed: ' || SQLERRM);
+    END;
+    EXECUTE IMMEDIATE 'ALTER TRIGGER ' || p_case.compound_trg || '_row DISABLE';
+    EXECUTE IMMEDIATE 'ALTER TRIGGER ' || p_case.compound_trg || ' ENABLE';
+
+    DBMS_OUTPUT.PUT_LINE(RPAD(p_case.label, 16) || ' rows=' || LPAD(v_rows, 8)
+      || '  row-level=' || TO_CHAR(v_row, '990.00') || 's'
+      || '  compound=' || TO_CHAR(v_compound, '990.00') || 's'
+      || '  speedup=' || CASE WHEN v_compound > 0 THEN TO_CHAR(v_row / v_compound, '990.0') || 'x' ELSE 'n/a' END);
+  END;
+BEGIN
+  c_cases(1).label := 'experiment_tab';
+  c_cases(1).compound_trg := 'trg_experiment_date_vs_disease';
+  c_cases(1).stmt := q'[
+    INSERT INTO experiment_tab
+    SELECT experiment_typ(e.id + 10000000, e.exper_date, e.is_positive, e.effect_description,
+                          e.disease_ref, e.treatment_ref, e.disease_id, e.treatment_id)
+      FROM experiment_tab e]';
+
+  c_cases(2).label := 'future_work_tab';
+  c_cases(2).compound_trg := 'trg_future_work_requires_positive_exp';
+  c_cases(2).stmt := q'[
+    INSERT INTO future_work_tab
+    SELECT future_work_typ(f.id + 10000000, f.title, f.exp_ref, f.pub_ref, f.exp_id, f.pub_doi)
+      FROM future_work_tab f]';
+
+  c_cases(3).label := 'analyze_tab';
+  c_cases(3).compound_trg := 'trg_analyze_consistency';
+  c_cases(3).stmt := q'[
+    INSERT INTO analyze_tab
+    SELECT analyze_typ(10000000 + ROWNUM, a.bio_ref, REF(e), a.bio_id, e.id)
+      FROM affected_tab a
+      JOIN experiment_tab e ON e.disease_id = a.disease_id
+     WHERE NOT EXISTS (SELECT 1 FROM analyze_tab z WHERE z.bio_id = a.bio_id AND z.exp_id = e.id)]';
+
+  -- More rows in one statement than a SYS.ODCINUMBERLIST (VARRAY 32767) can hold,
+  -- whatever the size of the populated schema: the id collection must not be bounded
+  c_cases(4).label := 'experiment_40k';
+  c_cases(4).compound_trg := 'trg_experiment_date_vs_disease';
+  c_cases(4).stmt := q'[
+    INSERT INTO experiment_tab
+    SELECT experiment_typ(20000000 + LEVEL, e.exper_date, e.is_positive, e.effect_description,
+                          e.disease_ref, e.treatment_ref, e.disease_id, e.treatment_id)
+      FROM (SELECT * FROM experiment_tab WHERE ROWNUM = 1) e
+    CONNECT BY LEVEL <= 40000]';
+
+  FOR i IN 1..c_cases.COUNT LOOP
+    run_case(c_cases(i));
+  END LOOP;
+END;
+/
+
+prompt Dropping legacy row-level triggers
+
+DROP TRIGGER trg_experiment_date_vs_disease_row;
+DROP TRIGGER trg_future_work_requires_positive_exp_row;
+DROP TRIGGER trg_analyze_consistency_row;
+
+prompt Benchmark finished.
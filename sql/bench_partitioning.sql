@@ -0,0 +1,128 @@
+-- Benchmark: op2 and the experiments listing at scale
+-- Run once on the plain schema and once after oracle_partitioning.sql, e.g.
+--   @bench_partitioning.sql before
+--   @oracle_partitioning.sql
+--   @bench_partitioning.sql after
+-- Densities generated by insert_auto.sql are uniform in [0.1, 100), so the op2 thresholds
+-- below select roughly 1%, 10% and 50% of the rows. Each query is fetched to completion several times; the script reports the best elapsed time,
+-- the logical reads of that run and the plan actually used. Requires a populated schema
+-- (insert_auto.sql) and SELECT on V$MYSTAT / V$STATNAME.
+
+set serveroutput on size unlimited
+set verify off
+whenever sqlerror continue
+
+define label = '&1'
+
+prompt Benchmark run: &label
+
+DECLARE
+  c_runs CONSTANT PLS_INTEGER := 5;
+
+  TYPE case_rec IS RECORD (label VARCHAR2(40), stmt VARCHAR2(4000));
+  TYPE case_tab IS TABLE OF case_rec INDEX BY PLS_INTEGER;
+  c_cases case_tab;
+
+  FUNCTION logical_reads RETURN NUMBER IS
+    v_value NUMBER;
+  BEGIN
+    SELECT m.value INTO v_value
+      FROM v$mystat m JOIN v$statname n ON n.statistic# = m.statistic#
+     WHERE n.name = 'session logical reads';
+    RETURN v_value;
+  END;
+
+  PROCEDURE run_case(p_case case_rec) IS
+    v_cur SYS_REFCURSOR;
+    v_id NUMBER;
+    v_rows NUMBER;
+    v_t0 NUMBER;
+    v_lr0 NUMBER;
+    v_best NUMBER;
+    v_best_lr NUMBER;
+  BEGIN
+    FOR i IN 1..c_runs LOOP
+      v_lr0 := logical_reads;
+      v_t0 := DBMS_UTILITY.GET_TIME;
+      v_rows := 0;
+      OPEN v_cur FOR p_case.stmt;
+      LOOP
+        FETCH v_cur INTO v_id;
+        EXIT WHEN v_cur%NOTFOUND;
+        v_rows := v_rows + 1;
+      END LOOP;
+      CLOSE v_cur;
+      v_t0 := DBMS_UTILITY.GET_TIME - v_t0;
+      v_lr0 := logical_reads - v_lr0;
+      IF v_best IS NULL OR v_t0 < v_best THEN
+        v_best := v_t0;
+        v_best_lr := v_lr0;
+      END IF;
+    END LOOP;
+
+    DBMS_OUTPUT.PUT_LINE(RPAD(p_case.label, 28) || ' rows=' || LPAD(v_rows, 8)
+      || '  best=' || TO_CHAR(v_best / 100, '990.00') || 's'
+      || '  logical reads=' || LPAD(v_best_lr, 10));
+  END;
+BEGIN
+  -- Only the id is fetched into PL/SQL, but every column of the real query stays in the
+  -- select list so the optimizer has to produce them (and can't switch to an id-only plan).
+  c_cases(1).label := 'op2 density < 1 (1%)';
+  c_cases(1).stmt := q'[
+    SELECT id FROM (
+      SELECT b.id, b.name, b.data_type, b.density, b.donor_cf, b.is_required, b.condition
+        FROM biological_data_tab b
+       WHERE b.density < 1)]';
+
+  c_cases(2).label := 'op2 density < 10 (10%)';
+  c_cases(2).stmt := REPLACE(c_cases(1).stmt, '< 1)', '< 10)');
+
+  c_cases(3).label := 'op2 density < 50 (50%)';
+  c_cases(3).stmt := REPLACE(c_cases(1).stmt, '< 1)', '< 50)');
+
+  c_cases(4).label := 'experiments listing';
+  c_cases(4).stmt := q'[
+    SELECT id FROM (
+      SELECT id, exper_date, is_positive,
+             SUBSTR(effect_description, 1, 100) AS effect_desc,
+             disease_id, treatment_id
+        FROM experiment_tab
+       ORDER BY exper_date DESC)]';
+
+  c_cases(5).label := 'experiments of last year';
+  c_cases(5).stmt := q'[
+    SELECT id FROM (
+      SELECT id, exper_date, is_positive,
+             SUBSTR(effect_description, 1, 100) AS effect_desc,
+             disease_id, treatment_id
+        FROM experiment_tab
+       WHERE exper_date >= ADD_MONTHS(TRUNC(SYSDATE, 'YYYY'), -12)
+         AND exper_date < TRUNC(SYSDATE, 'YYYY')
+       ORDER BY exper_date DESC)]';
+
+  FOR i IN 1..c_cases.COUNT LOOP
+    run_case(c_cases(i));
+  END LOOP;
+END;
+/
+
+prompt Plans used (&label)
+
+EXPLAIN PLAN SET STATEMENT_ID = 'op2' FOR
+  SELECT b.id, b.name, b.data_type, b.density, b.donor_cf, b.is_required, b.condition
+    FROM biological_data_tab b
+   WHERE b.density < 10;
+SELECT * FROM TABLE(DBMS_XPLAN.DISPLAY(NULL, 'op2', 'BASIC +PARTITION'));
+
+EXPLAIN PLAN SET STATEMENT_ID = 'experiments' FOR
+  SELECT id, exper_date, is_positive,
+         SUBSTR(effect_description, 1, 100) AS effect_desc,
+         disease_id, treatment_id
+    FROM experiment_tab
+   ORDER BY exper_date DESC;
+SELECT * FROM TABLE(DBMS_XPLAN.DISPLAY(NULL, 'experiments', 'BASIC +PARTITION'));
+
+undefine label
+undefine 1
+
+prompt Benchmark finished.
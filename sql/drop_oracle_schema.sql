@@ -3,6 +3,56 @@
 
 prompt Rimozione trigger
 
+BEGIN EXECUTE IMMEDIATE 'DROP TRIGGER trg_donors_version'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4080 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TRIGGER trg_researchers_version'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4080 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TRIGGER trg_disease_version'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4080 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TRIGGER trg_bd_version'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4080 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TRIGGER trg_treatment_version'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4080 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TRIGGER trg_drugs_version'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4080 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TRIGGER trg_allergy_version'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4080 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TRIGGER trg_publication_version'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4080 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TRIGGER trg_experiment_version'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4080 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TRIGGER trg_future_work_version'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4080 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TRIGGER trg_assign_version'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4080 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TRIGGER trg_writes_version'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4080 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TRIGGER trg_affected_version'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4080 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TRIGGER trg_cause_version'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4080 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TRIGGER trg_analyze_version'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4080 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TRIGGER trg_consider_version'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4080 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TRIGGER trg_consider_keys'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4080 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TRIGGER trg_writes_keys'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4080 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TRIGGER trg_cause_keys'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4080 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TRIGGER trg_assign_keys'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4080 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TRIGGER trg_analyze_keys'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4080 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TRIGGER trg_affected_keys'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4080 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TRIGGER trg_future_work_keys'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4080 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TRIGGER trg_experiment_keys'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4080 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TRIGGER trg_bd_keys'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4080 THEN RAISE; END IF; END;
+/
 BEGIN EXECUTE IMMEDIATE 'DROP TRIGGER trg_affected_block_if_analyze_exists'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4080 THEN RAISE; END IF; END;
 /
 BEGIN EXECUTE IMMEDIATE 'DROP TRIGGER trg_consider_uni'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4080 THEN RAISE; END IF; END;
@@ -61,6 +111,10 @@ END;
 
 prompt Rimozione tabelle di associazione
 
+BEGIN EXECUTE IMMEDIATE 'DROP TABLE table_version PURGE'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -942 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TABLE change_log PURGE'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -942 THEN RAISE; END IF; END;
+/
 BEGIN EXECUTE IMMEDIATE 'DROP TABLE consider_tab CASCADE CONSTRAINTS PURGE'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -942 THEN RAISE; END IF; END;
 /
 BEGIN EXECUTE IMMEDIATE 'DROP TABLE writes_tab CASCADE CONSTRAINTS PURGE'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -942 THEN RAISE; END IF; END;
@@ -99,6 +153,10 @@ BEGIN EXECUTE IMMEDIATE 'DROP TABLE donors_tab CASCADE CONSTRAINTS PURGE'; EXCEP
 
 prompt Rimozione tipi di oggetto (in ordine inverso di dipendenza)
 
+BEGIN EXECUTE IMMEDIATE 'DROP TYPE id_list_t FORCE'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4043 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TYPE key_list_t FORCE'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4043 THEN RAISE; END IF; END;
+/
 BEGIN EXECUTE IMMEDIATE 'DROP TYPE consider_typ FORCE'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4043 THEN RAISE; END IF; END;
 /
 BEGIN EXECUTE IMMEDIATE 'DROP TYPE writes_typ FORCE'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4043 THEN RAISE; END IF; END;
@@ -146,8 +204,14 @@ BEGIN EXECUTE IMMEDIATE 'DROP PROCEDURE proc_get_treatment_info'; EXCEPTION WHEN
 /
 BEGIN EXECUTE IMMEDIATE 'DROP PROCEDURE proc_list_donors_required_disease_with_fw'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4043 THEN NULL; END IF; END;
 /
+BEGIN EXECUTE IMMEDIATE 'DROP PROCEDURE proc_get_treatment_info_batch'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4043 THEN NULL; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP PROCEDURE proc_list_donors_required_disease_with_fw_batch'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4043 THEN NULL; END IF; END;
+/
 BEGIN EXECUTE IMMEDIATE 'DROP PROCEDURE proc_list_fw_for_top_researchers'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4043 THEN NULL; END IF; END;
 /
+BEGIN EXECUTE IMMEDIATE 'DROP PROCEDURE proc_purge_change_log'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4043 THEN NULL; END IF; END;
+/
 
 
 prompt sequence removal
@@ -163,11 +227,17 @@ BEGIN EXECUTE IMMEDIATE 'DROP SEQUENCE writes_tab_seq'; EXCEPTION WHEN OTHERS TH
 /
 BEGIN EXECUTE IMMEDIATE 'DROP SEQUENCE consider_tab_seq'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -2289 THEN RAISE; END IF; END;
 /
+BEGIN EXECUTE IMMEDIATE 'DROP SEQUENCE change_log_seq'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -2289 THEN RAISE; END IF; END;
+/
 
 
 prompt index removal
 BEGIN EXECUTE IMMEDIATE 'DROP INDEX idx_bd_density'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -1418 THEN RAISE; END IF; END;
 /
+BEGIN EXECUTE IMMEDIATE 'DROP INDEX idx_bd_density_cov'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -1418 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP INDEX idx_exp_date_cov'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -1418 THEN RAISE; END IF; END;
+/
 BEGIN EXECUTE IMMEDIATE 'DROP INDEX idx_assign_treatment_ref'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -1418 THEN RAISE; END IF; END;
 /
 BEGIN EXECUTE IMMEDIATE 'DROP INDEX idx_cause_drug_ref'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -1418 THEN RAISE; END IF; END;
@@ -188,6 +258,22 @@ BEGIN EXECUTE IMMEDIATE 'DROP INDEX idx_consider_researcher_ref'; EXCEPTION WHEN
 /
 BEGIN EXECUTE IMMEDIATE 'DROP INDEX idx_consider_future_work_ref'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -1418 THEN RAISE; END IF; END;
 /
+BEGIN EXECUTE IMMEDIATE 'DROP INDEX idx_bd_donor_cf'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -1418 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP INDEX idx_exp_disease_id'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -1418 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP INDEX idx_exp_treatment_id'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -1418 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP INDEX idx_fw_pub_doi'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -1418 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP INDEX idx_assign_drug_id'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -1418 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP INDEX idx_cause_allergy_id'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -1418 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP INDEX idx_writes_researcher_cf'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -1418 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP INDEX idx_consider_researcher_cf'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -1418 THEN RAISE; END IF; END;
+/
 
 prompt Cleanup completato.
 
@@ -0,0 +1,417 @@
+-- Incremental load of the data warehouse (dw_schema.sql) from the OLTP object tables
+-- Change tracking: ORA_ROWSCN of every source row is compared with the high-water mark (SCN of the previous
+-- successful load) kept per source table in dw_etl_state. ORA_ROWSCN is block-level unless a table was built
+-- with ROWDEPENDENCIES, so a delta can contain unchanged neighbours: every step is idempotent (dimensions are
+-- MERGEd, fact rows are deleted and reinserted per source key), re-reading them only costs time.
+-- Facts are rebuilt for the changed source keys only; precomputed aggregates are rebuilt for the
+-- treatments / diseases / researchers those fact rows moved away from or into.
+-- Deleted source rows are not visible to ORA_ROWSCN: run with p_purge_deleted => 'Y' (anti-join against the
+-- OLTP keys) or p_full => 'Y' (rebuild everything) after bulk deletes.
+--
+-- The whole load runs in one SERIALIZABLE transaction, so all sources are read as of the same snapshot and
+-- a failed load leaves the warehouse and the high-water marks untouched. Requires EXECUTE on DBMS_FLASHBACK.
+
+CREATE OR REPLACE PROCEDURE proc_dw_load (
+  p_full          IN CHAR DEFAULT 'N',
+  p_purge_deleted IN CHAR DEFAULT 'N'
+) AS
+  v_full        BOOLEAN := UPPER(p_full) = 'Y';
+  v_purge       BOOLEAN := UPPER(p_purge_deleted) = 'Y' AND NOT v_full;
+  v_mode        VARCHAR2(12) := CASE WHEN UPPER(p_full) = 'Y' THEN 'FULL' ELSE 'INCREMENTAL' END;
+  v_load_id     NUMBER;
+  v_scn         NUMBER;
+  v_rows        NUMBER := 0;
+  v_message     VARCHAR2(4000);
+
+  v_donors_scn      NUMBER := 0;
+  v_researchers_scn NUMBER := 0;
+  v_disease_scn     NUMBER := 0;
+  v_treatment_scn   NUMBER := 0;
+  v_bio_scn         NUMBER := 0;
+  v_publication_scn NUMBER := 0;
+  v_experiment_scn  NUMBER := 0;
+  v_analyze_scn     NUMBER := 0;
+  v_affected_scn    NUMBER := 0;
+  v_writes_scn      NUMBER := 0;
+  v_donors_changed  NUMBER;
+
+  PROCEDURE log_run(p_status VARCHAR2, p_text VARCHAR2 DEFAULT NULL) IS
+    PRAGMA AUTONOMOUS_TRANSACTION;
+  BEGIN
+    MERGE INTO dw_etl_run r
+    USING (SELECT v_load_id AS load_id FROM DUAL) s
+    ON (r.load_id = s.load_id)
+    WHEN MATCHED THEN UPDATE SET
+      r.status = p_status,
+      r.finished_at = SYSTIMESTAMP,
+      r.rows_loaded = v_rows,
+      r.message = p_text
+    WHEN NOT MATCHED THEN INSERT (load_id, load_mode, start_scn, status)
+      VALUES (v_load_id, v_mode, v_scn, p_status);
+    COMMIT;
+  END;
+BEGIN
+  COMMIT; -- SET TRANSACTION has to be the first statement of the transaction
+  SET TRANSACTION ISOLATION LEVEL SERIALIZABLE;
+  v_scn := DBMS_FLASHBACK.GET_SYSTEM_CHANGE_NUMBER;
+  v_load_id := dw_load_seq.NEXTVAL;
+  log_run('RUNNING');
+
+  -- One load at a time
+  LOCK TABLE dw_etl_state IN EXCLUSIVE MODE NOWAIT;
+
+  IF NOT v_full THEN
+    SELECT MAX(CASE source_table WHEN 'DONORS_TAB' THEN last_scn END),
+           MAX(CASE source_table WHEN 'RESEARCHERS_TAB' THEN last_scn END),
+           MAX(CASE source_table WHEN 'DISEASE_TAB' THEN last_scn END),
+           MAX(CASE source_table WHEN 'TREATMENT_TAB' THEN last_scn END),
+           MAX(CASE source_table WHEN 'BIOLOGICAL_DATA_TAB' THEN last_scn END),
+           MAX(CASE source_table WHEN 'PUBLICATION_TAB' THEN last_scn END),
+           MAX(CASE source_table WHEN 'EXPERIMENT_TAB' THEN last_scn END),
+           MAX(CASE source_table WHEN 'ANALYZE_TAB' THEN last_scn END),
+           MAX(CASE source_table WHEN 'AFFECTED_TAB' THEN last_scn END),
+           MAX(CASE source_table WHEN 'WRITES_TAB' THEN last_scn END)
+      INTO v_donors_scn, v_researchers_scn, v_disease_scn, v_treatment_scn, v_bio_scn,
+           v_publication_scn, v_experiment_scn, v_analyze_scn, v_affected_scn, v_writes_scn
+      FROM dw_etl_state;
+  ELSE
+    DELETE FROM dw_research_progress_fact;
+    DELETE FROM dw_disease_incidence_fact;
+    DELETE FROM dw_publication_output_fact;
+    DELETE FROM dw_agg_treatment_success;
+    DELETE FROM dw_agg_disease_progress;
+    DELETE FROM dw_agg_disease_prevalence;
+    DELETE FROM dw_agg_researcher_output;
+  END IF;
+
+  ------------------------------------------------------------------------------
+  -- Dimensions
+  ------------------------------------------------------------------------------
+  MERGE INTO dw_donor_dim d
+  USING (
+    SELECT CF, sex, age,
+           CASE WHEN age IS NULL THEN 'unknown'
+                WHEN age < 18 THEN '0-17'
+                WHEN age < 30 THEN '18-29'
+                WHEN age < 45 THEN '30-44'
+                WHEN age < 60 THEN '45-59'
+                WHEN age < 75 THEN '60-74'
+                ELSE '75+' END AS age_band
+      FROM donors_tab
+     WHERE ORA_ROWSCN > v_donors_scn
+  ) s
+  ON (d.donor_cf = s.CF)
+  WHEN MATCHED THEN UPDATE SET d.sex = s.sex, d.age = s.age, d.age_band = s.age_band
+  WHEN NOT MATCHED THEN INSERT (donor_cf, sex, age, age_band) VALUES (s.CF, s.sex, s.age, s.age_band);
+  v_donors_changed := SQL%ROWCOUNT;
+
+  MERGE INTO dw_researcher_dim d
+  USING (
+    SELECT CF, name, surname, TRUNC(MONTHS_BETWEEN(SYSDATE, birth) / 12) AS age
+      FROM researchers_tab
+     WHERE ORA_ROWSCN > v_researchers_scn
+  ) s
+  ON (d.researcher_cf = s.CF)
+  WHEN MATCHED THEN UPDATE SET d.name = s.name, d.surname = s.surname, d.age = s.age
+  WHEN NOT MATCHED THEN INSERT (researcher_cf, name, surname, age) VALUES (s.CF, s.name, s.surname, s.age);
+
+  MERGE INTO dw_disease_dim d
+  USING (SELECT id, name, discovery_date FROM disease_tab WHERE ORA_ROWSCN > v_disease_scn) s
+  ON (d.disease_id = s.id)
+  WHEN MATCHED THEN UPDATE SET d.name = s.name, d.discovery_date = s.discovery_date
+  WHEN NOT MATCHED THEN INSERT (disease_id, name, discovery_date) VALUES (s.id, s.name, s.discovery_date);
+
+  MERGE INTO dw_treatment_dim d
+  USING (SELECT id, name, success_percentage FROM treatment_tab WHERE ORA_ROWSCN > v_treatment_scn) s
+  ON (d.treatment_id = s.id)
+  WHEN MATCHED THEN UPDATE SET d.name = s.name, d.success_percentage = s.success_percentage
+  WHEN NOT MATCHED THEN INSERT (treatment_id, name, success_percentage) VALUES (s.id, s.name, s.success_percentage);
+
+  MERGE INTO dw_bio_data_dim d
+  USING (
+    SELECT id, LOWER(data_type) AS data_type, density, LOWER(condition) AS condition, UPPER(is_required) AS is_required
+      FROM biological_data_tab
+     WHERE ORA_ROWSCN > v_bio_scn
+  ) s
+  ON (d.bio_id = s.id)
+  WHEN MATCHED THEN UPDATE SET d.data_type = s.data_type, d.density = s.density,
+                               d.condition = s.condition, d.is_required = s.is_required
+  WHEN NOT MATCHED THEN INSERT (bio_id, data_type, density, condition, is_required)
+    VALUES (s.id, s.data_type, s.density, s.condition, s.is_required);
+
+  MERGE INTO dw_publication_dim d
+  USING (
+    SELECT DOI, LOWER(quality) AS quality, publisher,
+           CASE LOWER(quality) WHEN 'top' THEN 3 WHEN 'middle' THEN 2 WHEN 'low' THEN 1 END AS quality_score
+      FROM publication_tab
+     WHERE ORA_ROWSCN > v_publication_scn
+  ) s
+  ON (d.doi = s.DOI)
+  WHEN MATCHED THEN UPDATE SET d.quality = s.quality, d.quality_score = s.quality_score, d.publisher = s.publisher
+  WHEN NOT MATCHED THEN INSERT (doi, quality, quality_score, publisher)
+    VALUES (s.DOI, s.quality, s.quality_score, s.publisher);
+
+  ------------------------------------------------------------------------------
+  -- ResearchProgress: rebuilt per changed experiment (the experiment row or any of its analyze rows)
+  ------------------------------------------------------------------------------
+  INSERT INTO dw_etl_delta (kind, id)
+  SELECT 'EXPERIMENT', id FROM experiment_tab WHERE ORA_ROWSCN > v_experiment_scn
+  UNION
+  SELECT 'EXPERIMENT', exp_id FROM analyze_tab WHERE ORA_ROWSCN > v_analyze_scn;
+
+  IF v_purge THEN
+    INSERT INTO dw_etl_delta (kind, id)
+    SELECT DISTINCT 'EXPERIMENT', f.experiment_id
+      FROM dw_research_progress_fact f
+     WHERE NOT EXISTS (SELECT 1 FROM experiment_tab e WHERE e.id = f.experiment_id)
+        OR (f.bio_id <> 0
+            AND NOT EXISTS (SELECT 1 FROM analyze_tab a WHERE a.exp_id = f.experiment_id AND a.bio_id = f.bio_id));
+  END IF;
+
+  INSERT INTO dw_etl_touched (kind, key_value)
+  SELECT 'TREATMENT', TO_CHAR(f.treatment_id)
+    FROM dw_research_progress_fact f
+   WHERE f.experiment_id IN (SELECT id FROM dw_etl_delta WHERE kind = 'EXPERIMENT')
+  UNION
+  SELECT 'DISEASE', TO_CHAR(f.disease_id)
+    FROM dw_research_progress_fact f
+   WHERE f.experiment_id IN (SELECT id FROM dw_etl_delta WHERE kind = 'EXPERIMENT');
+
+  DELETE FROM dw_research_progress_fact
+   WHERE experiment_id IN (SELECT id FROM dw_etl_delta WHERE kind = 'EXPERIMENT');
+
+  MERGE INTO dw_time_dim t
+  USING (
+    SELECT DISTINCT TRUNC(e.exper_date) AS day_date
+      FROM experiment_tab e
+     WHERE e.id IN (SELECT id FROM dw_etl_delta WHERE kind = 'EXPERIMENT')
+  ) s
+  ON (t.time_id = TO_NUMBER(TO_CHAR(s.day_date, 'YYYYMMDD')))
+  WHEN NOT MATCHED THEN INSERT (time_id, day_date, day, week, month, quarter, year)
+    VALUES (TO_NUMBER(TO_CHAR(s.day_date, 'YYYYMMDD')), s.day_date,
+            EXTRACT(DAY FROM s.day_date), TO_NUMBER(TO_CHAR(s.day_date, 'IW')),
+            EXTRACT(MONTH FROM s.day_date), TO_NUMBER(TO_CHAR(s.day_date, 'Q')),
+            EXTRACT(YEAR FROM s.day_date));
+
+  INSERT INTO dw_research_progress_fact
+    (experiment_id, bio_id, time_id, disease_id, treatment_id, area_id, is_positive, load_id)
+  SELECT e.id,
+         NVL(a.bio_id, 0),
+         TO_NUMBER(TO_CHAR(e.exper_date, 'YYYYMMDD')),
+         e.disease_id,
+         e.treatment_id,
+         0,
+         CASE WHEN UPPER(e.is_positive) = 'Y' THEN 1 ELSE 0 END,
+         v_load_id
+    FROM experiment_tab e
+    LEFT JOIN analyze_tab a ON a.exp_id = e.id
+   WHERE e.id IN (SELECT id FROM dw_etl_delta WHERE kind = 'EXPERIMENT');
+  v_rows := v_rows + SQL%ROWCOUNT;
+
+  INSERT INTO dw_etl_touched (kind, key_value)
+  SELECT 'TREATMENT', TO_CHAR(treatment_id) FROM dw_research_progress_fact WHERE load_id = v_load_id
+  UNION
+  SELECT 'DISEASE', TO_CHAR(disease_id) FROM dw_research_progress_fact WHERE load_id = v_load_id;
+
+  ------------------------------------------------------------------------------
+  -- DiseaseIncidence: rebuilt per changed affected row (or changed sample, whose donor may have changed)
+  ------------------------------------------------------------------------------
+  INSERT INTO dw_etl_delta (kind, id)
+  SELECT 'AFFECTED', id FROM affected_tab WHERE ORA_ROWSCN > v_affected_scn
+  UNION
+  SELECT 'AFFECTED', a.id
+    FROM affected_tab a
+   WHERE a.bio_id IN (SELECT id FROM biological_data_tab WHERE ORA_ROWSCN > v_bio_scn);
+
+  IF v_purge THEN
+    INSERT INTO dw_etl_delta (kind, id)
+    SELECT 'AFFECTED', f.affected_id
+      FROM dw_disease_incidence_fact f
+     WHERE NOT EXISTS (SELECT 1 FROM affected_tab a WHERE a.id = f.affected_id);
+  END IF;
+
+  -- Diseases whose prevalence moves: rows being rebuilt, and rows of donors whose sex/age changed
+  INSERT INTO dw_etl_touched (kind, key_value)
+  SELECT DISTINCT 'DISEASE', TO_CHAR(f.disease_id)
+    FROM dw_disease_incidence_fact f
+   WHERE f.affected_id IN (SELECT id FROM dw_etl_delta WHERE kind = 'AFFECTED')
+      OR f.donor_cf IN (SELECT CF FROM donors_tab WHERE ORA_ROWSCN > v_donors_scn);
+
+  DELETE FROM dw_disease_incidence_fact
+   WHERE affected_id IN (SELECT id FROM dw_etl_delta WHERE kind = 'AFFECTED');
+
+  INSERT INTO dw_disease_incidence_fact (affected_id, disease_id, bio_id, donor_cf, area_id, load_id)
+  SELECT a.id, a.disease_id, a.bio_id, b.donor_cf, 0, v_load_id
+    FROM affected_tab a
+    JOIN biological_data_tab b ON b.id = a.bio_id
+   WHERE a.id IN (SELECT id FROM dw_etl_delta WHERE kind = 'AFFECTED');
+  v_rows := v_rows + SQL%ROWCOUNT;
+
+  INSERT INTO dw_etl_touched (kind, key_value)
+  SELECT DISTINCT 'DISEASE', TO_CHAR(disease_id) FROM dw_disease_incidence_fact WHERE load_id = v_load_id;
+
+  ------------------------------------------------------------------------------
+  -- PublicationOutput: rebuilt per changed writes row (or changed publication, whose quality may have changed)
+  ------------------------------------------------------------------------------
+  INSERT INTO dw_etl_delta (kind, id)
+  SELECT 'WRITES', id FROM writes_tab WHERE ORA_ROWSCN > v_writes_scn
+  UNION
+  SELECT 'WRITES', w.id
+    FROM writes_tab w
+   WHERE w.publication_doi IN (SELECT DOI FROM publication_tab WHERE ORA_ROWSCN > v_publication_scn);
+
+  IF v_purge THEN
+    INSERT INTO dw_etl_delta (kind, id)
+    SELECT 'WRITES', f.writes_id
+      FROM dw_publication_output_fact f
+     WHERE NOT EXISTS (SELECT 1 FROM writes_tab w WHERE w.id = f.writes_id);
+  END IF;
+
+  INSERT INTO dw_etl_touched (kind, key_value)
+  SELECT DISTINCT 'RESEARCHER', f.researcher_cf
+    FROM dw_publication_output_fact f
+   WHERE f.writes_id IN (SELECT id FROM dw_etl_delta WHERE kind = 'WRITES');
+
+  DELETE FROM dw_publication_output_fact
+   WHERE writes_id IN (SELECT id FROM dw_etl_delta WHERE kind = 'WRITES');
+
+  INSERT INTO dw_publication_output_fact (writes_id, researcher_cf, doi, time_id, area_id, quality_score, load_id)
+  SELECT w.id, w.researcher_cf, w.publication_doi, 0, 0, p.quality_score, v_load_id
+    FROM writes_tab w
+    JOIN dw_publication_dim p ON p.doi = w.publication_doi
+   WHERE w.id IN (SELECT id FROM dw_etl_delta WHERE kind = 'WRITES');
+  v_rows := v_rows + SQL%ROWCOUNT;
+
+  INSERT INTO dw_etl_touched (kind, key_value)
+  SELECT DISTINCT 'RESEARCHER', researcher_cf FROM dw_publication_output_fact WHERE load_id = v_load_id;
+
+  ------------------------------------------------------------------------------
+  -- Precomputed aggregates (from the DW facts only, for the touched keys)
+  ------------------------------------------------------------------------------
+  DELETE FROM dw_agg_treatment_success
+   WHERE treatment_id IN (SELECT TO_NUMBER(key_value) FROM dw_etl_touched WHERE kind = 'TREATMENT');
+
+  INSERT INTO dw_agg_treatment_success (treatment_id, num_experiments, num_positive, success_rate)
+  SELECT treatment_id, num_experiments, num_positive, ROUND(num_positive / num_experiments, 4)
+    FROM (SELECT treatment_id,
+                 COUNT(DISTINCT experiment_id) AS num_experiments,
+                 COUNT(DISTINCT CASE WHEN is_positive = 1 THEN experiment_id END) AS num_positive
+            FROM dw_research_progress_fact
+           WHERE treatment_id IN (SELECT TO_NUMBER(key_value) FROM dw_etl_touched WHERE kind = 'TREATMENT')
+           GROUP BY treatment_id);
+
+  DELETE FROM dw_agg_disease_progress
+   WHERE disease_id IN (SELECT TO_NUMBER(key_value) FROM dw_etl_touched WHERE kind = 'DISEASE');
+
+  INSERT INTO dw_agg_disease_progress (disease_id, year, num_experiments, num_positive, success_rate)
+  SELECT disease_id, year, num_experiments, num_positive, ROUND(num_positive / num_experiments, 4)
+    FROM (SELECT disease_id,
+                 TRUNC(time_id / 10000) AS year,
+                 COUNT(DISTINCT experiment_id) AS num_experiments,
+                 COUNT(DISTINCT CASE WHEN is_positive = 1 THEN experiment_id END) AS num_positive
+            FROM dw_research_progress_fact
+           WHERE disease_id IN (SELECT TO_NUMBER(key_value) FROM dw_etl_touched WHERE kind = 'DISEASE')
+           GROUP BY disease_id, TRUNC(time_id / 10000));
+
+  UPDATE dw_disease_dim d
+     SET d.is_treatable = CASE WHEN EXISTS (SELECT 1 FROM dw_research_progress_fact f
+                                             WHERE f.disease_id = d.disease_id AND f.is_positive = 1)
+                               THEN 'Y' ELSE 'N' END
+   WHERE d.disease_id IN (SELECT TO_NUMBER(key_value) FROM dw_etl_touched WHERE kind = 'DISEASE');
+
+  DELETE FROM dw_agg_disease_prevalence
+   WHERE disease_id IN (SELECT TO_NUMBER(key_value) FROM dw_etl_touched WHERE kind = 'DISEASE');
+
+  INSERT INTO dw_agg_disease_prevalence (disease_id, sex, age_band, donors_affected)
+  SELECT f.disease_id, NVL(UPPER(d.sex), '?'), d.age_band, COUNT(DISTINCT f.donor_cf)
+    FROM dw_disease_incidence_fact f
+    JOIN dw_donor_dim d ON d.donor_cf = f.donor_cf
+   WHERE f.disease_id IN (SELECT TO_NUMBER(key_value) FROM dw_etl_touched WHERE kind = 'DISEASE')
+   GROUP BY f.disease_id, NVL(UPPER(d.sex), '?'), d.age_band;
+
+  IF v_full OR v_donors_changed > 0 THEN
+    DELETE FROM dw_agg_donor_population;
+    INSERT INTO dw_agg_donor_population (sex, age_band, num_donors)
+    SELECT NVL(UPPER(sex), '?'), age_band, COUNT(*)
+      FROM dw_donor_dim
+     GROUP BY NVL(UPPER(sex), '?'), age_band;
+  END IF;
+
+  DELETE FROM dw_agg_researcher_output
+   WHERE researcher_cf IN (SELECT key_value FROM dw_etl_touched WHERE kind = 'RESEARCHER');
+
+  INSERT INTO dw_agg_researcher_output (researcher_cf, num_publications, avg_quality_score)
+  SELECT researcher_cf, COUNT(*), ROUND(AVG(quality_score), 3)
+    FROM dw_publication_output_fact
+   WHERE researcher_cf IN (SELECT key_value FROM dw_etl_touched WHERE kind = 'RESEARCHER')
+   GROUP BY researcher_cf;
+
+  UPDATE dw_etl_state SET last_scn = v_scn, last_load_id = v_load_id;
+  COMMIT;
+  log_run('OK');
+EXCEPTION
+  WHEN OTHERS THEN
+    v_message := SQLERRM;
+    ROLLBACK;
+    log_run('FAILED', v_message);
+    RAISE_APPLICATION_ERROR(-20050, 'Error in proc_dw_load: ' || v_message);
+END;
+/
+
+-- Analytical views over the precomputed aggregates (no OLTP access)
+
+CREATE OR REPLACE VIEW dw_v_treatment_success AS
+SELECT t.treatment_id,
+       t.name,
+       t.success_percentage AS declared_success_percentage,
+       a.num_experiments,
+       a.num_positive,
+       a.success_rate
+  FROM dw_agg_treatment_success a
+  JOIN dw_treatment_dim t ON t.treatment_id = a.treatment_id;
+
+CREATE OR REPLACE VIEW dw_v_disease_progress AS
+SELECT d.disease_id,
+       d.name,
+       d.is_treatable,
+       a.year,
+       a.num_experiments,
+       a.num_positive,
+       a.success_rate
+  FROM dw_agg_disease_progress a
+  JOIN dw_disease_dim d ON d.disease_id = a.disease_id;
+
+CREATE OR REPLACE VIEW dw_v_disease_prevalence AS
+SELECT d.disease_id,
+       d.name,
+       a.sex,
+       a.age_band,
+       a.donors_affected,
+       p.num_donors,
+       ROUND(a.donors_affected / p.num_donors, 4) AS prevalence
+  FROM dw_agg_disease_prevalence a
+  JOIN dw_disease_dim d ON d.disease_id = a.disease_id
+  JOIN dw_agg_donor_population p ON p.sex = a.sex AND p.age_band = a.age_band;
+
+CREATE OR REPLACE VIEW dw_v_researcher_output AS
+SELECT r.researcher_cf,
+       r.name,
+       r.surname,
+       a.num_publications,
+       a.avg_quality_score
+  FROM dw_agg_researcher_output a
+  JOIN dw_researcher_dim r ON r.researcher_cf = a.researcher_cf;
+
+-- Example: first load, then an incremental load every hour
+-- EXEC proc_dw_load(p_full => 'Y');
+-- BEGIN
+--   DBMS_SCHEDULER.CREATE_JOB(
+--     job_name        => 'DW_INCREMENTAL_LOAD',
+--     job_type        => 'STORED_PROCEDURE',
+--     job_action      => 'PROC_DW_LOAD',
+--     repeat_interval => 'FREQ=HOURLY',
+--     enabled         => TRUE);
+-- END;
+-- /
+-- SELECT * FROM dw_v_treatment_success ORDER BY success_rate DESC;
+-- SELECT * FROM dw_v_disease_prevalence WHERE disease_id = 1 ORDER BY sex, age_band;
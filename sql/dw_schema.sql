@@ -0,0 +1,198 @@
+-- Data warehouse: constellation schema (report, section "Data Warehouse Design")
+-- Relational star tables living next to the OLTP object tables; populated only by proc_dw_load (dw_etl.sql).
+-- Decision highlights:
+-- - Dimensions keep the OLTP natural keys (id / CF / DOI) as in img/dw_constellation_schema.png; dw_time_dim
+--   uses YYYYMMDD as key. Key 0 is the "unknown / not recorded" member where the OLTP schema has no source
+--   (publications carry no date, nothing carries a location, experiments may have no analyzed sample yet).
+-- - ResearchProgress grain is one analyzed sample of one experiment; experiment_id is kept as degenerate
+--   dimension so numExperiments / successRate count each experiment once (COUNT DISTINCT).
+-- - PublicationOutput grain is one (researcher, publication) authorship.
+-- - DiseaseIncidence (not in the original design) has one row per affected sample and adds the Donor
+--   dimension, needed for prevalence by donor sex / age band.
+-- - dw_agg_* tables are precomputed aggregates refreshed by the load for the keys it touched.
+-- - dw_etl_state keeps one high-water mark (SCN) per source table; dw_etl_run logs every load.
+
+prompt Creating DW dimension tables
+
+CREATE TABLE dw_time_dim (
+  time_id     NUMBER(8) PRIMARY KEY,  -- YYYYMMDD, 0 = unknown
+  day_date    DATE,
+  day         NUMBER(2),
+  week        NUMBER(2),
+  month       NUMBER(2),
+  quarter     NUMBER(1),
+  year        NUMBER(4)
+);
+
+CREATE TABLE dw_area_dim (
+  area_id     NUMBER PRIMARY KEY,     -- 0 = unknown
+  city        VARCHAR2(100),
+  province    VARCHAR2(100),
+  state       VARCHAR2(100),
+  continent   VARCHAR2(50)
+);
+
+CREATE TABLE dw_disease_dim (
+  disease_id      NUMBER PRIMARY KEY,
+  name            VARCHAR2(200),
+  discovery_date  DATE,
+  is_treatable    CHAR(1) DEFAULT 'N' NOT NULL  -- 'Y' once a positive experiment exists
+);
+
+CREATE TABLE dw_treatment_dim (
+  treatment_id        NUMBER PRIMARY KEY,
+  name                VARCHAR2(200),
+  success_percentage  NUMBER(5,2)
+);
+
+CREATE TABLE dw_bio_data_dim (
+  bio_id       NUMBER PRIMARY KEY,    -- 0 = no sample analyzed
+  data_type    VARCHAR2(100),
+  density      NUMBER,
+  condition    VARCHAR2(200),
+  is_required  CHAR(1)
+);
+
+CREATE TABLE dw_donor_dim (
+  donor_cf   CHAR(16) PRIMARY KEY,
+  sex        CHAR(1),
+  age        NUMBER(3),
+  age_band   VARCHAR2(10)
+);
+
+CREATE TABLE dw_researcher_dim (
+  researcher_cf  CHAR(16) PRIMARY KEY,
+  name           VARCHAR2(100),
+  surname        VARCHAR2(100),
+  age            NUMBER(3)
+);
+
+CREATE TABLE dw_publication_dim (
+  doi            VARCHAR2(120) PRIMARY KEY,
+  quality        VARCHAR2(50),
+  quality_score  NUMBER(1),           -- top = 3, middle = 2, low = 1
+  publisher      VARCHAR2(200)
+);
+
+INSERT INTO dw_time_dim (time_id) VALUES (0);
+INSERT INTO dw_area_dim (area_id, city, province, state, continent) VALUES (0, 'Unknown', 'Unknown', 'Unknown', 'Unknown');
+INSERT INTO dw_bio_data_dim (bio_id, data_type) VALUES (0, 'none');
+COMMIT;
+
+prompt Creating DW fact tables
+
+CREATE TABLE dw_research_progress_fact (
+  experiment_id  NUMBER NOT NULL,     -- degenerate dimension
+  bio_id         NUMBER NOT NULL REFERENCES dw_bio_data_dim(bio_id),
+  time_id        NUMBER(8) NOT NULL REFERENCES dw_time_dim(time_id),
+  disease_id     NUMBER NOT NULL REFERENCES dw_disease_dim(disease_id),
+  treatment_id   NUMBER NOT NULL REFERENCES dw_treatment_dim(treatment_id),
+  area_id        NUMBER NOT NULL REFERENCES dw_area_dim(area_id),
+  is_positive    NUMBER(1) NOT NULL,  -- 1 / 0, so SUM() gives the number of positive rows
+  load_id        NUMBER NOT NULL,
+  CONSTRAINT pk_dw_research_progress PRIMARY KEY (experiment_id, bio_id)
+);
+
+CREATE TABLE dw_publication_output_fact (
+  writes_id      NUMBER PRIMARY KEY,
+  researcher_cf  CHAR(16) NOT NULL REFERENCES dw_researcher_dim(researcher_cf),
+  doi            VARCHAR2(120) NOT NULL REFERENCES dw_publication_dim(doi),
+  time_id        NUMBER(8) NOT NULL REFERENCES dw_time_dim(time_id),
+  area_id        NUMBER NOT NULL REFERENCES dw_area_dim(area_id),
+  quality_score  NUMBER(1),
+  load_id        NUMBER NOT NULL
+);
+
+CREATE TABLE dw_disease_incidence_fact (
+  affected_id  NUMBER PRIMARY KEY,
+  disease_id   NUMBER NOT NULL REFERENCES dw_disease_dim(disease_id),
+  bio_id       NUMBER NOT NULL REFERENCES dw_bio_data_dim(bio_id),
+  donor_cf     CHAR(16) NOT NULL REFERENCES dw_donor_dim(donor_cf),
+  area_id      NUMBER NOT NULL REFERENCES dw_area_dim(area_id),
+  load_id      NUMBER NOT NULL
+);
+
+CREATE INDEX idx_dw_rp_treatment ON dw_research_progress_fact(treatment_id, experiment_id, is_positive);
+CREATE INDEX idx_dw_rp_disease ON dw_research_progress_fact(disease_id, time_id);
+CREATE INDEX idx_dw_po_researcher ON dw_publication_output_fact(researcher_cf, quality_score);
+CREATE INDEX idx_dw_di_disease ON dw_disease_incidence_fact(disease_id, donor_cf);
+CREATE INDEX idx_dw_di_bio ON dw_disease_incidence_fact(bio_id);
+
+prompt Creating DW precomputed aggregates
+
+CREATE TABLE dw_agg_treatment_success (
+  treatment_id     NUMBER PRIMARY KEY,
+  num_experiments  NUMBER NOT NULL,
+  num_positive     NUMBER NOT NULL,
+  success_rate     NUMBER(5,4)
+);
+
+CREATE TABLE dw_agg_disease_progress (
+  disease_id       NUMBER NOT NULL,
+  year             NUMBER(4) NOT NULL,
+  num_experiments  NUMBER NOT NULL,
+  num_positive     NUMBER NOT NULL,
+  success_rate     NUMBER(5,4),
+  CONSTRAINT pk_dw_agg_disease_progress PRIMARY KEY (disease_id, year)
+);
+
+CREATE TABLE dw_agg_disease_prevalence (
+  disease_id       NUMBER NOT NULL,
+  sex              CHAR(1) NOT NULL,
+  age_band         VARCHAR2(10) NOT NULL,
+  donors_affected  NUMBER NOT NULL,
+  CONSTRAINT pk_dw_agg_disease_prevalence PRIMARY KEY (disease_id, sex, age_band)
+);
+
+CREATE TABLE dw_agg_donor_population (
+  sex        CHAR(1) NOT NULL,
+  age_band   VARCHAR2(10) NOT NULL,
+  num_donors NUMBER NOT NULL,
+  CONSTRAINT pk_dw_agg_donor_population PRIMARY KEY (sex, age_band)
+);
+
+CREATE TABLE dw_agg_researcher_output (
+  researcher_cf      CHAR(16) PRIMARY KEY,
+  num_publications   NUMBER NOT NULL,
+  avg_quality_score  NUMBER(4,3)
+);
+
+prompt Creating DW load bookkeeping
+
+CREATE TABLE dw_etl_state (
+  source_table  VARCHAR2(30) PRIMARY KEY,
+  last_scn      NUMBER DEFAULT 0 NOT NULL,  -- rows with ORA_ROWSCN above this are (re)loaded
+  last_load_id  NUMBER
+);
+
+INSERT INTO dw_etl_state (source_table)
+SELECT column_value FROM TABLE(SYS.ODCIVARCHAR2LIST(
+  'DONORS_TAB', 'RESEARCHERS_TAB', 'DISEASE_TAB', 'TREATMENT_TAB', 'BIOLOGICAL_DATA_TAB',
+  'PUBLICATION_TAB', 'EXPERIMENT_TAB', 'ANALYZE_TAB', 'AFFECTED_TAB', 'WRITES_TAB'));
+COMMIT;
+
+CREATE SEQUENCE dw_load_seq START WITH 1 INCREMENT BY 1;
+
+CREATE TABLE dw_etl_run (
+  load_id      NUMBER PRIMARY KEY,
+  load_mode    VARCHAR2(12) NOT NULL,   -- INCREMENTAL / FULL
+  start_scn    NUMBER,
+  started_at   TIMESTAMP DEFAULT SYSTIMESTAMP NOT NULL,
+  finished_at  TIMESTAMP,
+  status       VARCHAR2(10) NOT NULL,   -- RUNNING / OK / FAILED
+  rows_loaded  NUMBER,
+  message      VARCHAR2(4000)
+);
+
+-- Work sets of the running load (cleared at commit)
+CREATE GLOBAL TEMPORARY TABLE dw_etl_delta (
+  kind  VARCHAR2(12) NOT NULL,   -- EXPERIMENT / AFFECTED / WRITES
+  id    NUMBER NOT NULL
+) ON COMMIT DELETE ROWS;
+
+CREATE GLOBAL TEMPORARY TABLE dw_etl_touched (
+  kind       VARCHAR2(12) NOT NULL,   -- TREATMENT / DISEASE / RESEARCHER
+  key_value  VARCHAR2(120) NOT NULL
+) ON COMMIT DELETE ROWS;
+
+prompt DW schema created.
@@ -121,16 +121,17 @@ BEGIN
   COMMIT;
 
   -- Assign (collega trattamenti e farmaci)
-  FOR t IN (SELECT REF(tr) as treat_ref FROM treatment_tab tr) LOOP
+  FOR t IN (SELECT tr.id, REF(tr) as treat_ref FROM treatment_tab tr) LOOP
     DECLARE
         v_drug_ref REF drugs_typ;
+        v_drug_id  NUMBER;
     BEGIN
-        SELECT r INTO v_drug_ref
+        SELECT r, id INTO v_drug_ref, v_drug_id
         FROM (
-          SELECT REF(dr) r FROM drugs_tab dr ORDER BY DBMS_RANDOM.VALUE
+          SELECT REF(dr) r, dr.id FROM drugs_tab dr ORDER BY DBMS_RANDOM.VALUE
         )
         WHERE ROWNUM = 1;
-        INSERT INTO assign_tab VALUES (assign_typ(assign_tab_seq.NEXTVAL, t.treat_ref, v_drug_ref));
+        INSERT INTO assign_tab VALUES (assign_typ(assign_tab_seq.NEXTVAL, t.treat_ref, v_drug_ref, t.id, v_drug_id));
     EXCEPTION WHEN DUP_VAL_ON_INDEX THEN NULL;
     END;
   END LOOP;
@@ -140,10 +141,11 @@ BEGIN
   FOR i IN 1..p_num_biological_data LOOP
     DECLARE
       v_donor_ref REF donor_typ;
+      v_donor_cf  CHAR(16);
     BEGIN
-      SELECT r INTO v_donor_ref
+      SELECT r, CF INTO v_donor_ref, v_donor_cf
       FROM (
-        SELECT REF(d) r FROM donors_tab d ORDER BY DBMS_RANDOM.VALUE
+        SELECT REF(d) r, d.CF FROM donors_tab d ORDER BY DBMS_RANDOM.VALUE
       )
       WHERE ROWNUM = 1;
 
@@ -157,7 +159,8 @@ BEGIN
           'Position'||i,
           CASE MOD(i, 2) WHEN 0 THEN 'organ' ELSE 'tissue' END,
           DBMS_RANDOM.VALUE(0.1, 100),
-          v_donor_ref
+          v_donor_ref,
+          v_donor_cf
         )
       );
     END;
@@ -169,17 +172,19 @@ BEGIN
     DECLARE
       v_disease_ref REF disease_typ;
       v_treatment_ref REF treatment_typ;
+      v_disease_id NUMBER;
+      v_treatment_id NUMBER;
       v_discovery_date DATE;
     BEGIN
-      SELECT r, discovery_date INTO v_disease_ref, v_discovery_date
+      SELECT r, id, discovery_date INTO v_disease_ref, v_disease_id, v_discovery_date
       FROM (
-        SELECT REF(d) r, d.discovery_date FROM disease_tab d ORDER BY DBMS_RANDOM.VALUE
+        SELECT REF(d) r, d.id, d.discovery_date FROM disease_tab d ORDER BY DBMS_RANDOM.VALUE
       )
       WHERE ROWNUM = 1;
 
-      SELECT r INTO v_treatment_ref
+      SELECT r, id INTO v_treatment_ref, v_treatment_id
       FROM (
-        SELECT REF(t) r FROM treatment_tab t ORDER BY DBMS_RANDOM.VALUE
+        SELECT REF(t) r, t.id FROM treatment_tab t ORDER BY DBMS_RANDOM.VALUE
       )
       WHERE ROWNUM = 1;
 
@@ -190,7 +195,9 @@ BEGIN
           CASE MOD(i, 2) WHEN 0 THEN 'Y' ELSE 'N' END,
           'Effect description for experiment '||i,
           v_disease_ref,
-          v_treatment_ref
+          v_treatment_ref,
+          v_disease_id,
+          v_treatment_id
         )
       );
     END;
@@ -202,15 +209,16 @@ BEGIN
   FOR bd IN (SELECT id, REF(b) as bio_ref FROM biological_data_tab b WHERE b.condition = 'disease') LOOP
     DECLARE
         v_disease_ref REF disease_typ;
+        v_disease_id  NUMBER;
     BEGIN
-        SELECT r INTO v_disease_ref
+        SELECT r, id INTO v_disease_ref, v_disease_id
         FROM (
-          SELECT REF(d) r FROM disease_tab d ORDER BY DBMS_RANDOM.VALUE
+          SELECT REF(d) r, d.id FROM disease_tab d ORDER BY DBMS_RANDOM.VALUE
         )
         WHERE ROWNUM = 1;
 
         INSERT INTO affected_tab VALUES (
-            affected_typ(affected_tab_seq.NEXTVAL, bd.bio_ref, v_disease_ref)
+            affected_typ(affected_tab_seq.NEXTVAL, bd.bio_ref, v_disease_ref, bd.id, v_disease_id)
         );
     EXCEPTION WHEN DUP_VAL_ON_INDEX THEN NULL; -- Ignora duplicati
     END;
@@ -223,43 +231,46 @@ BEGIN
     DECLARE
         v_drug_ref REF drugs_typ;
         v_allergy_ref REF allergy_typ;
+        v_allergy_id NUMBER;
     BEGIN
       SELECT REF(d) INTO v_drug_ref FROM drugs_tab d WHERE d.id = i;
-      SELECT r INTO v_allergy_ref FROM (
-        SELECT REF(a) r FROM allergy_tab a ORDER BY DBMS_RANDOM.VALUE
+      SELECT r, id INTO v_allergy_ref, v_allergy_id FROM (
+        SELECT REF(a) r, a.id FROM allergy_tab a ORDER BY DBMS_RANDOM.VALUE
       ) WHERE ROWNUM = 1;
-      INSERT INTO cause_tab VALUES (cause_typ(cause_tab_seq.NEXTVAL, v_drug_ref, v_allergy_ref));
+      INSERT INTO cause_tab VALUES (cause_typ(cause_tab_seq.NEXTVAL, v_drug_ref, v_allergy_ref, i, v_allergy_id));
     EXCEPTION WHEN DUP_VAL_ON_INDEX THEN NULL;
     END;
   END LOOP;
   COMMIT;
 
   -- Writes (collega ricercatori e pubblicazioni)
-  FOR p IN (SELECT REF(p) AS pub_ref FROM publication_tab p)
+  FOR p IN (SELECT p.DOI, REF(p) AS pub_ref FROM publication_tab p)
   LOOP
     DECLARE
       v_res_ref REF researcher_typ;
+      v_res_cf  CHAR(16);
     BEGIN
-      SELECT r INTO v_res_ref FROM (
-       SELECT REF(r) r FROM researchers_tab r ORDER BY DBMS_RANDOM.VALUE
+      SELECT r, CF INTO v_res_ref, v_res_cf FROM (
+       SELECT REF(r) r, r.CF FROM researchers_tab r ORDER BY DBMS_RANDOM.VALUE
       ) WHERE ROWNUM = 1;
-      INSERT INTO writes_tab VALUES (writes_typ(writes_tab_seq.NEXTVAL, p.pub_ref, v_res_ref));
+      INSERT INTO writes_tab VALUES (writes_typ(writes_tab_seq.NEXTVAL, p.pub_ref, v_res_ref, p.DOI, v_res_cf));
     EXCEPTION WHEN DUP_VAL_ON_INDEX THEN NULL;
     END;
   END LOOP;
   COMMIT;
 
   -- Analyze (collega dati biologici ed esperimenti)
-  FOR aff IN (SELECT bio_ref, disease_ref FROM affected_tab) LOOP
+  FOR aff IN (SELECT bio_ref, bio_id, disease_id FROM affected_tab) LOOP
     DECLARE
       v_exp_ref REF experiment_typ;
+      v_exp_id  NUMBER;
     BEGIN
-      SELECT r INTO v_exp_ref FROM (
-        SELECT REF(e) r FROM experiment_tab e WHERE e.disease_ref = aff.disease_ref ORDER BY DBMS_RANDOM.VALUE
+      SELECT r, id INTO v_exp_ref, v_exp_id FROM (
+        SELECT REF(e) r, e.id FROM experiment_tab e WHERE e.disease_id = aff.disease_id ORDER BY DBMS_RANDOM.VALUE
       ) WHERE ROWNUM = 1;
 
       IF v_exp_ref IS NOT NULL THEN
-        INSERT INTO analyze_tab VALUES (analyze_typ(analyze_tab_seq.NEXTVAL, aff.bio_ref, v_exp_ref));
+        INSERT INTO analyze_tab VALUES (analyze_typ(analyze_tab_seq.NEXTVAL, aff.bio_ref, v_exp_ref, aff.bio_id, v_exp_id));
       END IF;
     EXCEPTION WHEN DUP_VAL_ON_INDEX THEN NULL;
     END;
@@ -271,15 +282,17 @@ BEGIN
     DECLARE
       v_exp_ref REF experiment_typ;
       v_pub_ref REF publication_typ;
+      v_exp_id  NUMBER;
+      v_pub_doi VARCHAR2(120);
     BEGIN
-      SELECT r INTO v_exp_ref
+      SELECT r, id INTO v_exp_ref, v_exp_id
       FROM (
-        SELECT REF(e) r FROM experiment_tab e WHERE e.is_positive = 'Y' ORDER BY DBMS_RANDOM.VALUE
+        SELECT REF(e) r, e.id FROM experiment_tab e WHERE e.is_positive = 'Y' ORDER BY DBMS_RANDOM.VALUE
       )
       WHERE ROWNUM = 1;
 
-      SELECT r INTO v_pub_ref FROM (
-        SELECT REF(p) r FROM publication_tab p ORDER BY DBMS_RANDOM.VALUE
+      SELECT r, DOI INTO v_pub_ref, v_pub_doi FROM (
+        SELECT REF(p) r, p.DOI FROM publication_tab p ORDER BY DBMS_RANDOM.VALUE
       ) WHERE ROWNUM = 1;
 
       INSERT INTO future_work_tab VALUES (
@@ -287,7 +300,9 @@ BEGIN
           i,
           'Future work title '||i,
           v_exp_ref,
-          v_pub_ref
+          v_pub_ref,
+          v_exp_id,
+          v_pub_doi
         )
       );
     END;
@@ -295,15 +310,16 @@ BEGIN
   COMMIT;
   
   -- Consider (collega future works e ricercatori)
-  FOR f IN (SELECT REF(f) AS fw_ref FROM future_work_tab f)
+  FOR f IN (SELECT f.id, REF(f) AS fw_ref FROM future_work_tab f)
   LOOP
     DECLARE
       v_res_ref REF researcher_typ;
+      v_res_cf  CHAR(16);
     BEGIN
-      SELECT r INTO v_res_ref FROM (
-       SELECT REF(r) r FROM researchers_tab r ORDER BY DBMS_RANDOM.VALUE
+      SELECT r, CF INTO v_res_ref, v_res_cf FROM (
+       SELECT REF(r) r, r.CF FROM researchers_tab r ORDER BY DBMS_RANDOM.VALUE
       ) WHERE ROWNUM = 1;
-      INSERT INTO consider_tab VALUES (consider_typ(consider_tab_seq.NEXTVAL, f.fw_ref, v_res_ref));
+      INSERT INTO consider_tab VALUES (consider_typ(consider_tab_seq.NEXTVAL, f.fw_ref, v_res_ref, f.id, v_res_cf));
     EXCEPTION WHEN DUP_VAL_ON_INDEX THEN NULL;
     END;
   END LOOP;
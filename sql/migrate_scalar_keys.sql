@@ -0,0 +1,101 @@
+-- Migration: add scalar shadow keys to an existing (pre-shadow-key) schema
+-- Adds the key attributes to the object types, backfills them from the REFs, replaces the
+-- DEREF-based uniqueness triggers and REF indexes with UNIQUE constraints and B-tree indexes on
+-- the keys, and recreates the business-rule triggers so that they join on the keys.
+--
+-- Run once, connected as the schema owner, from the sql/ directory:
+--   SQL> @migrate_scalar_keys.sql
+-- The backfill fails (ORA-00001 on the UNIQUE constraints) if the existing data already contains
+-- duplicate association pairs; remove them first.
+
+whenever sqlerror exit rollback
+set define off
+
+prompt Adding scalar key attributes to object types
+
+ALTER TYPE biological_data_typ ADD ATTRIBUTE (donor_cf CHAR(16)) CASCADE;
+ALTER TYPE experiment_typ ADD ATTRIBUTE (disease_id NUMBER, treatment_id NUMBER) CASCADE;
+ALTER TYPE future_work_typ ADD ATTRIBUTE (exp_id NUMBER, pub_doi VARCHAR2(120)) CASCADE;
+ALTER TYPE affected_typ ADD ATTRIBUTE (bio_id NUMBER, disease_id NUMBER) CASCADE;
+ALTER TYPE analyze_typ ADD ATTRIBUTE (bio_id NUMBER, exp_id NUMBER) CASCADE;
+ALTER TYPE assign_typ ADD ATTRIBUTE (treatment_id NUMBER, drug_id NUMBER) CASCADE;
+ALTER TYPE cause_typ ADD ATTRIBUTE (drug_id NUMBER, allergy_id NUMBER) CASCADE;
+ALTER TYPE writes_typ ADD ATTRIBUTE (publication_doi VARCHAR2(120), researcher_cf CHAR(16)) CASCADE;
+ALTER TYPE consider_typ ADD ATTRIBUTE (future_work_id NUMBER, researcher_cf CHAR(16)) CASCADE;
+
+prompt Dropping DEREF-based uniqueness triggers (replaced by UNIQUE constraints on the keys)
+
+BEGIN EXECUTE IMMEDIATE 'DROP TRIGGER trg_aff_uni'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4080 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TRIGGER trg_analyze_uni'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4080 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TRIGGER trg_assign_uni'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4080 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TRIGGER trg_cause_uni'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4080 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TRIGGER trg_writes_uni'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4080 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP TRIGGER trg_consider_uni'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -4080 THEN RAISE; END IF; END;
+/
+
+prompt Dropping REF indexes
+
+BEGIN EXECUTE IMMEDIATE 'DROP INDEX idx_assign_treatment_ref'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -1418 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP INDEX idx_cause_drug_ref'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -1418 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP INDEX idx_aff_dis_bio'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -1418 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP INDEX idx_analyze_bio'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -1418 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP INDEX idx_fw_exp'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -1418 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP INDEX idx_writes_publication_ref'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -1418 THEN RAISE; END IF; END;
+/
+BEGIN EXECUTE IMMEDIATE 'DROP INDEX idx_consider_researcher_ref'; EXCEPTION WHEN OTHERS THEN IF SQLCODE != -1418 THEN RAISE; END IF; END;
+/
+
+prompt Backfilling scalar keys from REFs
+
+-- No trigger fires here: the business-rule triggers are UPDATE OF the REF columns only
+-- and the key-sync triggers are created afterwards.
+UPDATE biological_data_tab x SET x.donor_cf = DEREF(x.donor_ref).CF;
+UPDATE experiment_tab x
+   SET x.disease_id   = DEREF(x.disease_ref).id,
+       x.treatment_id = DEREF(x.treatment_ref).id;
+UPDATE future_work_tab x
+   SET x.exp_id  = DEREF(x.exp_ref).id,
+       x.pub_doi = DEREF(x.pub_ref).DOI;
+UPDATE affected_tab x
+   SET x.bio_id     = DEREF(x.bio_ref).id,
+       x.disease_id = DEREF(x.disease_ref).id;
+UPDATE analyze_tab x
+   SET x.bio_id = DEREF(x.bio_ref).id,
+       x.exp_id = DEREF(x.exp_ref).id;
+UPDATE assign_tab x
+   SET x.treatment_id = DEREF(x.treatment_ref).id,
+       x.drug_id      = DEREF(x.drug_ref).id;
+UPDATE cause_tab x
+   SET x.drug_id    = DEREF(x.drug_ref).id,
+       x.allergy_id = DEREF(x.allergy_ref).id;
+UPDATE writes_tab x
+   SET x.publication_doi = DEREF(x.publication_ref).DOI,
+       x.researcher_cf   = DEREF(x.researcher_ref).CF;
+UPDATE consider_tab x
+   SET x.future_work_id = DEREF(x.future_work_ref).id,
+       x.researcher_cf  = DEREF(x.researcher_ref).CF;
+COMMIT;
+
+@@oracle_scalar_keys.sql
+
+@@oracle_triggers.sql
+
+prompt Gathering statistics for the new indexes
+
+BEGIN
+  DBMS_STATS.GATHER_SCHEMA_STATS(ownname => USER, cascade => TRUE);
+END;
+/
+
+prompt Migration complete. Recreate the pipelined functions (webapp/static/operations_pipelined.sql)
+prompt and procedures (operations.sql) so that they use the scalar keys.
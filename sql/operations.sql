@@ -47,7 +47,8 @@ BEGIN
       p_position,
       p_data_type,
       p_density,
-      v_donor_ref
+      v_donor_ref,
+      p_donor_cf
     )
   );
 
@@ -74,7 +75,7 @@ BEGIN
            b.name,
            b.data_type,
            b.density,
-           DEREF(b.donor_ref).CF AS donor_cf,
+           b.donor_cf,
            b.is_required,
            b.condition
       FROM biological_data_tab b
@@ -108,13 +109,13 @@ BEGIN
            al.name                   AS allergy_name
       FROM treatment_tab t
       LEFT JOIN assign_tab a
-             ON a.treatment_ref = REF(t)
+             ON a.treatment_id = t.id
       LEFT JOIN drugs_tab d
-             ON a.drug_ref = REF(d)
+             ON d.id = a.drug_id
       LEFT JOIN cause_tab c
-             ON c.drug_ref = a.drug_ref
+             ON c.drug_id = a.drug_id
       LEFT JOIN allergy_tab al
-             ON c.allergy_ref = REF(al)
+             ON al.id = c.allergy_id
      WHERE t.id = p_treatment_id;
 EXCEPTION
   WHEN OTHERS THEN
@@ -134,22 +135,22 @@ CREATE OR REPLACE PROCEDURE proc_list_donors_required_disease_with_fw (
 ) AS
 BEGIN
   OPEN p_result FOR
-    SELECT DISTINCT DEREF(b.donor_ref).CF      AS CF,
-                    DEREF(b.donor_ref).name    AS name,
-                    DEREF(b.donor_ref).surname AS surname
+    SELECT DISTINCT dn.CF      AS CF,
+                    dn.name    AS name,
+                    dn.surname AS surname
       FROM affected_tab a
-      JOIN disease_tab dis
-        ON a.disease_ref = REF(dis)
-       AND dis.id = p_disease_id
       JOIN biological_data_tab b
-        ON a.bio_ref = REF(b)
-     WHERE b.is_required = 'Y'
+        ON b.id = a.bio_id
+      JOIN donors_tab dn
+        ON dn.CF = b.donor_cf
+     WHERE a.disease_id = p_disease_id
+       AND b.is_required = 'Y'
        AND EXISTS (
              SELECT 1
                FROM analyze_tab z
                JOIN future_work_tab f
-                 ON f.exp_ref = z.exp_ref
-              WHERE z.bio_ref = REF(b)
+                 ON f.exp_id = z.exp_id
+              WHERE z.bio_id = b.id
            );
 EXCEPTION
   WHEN OTHERS THEN
@@ -157,6 +158,73 @@ EXCEPTION
 END;
 /
 
+--------------------------------------------------------------------------------
+-- Operations 3 and 4, batch variants: many ids in one execution
+-- Input: a SYS.ODCINUMBERLIST of ids (bound as one collection by clients)
+-- Returns the rows of the single-id procedure for every id, ordered by id so
+-- clients can group them while fetching
+--------------------------------------------------------------------------------
+CREATE OR REPLACE PROCEDURE proc_get_treatment_info_batch (
+  p_treatment_ids IN SYS.ODCINUMBERLIST,
+  p_result        OUT SYS_REFCURSOR
+) AS
+BEGIN
+  OPEN p_result FOR
+    SELECT t.id                      AS treatment_id,
+           t.name                    AS treatment_name,
+           t.success_percentage,
+           d.id                      AS drug_id,
+           d.name                    AS drug_name,
+           al.id                     AS allergy_id,
+           al.name                   AS allergy_name
+      FROM treatment_tab t
+      LEFT JOIN assign_tab a
+             ON a.treatment_id = t.id
+      LEFT JOIN drugs_tab d
+             ON d.id = a.drug_id
+      LEFT JOIN cause_tab c
+             ON c.drug_id = a.drug_id
+      LEFT JOIN allergy_tab al
+             ON al.id = c.allergy_id
+     WHERE t.id IN (SELECT column_value FROM TABLE(p_treatment_ids))
+     ORDER BY t.id, d.id, al.id;
+EXCEPTION
+  WHEN OTHERS THEN
+    RAISE_APPLICATION_ERROR(-20026, 'Error in proc_get_treatment_info_batch: ' || SQLERRM);
+END;
+/
+
+CREATE OR REPLACE PROCEDURE proc_list_donors_required_disease_with_fw_batch (
+  p_disease_ids IN SYS.ODCINUMBERLIST,
+  p_result      OUT SYS_REFCURSOR
+) AS
+BEGIN
+  OPEN p_result FOR
+    SELECT DISTINCT a.disease_id AS disease_id,
+                    dn.CF        AS CF,
+                    dn.name      AS name,
+                    dn.surname   AS surname
+      FROM affected_tab a
+      JOIN biological_data_tab b
+        ON b.id = a.bio_id
+      JOIN donors_tab dn
+        ON dn.CF = b.donor_cf
+     WHERE a.disease_id IN (SELECT column_value FROM TABLE(p_disease_ids))
+       AND b.is_required = 'Y'
+       AND EXISTS (
+             SELECT 1
+               FROM analyze_tab z
+               JOIN future_work_tab f
+                 ON f.exp_id = z.exp_id
+              WHERE z.bio_id = b.id
+           )
+     ORDER BY disease_id, CF;
+EXCEPTION
+  WHEN OTHERS THEN
+    RAISE_APPLICATION_ERROR(-20027, 'Error in proc_list_donors_required_disease_with_fw_batch: ' || SQLERRM);
+END;
+/
+
 --------------------------------------------------------------------------------
 -- Operation 5: All useful suggestions (Future Works) provided to only researchers
 --              with top quality journals published (once a month)
@@ -175,17 +243,17 @@ BEGIN
       r.surname AS researcher_surname
     FROM consider_tab c
     JOIN future_work_tab f
-      ON c.future_work_ref = REF(f)
+      ON f.id = c.future_work_id
     JOIN (
-        SELECT DISTINCT w.researcher_ref
+        SELECT DISTINCT w.researcher_cf
         FROM writes_tab w
         JOIN publication_tab p
-          ON w.publication_ref = REF(p)
+          ON p.DOI = w.publication_doi
         WHERE p.quality = 'top'
     ) top_researchers
-      ON c.researcher_ref = top_researchers.researcher_ref
+      ON c.researcher_cf = top_researchers.researcher_cf
     JOIN researchers_tab r
-      ON c.researcher_ref = REF(r);
+      ON r.CF = c.researcher_cf;
 EXCEPTION
   WHEN OTHERS THEN
     RAISE_APPLICATION_ERROR(-20025,
@@ -239,6 +307,13 @@ PRINT rc
 EXEC proc_list_donors_required_disease_with_fw(3, :rc)
 PRINT rc
 
+-- Op3 / Op4 batch examples (several ids in one call)
+EXEC proc_get_treatment_info_batch(SYS.ODCINUMBERLIST(10, 11, 12), :rc)
+PRINT rc
+
+EXEC proc_list_donors_required_disease_with_fw_batch(SYS.ODCINUMBERLIST(1, 2, 3), :rc)
+PRINT rc
+
 -- Op5 example
 EXEC proc_list_fw_for_top_researchers(:rc)
 PRINT rc
@@ -0,0 +1,531 @@
+-- Change log feeding the webapp invalidation bus (webapp/changes.py)
+-- Every INSERT/UPDATE/DELETE on the tables below appends events to change_log: one (table, key) event per
+-- changed row for statements touching at most 50 rows, a single table-level event (key NULL) for bigger
+-- ones such as PopulateDatabase. Keys are the primary key of entity tables and 'left/right' shadow keys
+-- of association tables (e.g. assign_tab: 'treatment_id/drug_id'); CF values are right-trimmed. An UPDATE
+-- that changes a key logs both the new and the old key, so caches holding the old one are told as well.
+-- Events are written in the same transaction as the change, so workers only see them after commit.
+-- Workers poll the log by event_id. Sequence values do not commit in order, so an event can commit below
+-- the last id a worker has read. The events of one statement share a statement_id, and table_version
+-- moves by one per statement: the poller reads both in one read-only transaction and emits a table-level
+-- event when a table's version moved by more than the statements it saw. Tables not listed here are
+-- covered table-level through table_version alone.
+-- Requires oracle_table_versions.sql. Included by oracle_schema.sql; can also be run on its own against
+-- an existing schema.
+
+prompt Creating change_log
+
+-- Keys collected by the triggers below (nested table: no element limit, unlike the SYS.ODCI* VARRAYs)
+CREATE OR REPLACE TYPE key_list_t AS TABLE OF VARCHAR2(200);
+/
+
+CREATE SEQUENCE change_log_seq CACHE 100;
+
+CREATE TABLE change_log (
+  event_id      NUMBER PRIMARY KEY,
+  statement_id  NUMBER NOT NULL,
+  table_name    VARCHAR2(30) NOT NULL,
+  key_value     VARCHAR2(200),
+  op            CHAR(1) NOT NULL CHECK (op IN ('I', 'U', 'D')),
+  changed_at    TIMESTAMP WITH TIME ZONE DEFAULT SYSTIMESTAMP NOT NULL
+);
+
+CREATE INDEX idx_change_log_time ON change_log (changed_at);
+
+prompt Creating proc_purge_change_log
+
+-- Deletes events older than p_keep_hours; workers only need the events since their last poll.
+-- Schedule it, e.g.:
+-- BEGIN
+--   DBMS_SCHEDULER.CREATE_JOB(job_name => 'PURGE_CHANGE_LOG', job_type => 'STORED_PROCEDURE',
+--     job_action => 'proc_purge_change_log', repeat_interval => 'FREQ=HOURLY', enabled => TRUE);
+-- END;
+-- /
+CREATE OR REPLACE PROCEDURE proc_purge_change_log(p_keep_hours NUMBER DEFAULT 24) IS
+BEGIN
+  DELETE FROM change_log WHERE changed_at < SYSTIMESTAMP - NUMTODSINTERVAL(p_keep_hours, 'HOUR');
+  COMMIT;
+END;
+/
+
+prompt Creating change log triggers
+
+CREATE OR REPLACE TRIGGER trg_donors_changes
+FOR INSERT OR UPDATE OR DELETE ON donors_tab
+COMPOUND TRIGGER
+  c_max_keys CONSTANT PLS_INTEGER := 50;
+  g_keys key_list_t := key_list_t();
+  g_rows PLS_INTEGER := 0;
+
+  AFTER EACH ROW IS
+  BEGIN
+    g_rows := g_rows + 1;
+    IF g_rows <= c_max_keys THEN
+      IF NOT DELETING THEN
+        g_keys.EXTEND;
+        g_keys(g_keys.LAST) := RTRIM(:NEW.CF);
+      END IF;
+      IF DELETING OR (UPDATING AND RTRIM(:OLD.CF) != RTRIM(:NEW.CF)) THEN
+        g_keys.EXTEND;
+        g_keys(g_keys.LAST) := RTRIM(:OLD.CF);
+      END IF;
+    END IF;
+  END AFTER EACH ROW;
+
+  AFTER STATEMENT IS
+    v_op CHAR(1) := CASE WHEN INSERTING THEN 'I' WHEN UPDATING THEN 'U' ELSE 'D' END;
+    v_statement NUMBER;
+  BEGIN
+    IF g_rows > 0 THEN
+      v_statement := change_log_seq.NEXTVAL;
+    END IF;
+    IF g_rows > c_max_keys THEN
+      INSERT INTO change_log (event_id, statement_id, table_name, key_value, op)
+      VALUES (change_log_seq.NEXTVAL, v_statement, 'DONORS_TAB', NULL, v_op);
+    ELSIF g_rows > 0 THEN
+      INSERT INTO change_log (event_id, statement_id, table_name, key_value, op)
+      SELECT change_log_seq.NEXTVAL, v_statement, 'DONORS_TAB', COLUMN_VALUE, v_op FROM TABLE(g_keys);
+    END IF;
+  END AFTER STATEMENT;
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_disease_changes
+FOR INSERT OR UPDATE OR DELETE ON disease_tab
+COMPOUND TRIGGER
+  c_max_keys CONSTANT PLS_INTEGER := 50;
+  g_keys key_list_t := key_list_t();
+  g_rows PLS_INTEGER := 0;
+
+  AFTER EACH ROW IS
+  BEGIN
+    g_rows := g_rows + 1;
+    IF g_rows <= c_max_keys THEN
+      IF NOT DELETING THEN
+        g_keys.EXTEND;
+        g_keys(g_keys.LAST) := TO_CHAR(:NEW.id);
+      END IF;
+      IF DELETING OR (UPDATING AND TO_CHAR(:OLD.id) != TO_CHAR(:NEW.id)) THEN
+        g_keys.EXTEND;
+        g_keys(g_keys.LAST) := TO_CHAR(:OLD.id);
+      END IF;
+    END IF;
+  END AFTER EACH ROW;
+
+  AFTER STATEMENT IS
+    v_op CHAR(1) := CASE WHEN INSERTING THEN 'I' WHEN UPDATING THEN 'U' ELSE 'D' END;
+    v_statement NUMBER;
+  BEGIN
+    IF g_rows > 0 THEN
+      v_statement := change_log_seq.NEXTVAL;
+    END IF;
+    IF g_rows > c_max_keys THEN
+      INSERT INTO change_log (event_id, statement_id, table_name, key_value, op)
+      VALUES (change_log_seq.NEXTVAL, v_statement, 'DISEASE_TAB', NULL, v_op);
+    ELSIF g_rows > 0 THEN
+      INSERT INTO change_log (event_id, statement_id, table_name, key_value, op)
+      SELECT change_log_seq.NEXTVAL, v_statement, 'DISEASE_TAB', COLUMN_VALUE, v_op FROM TABLE(g_keys);
+    END IF;
+  END AFTER STATEMENT;
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_treatment_changes
+FOR INSERT OR UPDATE OR DELETE ON treatment_tab
+COMPOUND TRIGGER
+  c_max_keys CONSTANT PLS_INTEGER := 50;
+  g_keys key_list_t := key_list_t();
+  g_rows PLS_INTEGER := 0;
+
+  AFTER EACH ROW IS
+  BEGIN
+    g_rows := g_rows + 1;
+    IF g_rows <= c_max_keys THEN
+      IF NOT DELETING THEN
+        g_keys.EXTEND;
+        g_keys(g_keys.LAST) := TO_CHAR(:NEW.id);
+      END IF;
+      IF DELETING OR (UPDATING AND TO_CHAR(:OLD.id) != TO_CHAR(:NEW.id)) THEN
+        g_keys.EXTEND;
+        g_keys(g_keys.LAST) := TO_CHAR(:OLD.id);
+      END IF;
+    END IF;
+  END AFTER EACH ROW;
+
+  AFTER STATEMENT IS
+    v_op CHAR(1) := CASE WHEN INSERTING THEN 'I' WHEN UPDATING THEN 'U' ELSE 'D' END;
+    v_statement NUMBER;
+  BEGIN
+    IF g_rows > 0 THEN
+      v_statement := change_log_seq.NEXTVAL;
+    END IF;
+    IF g_rows > c_max_keys THEN
+      INSERT INTO change_log (event_id, statement_id, table_name, key_value, op)
+      VALUES (change_log_seq.NEXTVAL, v_statement, 'TREATMENT_TAB', NULL, v_op);
+    ELSIF g_rows > 0 THEN
+      INSERT INTO change_log (event_id, statement_id, table_name, key_value, op)
+      SELECT change_log_seq.NEXTVAL, v_statement, 'TREATMENT_TAB', COLUMN_VALUE, v_op FROM TABLE(g_keys);
+    END IF;
+  END AFTER STATEMENT;
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_drugs_changes
+FOR INSERT OR UPDATE OR DELETE ON drugs_tab
+COMPOUND TRIGGER
+  c_max_keys CONSTANT PLS_INTEGER := 50;
+  g_keys key_list_t := key_list_t();
+  g_rows PLS_INTEGER := 0;
+
+  AFTER EACH ROW IS
+  BEGIN
+    g_rows := g_rows + 1;
+    IF g_rows <= c_max_keys THEN
+      IF NOT DELETING THEN
+        g_keys.EXTEND;
+        g_keys(g_keys.LAST) := TO_CHAR(:NEW.id);
+      END IF;
+      IF DELETING OR (UPDATING AND TO_CHAR(:OLD.id) != TO_CHAR(:NEW.id)) THEN
+        g_keys.EXTEND;
+        g_keys(g_keys.LAST) := TO_CHAR(:OLD.id);
+      END IF;
+    END IF;
+  END AFTER EACH ROW;
+
+  AFTER STATEMENT IS
+    v_op CHAR(1) := CASE WHEN INSERTING THEN 'I' WHEN UPDATING THEN 'U' ELSE 'D' END;
+    v_statement NUMBER;
+  BEGIN
+    IF g_rows > 0 THEN
+      v_statement := change_log_seq.NEXTVAL;
+    END IF;
+    IF g_rows > c_max_keys THEN
+      INSERT INTO change_log (event_id, statement_id, table_name, key_value, op)
+      VALUES (change_log_seq.NEXTVAL, v_statement, 'DRUGS_TAB', NULL, v_op);
+    ELSIF g_rows > 0 THEN
+      INSERT INTO change_log (event_id, statement_id, table_name, key_value, op)
+      SELECT change_log_seq.NEXTVAL, v_statement, 'DRUGS_TAB', COLUMN_VALUE, v_op FROM TABLE(g_keys);
+    END IF;
+  END AFTER STATEMENT;
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_allergy_changes
+FOR INSERT OR UPDATE OR DELETE ON allergy_tab
+COMPOUND TRIGGER
+  c_max_keys CONSTANT PLS_INTEGER := 50;
+  g_keys key_list_t := key_list_t();
+  g_rows PLS_INTEGER := 0;
+
+  AFTER EACH ROW IS
+  BEGIN
+    g_rows := g_rows + 1;
+    IF g_rows <= c_max_keys THEN
+      IF NOT DELETING THEN
+        g_keys.EXTEND;
+        g_keys(g_keys.LAST) := TO_CHAR(:NEW.id);
+      END IF;
+      IF DELETING OR (UPDATING AND TO_CHAR(:OLD.id) != TO_CHAR(:NEW.id)) THEN
+        g_keys.EXTEND;
+        g_keys(g_keys.LAST) := TO_CHAR(:OLD.id);
+      END IF;
+    END IF;
+  END AFTER EACH ROW;
+
+  AFTER STATEMENT IS
+    v_op CHAR(1) := CASE WHEN INSERTING THEN 'I' WHEN UPDATING THEN 'U' ELSE 'D' END;
+    v_statement NUMBER;
+  BEGIN
+    IF g_rows > 0 THEN
+      v_statement := change_log_seq.NEXTVAL;
+    END IF;
+    IF g_rows > c_max_keys THEN
+      INSERT INTO change_log (event_id, statement_id, table_name, key_value, op)
+      VALUES (change_log_seq.NEXTVAL, v_statement, 'ALLERGY_TAB', NULL, v_op);
+    ELSIF g_rows > 0 THEN
+      INSERT INTO change_log (event_id, statement_id, table_name, key_value, op)
+      SELECT change_log_seq.NEXTVAL, v_statement, 'ALLERGY_TAB', COLUMN_VALUE, v_op FROM TABLE(g_keys);
+    END IF;
+  END AFTER STATEMENT;
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_publication_changes
+FOR INSERT OR UPDATE OR DELETE ON publication_tab
+COMPOUND TRIGGER
+  c_max_keys CONSTANT PLS_INTEGER := 50;
+  g_keys key_list_t := key_list_t();
+  g_rows PLS_INTEGER := 0;
+
+  AFTER EACH ROW IS
+  BEGIN
+    g_rows := g_rows + 1;
+    IF g_rows <= c_max_keys THEN
+      IF NOT DELETING THEN
+        g_keys.EXTEND;
+        g_keys(g_keys.LAST) := :NEW.DOI;
+      END IF;
+      IF DELETING OR (UPDATING AND :OLD.DOI != :NEW.DOI) THEN
+        g_keys.EXTEND;
+        g_keys(g_keys.LAST) := :OLD.DOI;
+      END IF;
+    END IF;
+  END AFTER EACH ROW;
+
+  AFTER STATEMENT IS
+    v_op CHAR(1) := CASE WHEN INSERTING THEN 'I' WHEN UPDATING THEN 'U' ELSE 'D' END;
+    v_statement NUMBER;
+  BEGIN
+    IF g_rows > 0 THEN
+      v_statement := change_log_seq.NEXTVAL;
+    END IF;
+    IF g_rows > c_max_keys THEN
+      INSERT INTO change_log (event_id, statement_id, table_name, key_value, op)
+      VALUES (change_log_seq.NEXTVAL, v_statement, 'PUBLICATION_TAB', NULL, v_op);
+    ELSIF g_rows > 0 THEN
+      INSERT INTO change_log (event_id, statement_id, table_name, key_value, op)
+      SELECT change_log_seq.NEXTVAL, v_statement, 'PUBLICATION_TAB', COLUMN_VALUE, v_op FROM TABLE(g_keys);
+    END IF;
+  END AFTER STATEMENT;
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_assign_changes
+FOR INSERT OR UPDATE OR DELETE ON assign_tab
+COMPOUND TRIGGER
+  c_max_keys CONSTANT PLS_INTEGER := 50;
+  g_keys key_list_t := key_list_t();
+  g_rows PLS_INTEGER := 0;
+
+  AFTER EACH ROW IS
+  BEGIN
+    g_rows := g_rows + 1;
+    IF g_rows <= c_max_keys THEN
+      IF NOT DELETING THEN
+        g_keys.EXTEND;
+        g_keys(g_keys.LAST) := :NEW.treatment_id || '/' || :NEW.drug_id;
+      END IF;
+      IF DELETING OR (UPDATING AND :OLD.treatment_id || '/' || :OLD.drug_id != :NEW.treatment_id || '/' || :NEW.drug_id) THEN
+        g_keys.EXTEND;
+        g_keys(g_keys.LAST) := :OLD.treatment_id || '/' || :OLD.drug_id;
+      END IF;
+    END IF;
+  END AFTER EACH ROW;
+
+  AFTER STATEMENT IS
+    v_op CHAR(1) := CASE WHEN INSERTING THEN 'I' WHEN UPDATING THEN 'U' ELSE 'D' END;
+    v_statement NUMBER;
+  BEGIN
+    IF g_rows > 0 THEN
+      v_statement := change_log_seq.NEXTVAL;
+    END IF;
+    IF g_rows > c_max_keys THEN
+      INSERT INTO change_log (event_id, statement_id, table_name, key_value, op)
+      VALUES (change_log_seq.NEXTVAL, v_statement, 'ASSIGN_TAB', NULL, v_op);
+    ELSIF g_rows > 0 THEN
+      INSERT INTO change_log (event_id, statement_id, table_name, key_value, op)
+      SELECT change_log_seq.NEXTVAL, v_statement, 'ASSIGN_TAB', COLUMN_VALUE, v_op FROM TABLE(g_keys);
+    END IF;
+  END AFTER STATEMENT;
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_writes_changes
+FOR INSERT OR UPDATE OR DELETE ON writes_tab
+COMPOUND TRIGGER
+  c_max_keys CONSTANT PLS_INTEGER := 50;
+  g_keys key_list_t := key_list_t();
+  g_rows PLS_INTEGER := 0;
+
+  AFTER EACH ROW IS
+  BEGIN
+    g_rows := g_rows + 1;
+    IF g_rows <= c_max_keys THEN
+      IF NOT DELETING THEN
+        g_keys.EXTEND;
+        g_keys(g_keys.LAST) := :NEW.publication_doi || '/' || RTRIM(:NEW.researcher_cf);
+      END IF;
+      IF DELETING OR (UPDATING AND :OLD.publication_doi || '/' || RTRIM(:OLD.researcher_cf) != :NEW.publication_doi || '/' || RTRIM(:NEW.researcher_cf)) THEN
+        g_keys.EXTEND;
+        g_keys(g_keys.LAST) := :OLD.publication_doi || '/' || RTRIM(:OLD.researcher_cf);
+      END IF;
+    END IF;
+  END AFTER EACH ROW;
+
+  AFTER STATEMENT IS
+    v_op CHAR(1) := CASE WHEN INSERTING THEN 'I' WHEN UPDATING THEN 'U' ELSE 'D' END;
+    v_statement NUMBER;
+  BEGIN
+    IF g_rows > 0 THEN
+      v_statement := change_log_seq.NEXTVAL;
+    END IF;
+    IF g_rows > c_max_keys THEN
+      INSERT INTO change_log (event_id, statement_id, table_name, key_value, op)
+      VALUES (change_log_seq.NEXTVAL, v_statement, 'WRITES_TAB', NULL, v_op);
+    ELSIF g_rows > 0 THEN
+      INSERT INTO change_log (event_id, statement_id, table_name, key_value, op)
+      SELECT change_log_seq.NEXTVAL, v_statement, 'WRITES_TAB', COLUMN_VALUE, v_op FROM TABLE(g_keys);
+    END IF;
+  END AFTER STATEMENT;
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_affected_changes
+FOR INSERT OR UPDATE OR DELETE ON affected_tab
+COMPOUND TRIGGER
+  c_max_keys CONSTANT PLS_INTEGER := 50;
+  g_keys key_list_t := key_list_t();
+  g_rows PLS_INTEGER := 0;
+
+  AFTER EACH ROW IS
+  BEGIN
+    g_rows := g_rows + 1;
+    IF g_rows <= c_max_keys THEN
+      IF NOT DELETING THEN
+        g_keys.EXTEND;
+        g_keys(g_keys.LAST) := :NEW.bio_id || '/' || :NEW.disease_id;
+      END IF;
+      IF DELETING OR (UPDATING AND :OLD.bio_id || '/' || :OLD.disease_id != :NEW.bio_id || '/' || :NEW.disease_id) THEN
+        g_keys.EXTEND;
+        g_keys(g_keys.LAST) := :OLD.bio_id || '/' || :OLD.disease_id;
+      END IF;
+    END IF;
+  END AFTER EACH ROW;
+
+  AFTER STATEMENT IS
+    v_op CHAR(1) := CASE WHEN INSERTING THEN 'I' WHEN UPDATING THEN 'U' ELSE 'D' END;
+    v_statement NUMBER;
+  BEGIN
+    IF g_rows > 0 THEN
+      v_statement := change_log_seq.NEXTVAL;
+    END IF;
+    IF g_rows > c_max_keys THEN
+      INSERT INTO change_log (event_id, statement_id, table_name, key_value, op)
+      VALUES (change_log_seq.NEXTVAL, v_statement, 'AFFECTED_TAB', NULL, v_op);
+    ELSIF g_rows > 0 THEN
+      INSERT INTO change_log (event_id, statement_id, table_name, key_value, op)
+      SELECT change_log_seq.NEXTVAL, v_statement, 'AFFECTED_TAB', COLUMN_VALUE, v_op FROM TABLE(g_keys);
+    END IF;
+  END AFTER STATEMENT;
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_cause_changes
+FOR INSERT OR UPDATE OR DELETE ON cause_tab
+COMPOUND TRIGGER
+  c_max_keys CONSTANT PLS_INTEGER := 50;
+  g_keys key_list_t := key_list_t();
+  g_rows PLS_INTEGER := 0;
+
+  AFTER EACH ROW IS
+  BEGIN
+    g_rows := g_rows + 1;
+    IF g_rows <= c_max_keys THEN
+      IF NOT DELETING THEN
+        g_keys.EXTEND;
+        g_keys(g_keys.LAST) := :NEW.drug_id || '/' || :NEW.allergy_id;
+      END IF;
+      IF DELETING OR (UPDATING AND :OLD.drug_id || '/' || :OLD.allergy_id != :NEW.drug_id || '/' || :NEW.allergy_id) THEN
+        g_keys.EXTEND;
+        g_keys(g_keys.LAST) := :OLD.drug_id || '/' || :OLD.allergy_id;
+      END IF;
+    END IF;
+  END AFTER EACH ROW;
+
+  AFTER STATEMENT IS
+    v_op CHAR(1) := CASE WHEN INSERTING THEN 'I' WHEN UPDATING THEN 'U' ELSE 'D' END;
+    v_statement NUMBER;
+  BEGIN
+    IF g_rows > 0 THEN
+      v_statement := change_log_seq.NEXTVAL;
+    END IF;
+    IF g_rows > c_max_keys THEN
+      INSERT INTO change_log (event_id, statement_id, table_name, key_value, op)
+      VALUES (change_log_seq.NEXTVAL, v_statement, 'CAUSE_TAB', NULL, v_op);
+    ELSIF g_rows > 0 THEN
+      INSERT INTO change_log (event_id, statement_id, table_name, key_value, op)
+      SELECT change_log_seq.NEXTVAL, v_statement, 'CAUSE_TAB', COLUMN_VALUE, v_op FROM TABLE(g_keys);
+    END IF;
+  END AFTER STATEMENT;
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_analyze_changes
+FOR INSERT OR UPDATE OR DELETE ON analyze_tab
+COMPOUND TRIGGER
+  c_max_keys CONSTANT PLS_INTEGER := 50;
+  g_keys key_list_t := key_list_t();
+  g_rows PLS_INTEGER := 0;
+
+  AFTER EACH ROW IS
+  BEGIN
+    g_rows := g_rows + 1;
+    IF g_rows <= c_max_keys THEN
+      IF NOT DELETING THEN
+        g_keys.EXTEND;
+        g_keys(g_keys.LAST) := :NEW.bio_id || '/' || :NEW.exp_id;
+      END IF;
+      IF DELETING OR (UPDATING AND :OLD.bio_id || '/' || :OLD.exp_id != :NEW.bio_id || '/' || :NEW.exp_id) THEN
+        g_keys.EXTEND;
+        g_keys(g_keys.LAST) := :OLD.bio_id || '/' || :OLD.exp_id;
+      END IF;
+    END IF;
+  END AFTER EACH ROW;
+
+  AFTER STATEMENT IS
+    v_op CHAR(1) := CASE WHEN INSERTING THEN 'I' WHEN UPDATING THEN 'U' ELSE 'D' END;
+    v_statement NUMBER;
+  BEGIN
+    IF g_rows > 0 THEN
+      v_statement := change_log_seq.NEXTVAL;
+    END IF;
+    IF g_rows > c_max_keys THEN
+      INSERT INTO change_log (event_id, statement_id, table_name, key_value, op)
+      VALUES (change_log_seq.NEXTVAL, v_statement, 'ANALYZE_TAB', NULL, v_op);
+    ELSIF g_rows > 0 THEN
+      INSERT INTO change_log (event_id, statement_id, table_name, key_value, op)
+      SELECT change_log_seq.NEXTVAL, v_statement, 'ANALYZE_TAB', COLUMN_VALUE, v_op FROM TABLE(g_keys);
+    END IF;
+  END AFTER STATEMENT;
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_consider_changes
+FOR INSERT OR UPDATE OR DELETE ON consider_tab
+COMPOUND TRIGGER
+  c_max_keys CONSTANT PLS_INTEGER := 50;
+  g_keys key_list_t := key_list_t();
+  g_rows PLS_INTEGER := 0;
+
+  AFTER EACH ROW IS
+  BEGIN
+    g_rows := g_rows + 1;
+    IF g_rows <= c_max_keys THEN
+      IF NOT DELETING THEN
+        g_keys.EXTEND;
+        g_keys(g_keys.LAST) := :NEW.future_work_id || '/' || RTRIM(:NEW.researcher_cf);
+      END IF;
+      IF DELETING OR (UPDATING AND :OLD.future_work_id || '/' || RTRIM(:OLD.researcher_cf) != :NEW.future_work_id || '/' || RTRIM(:NEW.researcher_cf)) THEN
+        g_keys.EXTEND;
+        g_keys(g_keys.LAST) := :OLD.future_work_id || '/' || RTRIM(:OLD.researcher_cf);
+      END IF;
+    END IF;
+  END AFTER EACH ROW;
+
+  AFTER STATEMENT IS
+    v_op CHAR(1) := CASE WHEN INSERTING THEN 'I' WHEN UPDATING THEN 'U' ELSE 'D' END;
+    v_statement NUMBER;
+  BEGIN
+    IF g_rows > 0 THEN
+      v_statement := change_log_seq.NEXTVAL;
+    END IF;
+    IF g_rows > c_max_keys THEN
+      INSERT INTO change_log (event_id, statement_id, table_name, key_value, op)
+      VALUES (change_log_seq.NEXTVAL, v_statement, 'CONSIDER_TAB', NULL, v_op);
+    ELSIF g_rows > 0 THEN
+      INSERT INTO change_log (event_id, statement_id, table_name, key_value, op)
+      SELECT change_log_seq.NEXTVAL, v_statement, 'CONSIDER_TAB', COLUMN_VALUE, v_op FROM TABLE(g_keys);
+    END IF;
+  END AFTER STATEMENT;
+END;
+/
@@ -146,6 +146,76 @@ END;
 /
 rollback to sp_an_affect_mismatch;
 
+--------------------------------------------------------------------------
+-- TEST SET-BASED BUSINESS-RULE TRIGGERS (multi-row statements)
+-- The compound triggers validate all rows of a statement at once: a single
+-- bad row must fail the whole statement, a batch of good rows must pass.
+--------------------------------------------------------------------------
+prompt === Test BR12 bulk: one early experiment fails the whole INSERT ... SELECT ===
+savepoint sp_exp_date_bulk;
+INSERT INTO experiment_tab (id, exper_date, is_positive, effect_description, disease_ref, treatment_ref)
+SELECT 9000000 + ROWNUM,
+       CASE WHEN ROWNUM = 1 THEN di.discovery_date - 10 ELSE di.discovery_date + 1 END,
+       'Y', 'Bulk BR12 test', REF(di), REF(t)
+  FROM disease_tab di, treatment_tab t
+ WHERE t.id = 1 AND ROWNUM <= 50;
+rollback to sp_exp_date_bulk;
+
+prompt === Test BR12 bulk: valid experiments are accepted (expect 50 rows created) ===
+savepoint sp_exp_date_bulk_ok;
+INSERT INTO experiment_tab (id, exper_date, is_positive, effect_description, disease_ref, treatment_ref)
+SELECT 9000000 + ROWNUM, di.discovery_date + 1, 'Y', 'Bulk BR12 test', REF(di), REF(t)
+  FROM disease_tab di, treatment_tab t
+ WHERE t.id = 1 AND ROWNUM <= 50;
+rollback to sp_exp_date_bulk_ok;
+
+prompt === Test BR12 bulk: UPDATE moving dates before discovery fails ===
+savepoint sp_exp_date_upd;
+UPDATE experiment_tab e
+   SET e.exper_date = DATE '1900-01-01'
+ WHERE e.id <= 10;
+rollback to sp_exp_date_upd;
+
+prompt === Test BR9-1 bulk: control BiologicalData mixed into a batch fails ===
+savepoint sp_aff_ctrl_bulk;
+INSERT INTO affected_tab (id, bio_ref, disease_ref)
+SELECT 9000000 + ROWNUM, REF(b), REF(d) FROM biological_data_tab b, disease_tab d
+ WHERE b.id IN (6, 7) AND d.id = 2; -- b6 disease, b7 control
+rollback to sp_aff_ctrl_bulk;
+
+prompt === Test FW trigger bulk: a negative experiment in a batch fails ===
+savepoint sp_fw_positive_bulk;
+INSERT INTO future_work_tab (id, title, exp_ref, pub_ref)
+SELECT 9000000 + ROWNUM, 'Bulk FW test', REF(e), REF(p)
+  FROM experiment_tab e, publication_tab p
+ WHERE e.id IN (1, 2) AND p.quality = 'top' AND ROWNUM <= 2; -- e1 negative, e2 positive
+rollback to sp_fw_positive_bulk;
+
+prompt === Test FW trigger bulk: positive experiments are accepted ===
+savepoint sp_fw_positive_bulk_ok;
+INSERT INTO future_work_tab (id, title, exp_ref, pub_ref)
+SELECT 9000000 + ROWNUM, 'Bulk FW test', REF(e),
+       (SELECT REF(p) FROM publication_tab p WHERE ROWNUM = 1)
+  FROM experiment_tab e
+ WHERE e.is_positive = 'Y' AND ROWNUM <= 50;
+rollback to sp_fw_positive_bulk_ok;
+
+prompt === Test BR14-1 bulk: control BiologicalData mixed into an Analyze batch fails ===
+savepoint sp_an_ctrl_bulk;
+INSERT INTO analyze_tab (id, bio_ref, exp_ref)
+SELECT 9000000 + ROWNUM, REF(b), REF(e) FROM biological_data_tab b, experiment_tab e
+ WHERE b.id IN (6, 7) AND e.id = 1; -- b7 is control
+rollback to sp_an_ctrl_bulk;
+
+prompt === Test BR14-2 bulk: Analyze batch with a disease mismatch fails ===
+savepoint sp_an_mismatch_bulk;
+INSERT INTO analyze_tab (id, bio_ref, exp_ref)
+SELECT 9000000 + ROWNUM, a.bio_ref, REF(e)
+  FROM affected_tab a, experiment_tab e
+ WHERE e.disease_ref <> a.disease_ref
+   AND ROWNUM <= 20;
+rollback to sp_an_mismatch_bulk;
+
 --------------------------------------------------------------------------
 -- TEST UNIQUENESS CONSTRAINTS
 --------------------------------------------------------------------------
@@ -185,4 +255,32 @@ INSERT INTO consider_tab (id, future_work_ref, researcher_ref)
 SELECT 906, c.future_work_ref, c.researcher_ref FROM consider_tab c WHERE ROWNUM = 1;
 rollback to sp_consider_dup2;
 
+--------------------------------------------------------------------------
+-- TEST SCALAR SHADOW KEYS (oracle_scalar_keys.sql)
+--------------------------------------------------------------------------
+prompt === Test keys: key omitted on insert is derived from the REF (expect 1 row with bio_id/disease_id set) ===
+savepoint sp_keys_fill;
+INSERT INTO affected_tab (id, bio_ref, disease_ref)
+SELECT 907, REF(b), REF(d) FROM biological_data_tab b, disease_tab d
+ WHERE b.condition = 'disease'
+   AND NOT EXISTS (SELECT 1 FROM affected_tab a WHERE a.bio_id = b.id AND a.disease_id = d.id)
+   AND ROWNUM = 1;
+SELECT id, bio_id, disease_id FROM affected_tab WHERE id = 907;
+rollback to sp_keys_fill;
+
+prompt === Test keys: key disagreeing with the REF is rejected (-20040) ===
+savepoint sp_keys_mismatch;
+INSERT INTO assign_tab (id, treatment_ref, drug_ref, treatment_id, drug_id)
+SELECT 908, REF(t), REF(d), t.id + 1, d.id
+  FROM treatment_tab t, drugs_tab d WHERE t.id = 1 AND d.id = 1;
+rollback to sp_keys_mismatch;
+
+prompt === Test keys: changing a REF without its key re-derives the key ===
+savepoint sp_keys_update;
+UPDATE experiment_tab e
+   SET e.treatment_ref = (SELECT REF(t) FROM treatment_tab t WHERE t.id = 2)
+ WHERE e.id = 1;
+SELECT id, treatment_id FROM experiment_tab WHERE id = 1;
+rollback to sp_keys_update;
+
 prompt Tests finished.
@@ -0,0 +1,383 @@
+-- Scalar shadow keys for REF columns
+-- Each REF attribute has a companion scalar attribute holding the referenced key. REF predicates
+-- (REF(x) = y_ref, DEREF(y_ref).id) cannot use ordinary B-tree indexes; the shadows can, and they
+-- also allow declarative UNIQUE/FOREIGN KEY constraints that are impossible on REF columns.
+--
+-- Writers should supply both the REF and the key (as the webapp does). When a key is NULL on insert,
+-- or a REF changes on update without its key, the trg_*_keys triggers derive it from the REF.
+-- At the end of each statement they verify, set-based, that keys and REFs still agree (-20040).
+-- The ids of the statement's rows are kept in an id_list_t, so statements of any size work.
+--
+-- Called from oracle_schema.sql and migrate_scalar_keys.sql.
+
+prompt Creating id_list_t for the statement-level id collections of the compound triggers
+
+-- Unbounded nested table, shared with oracle_triggers.sql: SYS.ODCINUMBERLIST is a VARRAY(32767)
+-- and fails with ORA-06532 on statements touching more rows (bulk loads, INSERT ... SELECT).
+CREATE OR REPLACE TYPE id_list_t AS TABLE OF NUMBER;
+/
+
+prompt Adding NOT NULL, UNIQUE and FOREIGN KEY constraints on scalar shadow keys
+
+ALTER TABLE biological_data_tab MODIFY (donor_cf NOT NULL);
+ALTER TABLE biological_data_tab ADD CONSTRAINT fk_bd_donor_cf FOREIGN KEY (donor_cf) REFERENCES donors_tab(CF);
+
+ALTER TABLE experiment_tab MODIFY (disease_id NOT NULL, treatment_id NOT NULL);
+ALTER TABLE experiment_tab ADD CONSTRAINT fk_exp_disease_id FOREIGN KEY (disease_id) REFERENCES disease_tab(id);
+ALTER TABLE experiment_tab ADD CONSTRAINT fk_exp_treatment_id FOREIGN KEY (treatment_id) REFERENCES treatment_tab(id);
+
+ALTER TABLE future_work_tab MODIFY (exp_id NOT NULL, pub_doi NOT NULL);
+ALTER TABLE future_work_tab ADD CONSTRAINT fk_fw_exp_id FOREIGN KEY (exp_id) REFERENCES experiment_tab(id);
+ALTER TABLE future_work_tab ADD CONSTRAINT fk_fw_pub_doi FOREIGN KEY (pub_doi) REFERENCES publication_tab(DOI);
+
+ALTER TABLE affected_tab MODIFY (bio_id NOT NULL, disease_id NOT NULL);
+ALTER TABLE affected_tab ADD CONSTRAINT uq_affected_pair UNIQUE (bio_id, disease_id);
+ALTER TABLE affected_tab ADD CONSTRAINT fk_aff_bio_id FOREIGN KEY (bio_id) REFERENCES biological_data_tab(id);
+ALTER TABLE affected_tab ADD CONSTRAINT fk_aff_disease_id FOREIGN KEY (disease_id) REFERENCES disease_tab(id);
+
+ALTER TABLE analyze_tab MODIFY (bio_id NOT NULL, exp_id NOT NULL);
+ALTER TABLE analyze_tab ADD CONSTRAINT uq_analyze_pair UNIQUE (bio_id, exp_id);
+ALTER TABLE analyze_tab ADD CONSTRAINT fk_analyze_bio_id FOREIGN KEY (bio_id) REFERENCES biological_data_tab(id);
+ALTER TABLE analyze_tab ADD CONSTRAINT fk_analyze_exp_id FOREIGN KEY (exp_id) REFERENCES experiment_tab(id);
+
+ALTER TABLE assign_tab MODIFY (treatment_id NOT NULL, drug_id NOT NULL);
+ALTER TABLE assign_tab ADD CONSTRAINT uq_assign_pair UNIQUE (treatment_id, drug_id);
+ALTER TABLE assign_tab ADD CONSTRAINT fk_assign_treatment_id FOREIGN KEY (treatment_id) REFERENCES treatment_tab(id);
+ALTER TABLE assign_tab ADD CONSTRAINT fk_assign_drug_id FOREIGN KEY (drug_id) REFERENCES drugs_tab(id);
+
+ALTER TABLE cause_tab MODIFY (drug_id NOT NULL, allergy_id NOT NULL);
+ALTER TABLE cause_tab ADD CONSTRAINT uq_cause_pair UNIQUE (drug_id, allergy_id);
+ALTER TABLE cause_tab ADD CONSTRAINT fk_cause_drug_id FOREIGN KEY (drug_id) REFERENCES drugs_tab(id);
+ALTER TABLE cause_tab ADD CONSTRAINT fk_cause_allergy_id FOREIGN KEY (allergy_id) REFERENCES allergy_tab(id);
+
+ALTER TABLE writes_tab MODIFY (publication_doi NOT NULL, researcher_cf NOT NULL);
+ALTER TABLE writes_tab ADD CONSTRAINT uq_writes_pair UNIQUE (publication_doi, researcher_cf);
+ALTER TABLE writes_tab ADD CONSTRAINT fk_writes_publication_doi FOREIGN KEY (publication_doi) REFERENCES publication_tab(DOI);
+ALTER TABLE writes_tab ADD CONSTRAINT fk_writes_researcher_cf FOREIGN KEY (researcher_cf) REFERENCES researchers_tab(CF);
+
+ALTER TABLE consider_tab MODIFY (future_work_id NOT NULL, researcher_cf NOT NULL);
+ALTER TABLE consider_tab ADD CONSTRAINT uq_consider_pair UNIQUE (future_work_id, researcher_cf);
+ALTER TABLE consider_tab ADD CONSTRAINT fk_consider_future_work_id FOREIGN KEY (future_work_id) REFERENCES future_work_tab(id);
+ALTER TABLE consider_tab ADD CONSTRAINT fk_consider_researcher_cf FOREIGN KEY (researcher_cf) REFERENCES researchers_tab(CF);
+
+prompt Creating triggers keeping scalar keys in sync with REFs
+
+CREATE OR REPLACE TRIGGER trg_bd_keys
+FOR INSERT OR UPDATE OF donor_ref, donor_cf ON biological_data_tab
+COMPOUND TRIGGER
+  g_ids id_list_t := id_list_t();
+
+  BEFORE EACH ROW IS
+  BEGIN
+    IF :NEW.donor_ref IS NOT NULL
+       AND (:NEW.donor_cf IS NULL OR (UPDATING AND :NEW.donor_ref <> :OLD.donor_ref AND :NEW.donor_cf = :OLD.donor_cf)) THEN
+      SELECT d.CF INTO :NEW.donor_cf FROM donors_tab d WHERE REF(d) = :NEW.donor_ref;
+    END IF;
+    g_ids.EXTEND;
+    g_ids(g_ids.LAST) := :NEW.id;
+  END BEFORE EACH ROW;
+
+  AFTER STATEMENT IS
+    v_cnt NUMBER;
+  BEGIN
+    SELECT COUNT(*) INTO v_cnt
+      FROM biological_data_tab x
+     WHERE x.id IN (SELECT COLUMN_VALUE FROM TABLE(g_ids))
+       AND (NOT EXISTS (SELECT 1 FROM donors_tab d WHERE d.CF = x.donor_cf AND REF(d) = x.donor_ref));
+    IF v_cnt > 0 THEN
+      RAISE_APPLICATION_ERROR(-20040, 'Scalar keys out of sync with REF columns in biological_data_tab');
+    END IF;
+  END AFTER STATEMENT;
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_experiment_keys
+FOR INSERT OR UPDATE OF disease_ref, treatment_ref, disease_id, treatment_id ON experiment_tab
+COMPOUND TRIGGER
+  g_ids id_list_t := id_list_t();
+
+  BEFORE EACH ROW IS
+  BEGIN
+    IF :NEW.disease_ref IS NOT NULL
+       AND (:NEW.disease_id IS NULL OR (UPDATING AND :NEW.disease_ref <> :OLD.disease_ref AND :NEW.disease_id = :OLD.disease_id)) THEN
+      SELECT d.id INTO :NEW.disease_id FROM disease_tab d WHERE REF(d) = :NEW.disease_ref;
+    END IF;
+    IF :NEW.treatment_ref IS NOT NULL
+       AND (:NEW.treatment_id IS NULL OR (UPDATING AND :NEW.treatment_ref <> :OLD.treatment_ref AND :NEW.treatment_id = :OLD.treatment_id)) THEN
+      SELECT t.id INTO :NEW.treatment_id FROM treatment_tab t WHERE REF(t) = :NEW.treatment_ref;
+    END IF;
+    g_ids.EXTEND;
+    g_ids(g_ids.LAST) := :NEW.id;
+  END BEFORE EACH ROW;
+
+  AFTER STATEMENT IS
+    v_cnt NUMBER;
+  BEGIN
+    SELECT COUNT(*) INTO v_cnt
+      FROM experiment_tab x
+     WHERE x.id IN (SELECT COLUMN_VALUE FROM TABLE(g_ids))
+       AND (NOT EXISTS (SELECT 1 FROM disease_tab d WHERE d.id = x.disease_id AND REF(d) = x.disease_ref)
+            OR NOT EXISTS (SELECT 1 FROM treatment_tab t WHERE t.id = x.treatment_id AND REF(t) = x.treatment_ref));
+    IF v_cnt > 0 THEN
+      RAISE_APPLICATION_ERROR(-20040, 'Scalar keys out of sync with REF columns in experiment_tab');
+    END IF;
+  END AFTER STATEMENT;
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_future_work_keys
+FOR INSERT OR UPDATE OF exp_ref, pub_ref, exp_id, pub_doi ON future_work_tab
+COMPOUND TRIGGER
+  g_ids id_list_t := id_list_t();
+
+  BEFORE EACH ROW IS
+  BEGIN
+    IF :NEW.exp_ref IS NOT NULL
+       AND (:NEW.exp_id IS NULL OR (UPDATING AND :NEW.exp_ref <> :OLD.exp_ref AND :NEW.exp_id = :OLD.exp_id)) THEN
+      SELECT e.id INTO :NEW.exp_id FROM experiment_tab e WHERE REF(e) = :NEW.exp_ref;
+    END IF;
+    IF :NEW.pub_ref IS NOT NULL
+       AND (:NEW.pub_doi IS NULL OR (UPDATING AND :NEW.pub_ref <> :OLD.pub_ref AND :NEW.pub_doi = :OLD.pub_doi)) THEN
+      SELECT p.DOI INTO :NEW.pub_doi FROM publication_tab p WHERE REF(p) = :NEW.pub_ref;
+    END IF;
+    g_ids.EXTEND;
+    g_ids(g_ids.LAST) := :NEW.id;
+  END BEFORE EACH ROW;
+
+  AFTER STATEMENT IS
+    v_cnt NUMBER;
+  BEGIN
+    SELECT COUNT(*) INTO v_cnt
+      FROM future_work_tab x
+     WHERE x.id IN (SELECT COLUMN_VALUE FROM TABLE(g_ids))
+       AND (NOT EXISTS (SELECT 1 FROM experiment_tab e WHERE e.id = x.exp_id AND REF(e) = x.exp_ref)
+            OR NOT EXISTS (SELECT 1 FROM publication_tab p WHERE p.DOI = x.pub_doi AND REF(p) = x.pub_ref));
+    IF v_cnt > 0 THEN
+      RAISE_APPLICATION_ERROR(-20040, 'Scalar keys out of sync with REF columns in future_work_tab');
+    END IF;
+  END AFTER STATEMENT;
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_affected_keys
+FOR INSERT OR UPDATE OF bio_ref, disease_ref, bio_id, disease_id ON affected_tab
+COMPOUND TRIGGER
+  g_ids id_list_t := id_list_t();
+
+  BEFORE EACH ROW IS
+  BEGIN
+    IF :NEW.bio_ref IS NOT NULL
+       AND (:NEW.bio_id IS NULL OR (UPDATING AND :NEW.bio_ref <> :OLD.bio_ref AND :NEW.bio_id = :OLD.bio_id)) THEN
+      SELECT b.id INTO :NEW.bio_id FROM biological_data_tab b WHERE REF(b) = :NEW.bio_ref;
+    END IF;
+    IF :NEW.disease_ref IS NOT NULL
+       AND (:NEW.disease_id IS NULL OR (UPDATING AND :NEW.disease_ref <> :OLD.disease_ref AND :NEW.disease_id = :OLD.disease_id)) THEN
+      SELECT d.id INTO :NEW.disease_id FROM disease_tab d WHERE REF(d) = :NEW.disease_ref;
+    END IF;
+    g_ids.EXTEND;
+    g_ids(g_ids.LAST) := :NEW.id;
+  END BEFORE EACH ROW;
+
+  AFTER STATEMENT IS
+    v_cnt NUMBER;
+  BEGIN
+    SELECT COUNT(*) INTO v_cnt
+      FROM affected_tab x
+     WHERE x.id IN (SELECT COLUMN_VALUE FROM TABLE(g_ids))
+       AND (NOT EXISTS (SELECT 1 FROM biological_data_tab b WHERE b.id = x.bio_id AND REF(b) = x.bio_ref)
+            OR NOT EXISTS (SELECT 1 FROM disease_tab d WHERE d.id = x.disease_id AND REF(d) = x.disease_ref));
+    IF v_cnt > 0 THEN
+      RAISE_APPLICATION_ERROR(-20040, 'Scalar keys out of sync with REF columns in affected_tab');
+    END IF;
+  END AFTER STATEMENT;
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_analyze_keys
+FOR INSERT OR UPDATE OF bio_ref, exp_ref, bio_id, exp_id ON analyze_tab
+COMPOUND TRIGGER
+  g_ids id_list_t := id_list_t();
+
+  BEFORE EACH ROW IS
+  BEGIN
+    IF :NEW.bio_ref IS NOT NULL
+       AND (:NEW.bio_id IS NULL OR (UPDATING AND :NEW.bio_ref <> :OLD.bio_ref AND :NEW.bio_id = :OLD.bio_id)) THEN
+      SELECT b.id INTO :NEW.bio_id FROM biological_data_tab b WHERE REF(b) = :NEW.bio_ref;
+    END IF;
+    IF :NEW.exp_ref IS NOT NULL
+       AND (:NEW.exp_id IS NULL OR (UPDATING AND :NEW.exp_ref <> :OLD.exp_ref AND :NEW.exp_id = :OLD.exp_id)) THEN
+      SELECT e.id INTO :NEW.exp_id FROM experiment_tab e WHERE REF(e) = :NEW.exp_ref;
+    END IF;
+    g_ids.EXTEND;
+    g_ids(g_ids.LAST) := :NEW.id;
+  END BEFORE EACH ROW;
+
+  AFTER STATEMENT IS
+    v_cnt NUMBER;
+  BEGIN
+    SELECT COUNT(*) INTO v_cnt
+      FROM analyze_tab x
+     WHERE x.id IN (SELECT COLUMN_VALUE FROM TABLE(g_ids))
+       AND (NOT EXISTS (SELECT 1 FROM biological_data_tab b WHERE b.id = x.bio_id AND REF(b) = x.bio_ref)
+            OR NOT EXISTS (SELECT 1 FROM experiment_tab e WHERE e.id = x.exp_id AND REF(e) = x.exp_ref));
+    IF v_cnt > 0 THEN
+      RAISE_APPLICATION_ERROR(-20040, 'Scalar keys out of sync with REF columns in analyze_tab');
+    END IF;
+  END AFTER STATEMENT;
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_assign_keys
+FOR INSERT OR UPDATE OF treatment_ref, drug_ref, treatment_id, drug_id ON assign_tab
+COMPOUND TRIGGER
+  g_ids id_list_t := id_list_t();
+
+  BEFORE EACH ROW IS
+  BEGIN
+    IF :NEW.treatment_ref IS NOT NULL
+       AND (:NEW.treatment_id IS NULL OR (UPDATING AND :NEW.treatment_ref <> :OLD.treatment_ref AND :NEW.treatment_id = :OLD.treatment_id)) THEN
+      SELECT t.id INTO :NEW.treatment_id FROM treatment_tab t WHERE REF(t) = :NEW.treatment_ref;
+    END IF;
+    IF :NEW.drug_ref IS NOT NULL
+       AND (:NEW.drug_id IS NULL OR (UPDATING AND :NEW.drug_ref <> :OLD.drug_ref AND :NEW.drug_id = :OLD.drug_id)) THEN
+      SELECT d.id INTO :NEW.drug_id FROM drugs_tab d WHERE REF(d) = :NEW.drug_ref;
+    END IF;
+    g_ids.EXTEND;
+    g_ids(g_ids.LAST) := :NEW.id;
+  END BEFORE EACH ROW;
+
+  AFTER STATEMENT IS
+    v_cnt NUMBER;
+  BEGIN
+    SELECT COUNT(*) INTO v_cnt
+      FROM assign_tab x
+     WHERE x.id IN (SELECT COLUMN_VALUE FROM TABLE(g_ids))
+       AND (NOT EXISTS (SELECT 1 FROM treatment_tab t WHERE t.id = x.treatment_id AND REF(t) = x.treatment_ref)
+            OR NOT EXISTS (SELECT 1 FROM drugs_tab d WHERE d.id = x.drug_id AND REF(d) = x.drug_ref));
+    IF v_cnt > 0 THEN
+      RAISE_APPLICATION_ERROR(-20040, 'Scalar keys out of sync with REF columns in assign_tab');
+    END IF;
+  END AFTER STATEMENT;
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_cause_keys
+FOR INSERT OR UPDATE OF drug_ref, allergy_ref, drug_id, allergy_id ON cause_tab
+COMPOUND TRIGGER
+  g_ids id_list_t := id_list_t();
+
+  BEFORE EACH ROW IS
+  BEGIN
+    IF :NEW.drug_ref IS NOT NULL
+       AND (:NEW.drug_id IS NULL OR (UPDATING AND :NEW.drug_ref <> :OLD.drug_ref AND :NEW.drug_id = :OLD.drug_id)) THEN
+      SELECT d.id INTO :NEW.drug_id FROM drugs_tab d WHERE REF(d) = :NEW.drug_ref;
+    END IF;
+    IF :NEW.allergy_ref IS NOT NULL
+       AND (:NEW.allergy_id IS NULL OR (UPDATING AND :NEW.allergy_ref <> :OLD.allergy_ref AND :NEW.allergy_id = :OLD.allergy_id)) THEN
+      SELECT a.id INTO :NEW.allergy_id FROM allergy_tab a WHERE REF(a) = :NEW.allergy_ref;
+    END IF;
+    g_ids.EXTEND;
+    g_ids(g_ids.LAST) := :NEW.id;
+  END BEFORE EACH ROW;
+
+  AFTER STATEMENT IS
+    v_cnt NUMBER;
+  BEGIN
+    SELECT COUNT(*) INTO v_cnt
+      FROM cause_tab x
+     WHERE x.id IN (SELECT COLUMN_VALUE FROM TABLE(g_ids))
+       AND (NOT EXISTS (SELECT 1 FROM drugs_tab d WHERE d.id = x.drug_id AND REF(d) = x.drug_ref)
+            OR NOT EXISTS (SELECT 1 FROM allergy_tab a WHERE a.id = x.allergy_id AND REF(a) = x.allergy_ref));
+    IF v_cnt > 0 THEN
+      RAISE_APPLICATION_ERROR(-20040, 'Scalar keys out of sync with REF columns in cause_tab');
+    END IF;
+  END AFTER STATEMENT;
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_writes_keys
+FOR INSERT OR UPDATE OF publication_ref, researcher_ref, publication_doi, researcher_cf ON writes_tab
+COMPOUND TRIGGER
+  g_ids id_list_t := id_list_t();
+
+  BEFORE EACH ROW IS
+  BEGIN
+    IF :NEW.publication_ref IS NOT NULL
+       AND (:NEW.publication_doi IS NULL OR (UPDATING AND :NEW.publication_ref <> :OLD.publication_ref AND :NEW.publication_doi = :OLD.publication_doi)) THEN
+      SELECT p.DOI INTO :NEW.publication_doi FROM publication_tab p WHERE REF(p) = :NEW.publication_ref;
+    END IF;
+    IF :NEW.researcher_ref IS NOT NULL
+       AND (:NEW.researcher_cf IS NULL OR (UPDATING AND :NEW.researcher_ref <> :OLD.researcher_ref AND :NEW.researcher_cf = :OLD.researcher_cf)) THEN
+      SELECT r.CF INTO :NEW.researcher_cf FROM researchers_tab r WHERE REF(r) = :NEW.researcher_ref;
+    END IF;
+    g_ids.EXTEND;
+    g_ids(g_ids.LAST) := :NEW.id;
+  END BEFORE EACH ROW;
+
+  AFTER STATEMENT IS
+    v_cnt NUMBER;
+  BEGIN
+    SELECT COUNT(*) INTO v_cnt
+      FROM writes_tab x
+     WHERE x.id IN (SELECT COLUMN_VALUE FROM TABLE(g_ids))
+       AND (NOT EXISTS (SELECT 1 FROM publication_tab p WHERE p.DOI = x.publication_doi AND REF(p) = x.publication_ref)
+            OR NOT EXISTS (SELECT 1 FROM researchers_tab r WHERE r.CF = x.researcher_cf AND REF(r) = x.researcher_ref));
+    IF v_cnt > 0 THEN
+      RAISE_APPLICATION_ERROR(-20040, 'Scalar keys out of sync with REF columns in writes_tab');
+    END IF;
+  END AFTER STATEMENT;
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_consider_keys
+FOR INSERT OR UPDATE OF future_work_ref, researcher_ref, future_work_id, researcher_cf ON consider_tab
+COMPOUND TRIGGER
+  g_ids id_list_t := id_list_t();
+
+  BEFORE EACH ROW IS
+  BEGIN
+    IF :NEW.future_work_ref IS NOT NULL
+       AND (:NEW.future_work_id IS NULL OR (UPDATING AND :NEW.future_work_ref <> :OLD.future_work_ref AND :NEW.future_work_id = :OLD.future_work_id)) THEN
+      SELECT f.id INTO :NEW.future_work_id FROM future_work_tab f WHERE REF(f) = :NEW.future_work_ref;
+    END IF;
+    IF :NEW.researcher_ref IS NOT NULL
+       AND (:NEW.researcher_cf IS NULL OR (UPDATING AND :NEW.researcher_ref <> :OLD.researcher_ref AND :NEW.researcher_cf = :OLD.researcher_cf)) THEN
+      SELECT r.CF INTO :NEW.researcher_cf FROM researchers_tab r WHERE REF(r) = :NEW.researcher_ref;
+    END IF;
+    g_ids.EXTEND;
+    g_ids(g_ids.LAST) := :NEW.id;
+  END BEFORE EACH ROW;
+
+  AFTER STATEMENT IS
+    v_cnt NUMBER;
+  BEGIN
+    SELECT COUNT(*) INTO v_cnt
+      FROM consider_tab x
+     WHERE x.id IN (SELECT COLUMN_VALUE FROM TABLE(g_ids))
+       AND (NOT EXISTS (SELECT 1 FROM future_work_tab f WHERE f.id = x.future_work_id AND REF(f) = x.future_work_ref)
+            OR NOT EXISTS (SELECT 1 FROM researchers_tab r WHERE r.CF = x.researcher_cf AND REF(r) = x.researcher_ref));
+    IF v_cnt > 0 THEN
+      RAISE_APPLICATION_ERROR(-20040, 'Scalar keys out of sync with REF columns in consider_tab');
+    END IF;
+  END AFTER STATEMENT;
+END;
+/
+
+prompt Creating indexes on scalar shadow keys
+
+-- UNIQUE constraints above index the leading key of every association pair
+-- (affected.bio_id, analyze.bio_id, assign.treatment_id, cause.drug_id, writes.publication_doi,
+-- consider.future_work_id); the indexes below cover the other direction and the entity FKs.
+CREATE INDEX idx_bd_donor_cf         ON biological_data_tab(donor_cf);
+CREATE INDEX idx_exp_disease_id      ON experiment_tab(disease_id);
+CREATE INDEX idx_exp_treatment_id    ON experiment_tab(treatment_id);
+CREATE INDEX idx_fw_exp              ON future_work_tab(exp_id);
+CREATE INDEX idx_fw_pub_doi          ON future_work_tab(pub_doi);
+-- OP4: affected rows of one disease
+CREATE INDEX idx_aff_dis_bio         ON affected_tab(disease_id, bio_id);
+CREATE INDEX idx_analyze_exp         ON analyze_tab(exp_id);
+CREATE INDEX idx_assign_drug_id      ON assign_tab(drug_id);
+CREATE INDEX idx_cause_allergy_id    ON cause_tab(allergy_id);
+-- OP5: publications of one researcher, suggestions considered by one researcher
+CREATE INDEX idx_writes_researcher_cf ON writes_tab(researcher_cf);
+CREATE INDEX idx_consider_researcher_cf ON consider_tab(researcher_cf);
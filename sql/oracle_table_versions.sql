@@ -0,0 +1,137 @@
+-- Per-table change counters for HTTP conditional GET (ETag / Last-Modified in the webapp)
+-- Every INSERT/UPDATE/DELETE statement on a tracked table bumps its row in table_version, whatever the
+-- source (webapp, operations.sql, insert_auto.sql, manual SQL). The webapp reads the versions of the tables
+-- behind a page with one primary-key lookup and answers 304 Not Modified when none of them changed.
+-- Statement-level triggers: a bulk statement costs one extra UPDATE, not one per row. Writers of the same
+-- table serialize on its version row until commit, which is negligible at this application's write rate.
+-- Included by oracle_schema.sql; can also be run on its own against an existing schema.
+
+prompt Creating table_version
+
+CREATE TABLE table_version (
+  table_name  VARCHAR2(30) PRIMARY KEY,
+  version     NUMBER DEFAULT 0 NOT NULL,
+  changed_at  TIMESTAMP WITH TIME ZONE DEFAULT SYSTIMESTAMP NOT NULL
+);
+
+INSERT INTO table_version (table_name)
+SELECT column_value FROM TABLE(SYS.ODCIVARCHAR2LIST(
+  'DONORS_TAB', 'RESEARCHERS_TAB', 'DISEASE_TAB', 'BIOLOGICAL_DATA_TAB',
+  'TREATMENT_TAB', 'DRUGS_TAB', 'ALLERGY_TAB', 'PUBLICATION_TAB',
+  'EXPERIMENT_TAB', 'FUTURE_WORK_TAB', 'ASSIGN_TAB', 'WRITES_TAB',
+  'AFFECTED_TAB', 'CAUSE_TAB', 'ANALYZE_TAB', 'CONSIDER_TAB'));
+COMMIT;
+
+prompt Creating version triggers
+
+CREATE OR REPLACE TRIGGER trg_donors_version
+AFTER INSERT OR UPDATE OR DELETE ON donors_tab
+BEGIN
+  UPDATE table_version SET version = version + 1, changed_at = SYSTIMESTAMP WHERE table_name = 'DONORS_TAB';
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_researchers_version
+AFTER INSERT OR UPDATE OR DELETE ON researchers_tab
+BEGIN
+  UPDATE table_version SET version = version + 1, changed_at = SYSTIMESTAMP WHERE table_name = 'RESEARCHERS_TAB';
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_disease_version
+AFTER INSERT OR UPDATE OR DELETE ON disease_tab
+BEGIN
+  UPDATE table_version SET version = version + 1, changed_at = SYSTIMESTAMP WHERE table_name = 'DISEASE_TAB';
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_bd_version
+AFTER INSERT OR UPDATE OR DELETE ON biological_data_tab
+BEGIN
+  UPDATE table_version SET version = version + 1, changed_at = SYSTIMESTAMP WHERE table_name = 'BIOLOGICAL_DATA_TAB';
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_treatment_version
+AFTER INSERT OR UPDATE OR DELETE ON treatment_tab
+BEGIN
+  UPDATE table_version SET version = version + 1, changed_at = SYSTIMESTAMP WHERE table_name = 'TREATMENT_TAB';
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_drugs_version
+AFTER INSERT OR UPDATE OR DELETE ON drugs_tab
+BEGIN
+  UPDATE table_version SET version = version + 1, changed_at = SYSTIMESTAMP WHERE table_name = 'DRUGS_TAB';
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_allergy_version
+AFTER INSERT OR UPDATE OR DELETE ON allergy_tab
+BEGIN
+  UPDATE table_version SET version = version + 1, changed_at = SYSTIMESTAMP WHERE table_name = 'ALLERGY_TAB';
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_publication_version
+AFTER INSERT OR UPDATE OR DELETE ON publication_tab
+BEGIN
+  UPDATE table_version SET version = version + 1, changed_at = SYSTIMESTAMP WHERE table_name = 'PUBLICATION_TAB';
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_experiment_version
+AFTER INSERT OR UPDATE OR DELETE ON experiment_tab
+BEGIN
+  UPDATE table_version SET version = version + 1, changed_at = SYSTIMESTAMP WHERE table_name = 'EXPERIMENT_TAB';
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_future_work_version
+AFTER INSERT OR UPDATE OR DELETE ON future_work_tab
+BEGIN
+  UPDATE table_version SET version = version + 1, changed_at = SYSTIMESTAMP WHERE table_name = 'FUTURE_WORK_TAB';
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_assign_version
+AFTER INSERT OR UPDATE OR DELETE ON assign_tab
+BEGIN
+  UPDATE table_version SET version = version + 1, changed_at = SYSTIMESTAMP WHERE table_name = 'ASSIGN_TAB';
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_writes_version
+AFTER INSERT OR UPDATE OR DELETE ON writes_tab
+BEGIN
+  UPDATE table_version SET version = version + 1, changed_at = SYSTIMESTAMP WHERE table_name = 'WRITES_TAB';
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_affected_version
+AFTER INSERT OR UPDATE OR DELETE ON affected_tab
+BEGIN
+  UPDATE table_version SET version = version + 1, changed_at = SYSTIMESTAMP WHERE table_name = 'AFFECTED_TAB';
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_cause_version
+AFTER INSERT OR UPDATE OR DELETE ON cause_tab
+BEGIN
+  UPDATE table_version SET version = version + 1, changed_at = SYSTIMESTAMP WHERE table_name = 'CAUSE_TAB';
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_analyze_version
+AFTER INSERT OR UPDATE OR DELETE ON analyze_tab
+BEGIN
+  UPDATE table_version SET version = version + 1, changed_at = SYSTIMESTAMP WHERE table_name = 'ANALYZE_TAB';
+END;
+/
+
+CREATE OR REPLACE TRIGGER trg_consider_version
+AFTER INSERT OR UPDATE OR DELETE ON consider_tab
+BEGIN
+  UPDATE table_version SET version = version + 1, changed_at = SYSTIMESTAMP WHERE table_name = 'CONSIDER_TAB';
+END;
+/
@@ -0,0 +1,229 @@
+-- Cross-entity business-rule triggers
+-- Joins use the scalar shadow keys (see oracle_scalar_keys.sql) instead of REF/DEREF predicates.
+-- Called from oracle_schema.sql and migrate_scalar_keys.sql; every statement is CREATE OR REPLACE.
+-- The id collections use id_list_t, created in oracle_scalar_keys.sql (run just before this file).
+
+prompt Adding triggers for cross-entity business rules
+
+-- BR12: Experiment.exper_date >= Disease.discovery_date for attempted disease
+-- Compound trigger: rows are collected by id and validated with one join per statement,
+-- so bulk inserts do not issue a recursive lookup per row.
+CREATE OR REPLACE TRIGGER trg_experiment_date_vs_disease
+FOR INSERT OR UPDATE OF exper_date, disease_ref, disease_id ON experiment_tab
+COMPOUND TRIGGER
+  g_ids id_list_t := id_list_t();
+
+  BEFORE EACH ROW IS
+  BEGIN
+    g_ids.EXTEND;
+    g_ids(g_ids.LAST) := :NEW.id;
+  END BEFORE EACH ROW;
+
+  AFTER STATEMENT IS
+    v_missing NUMBER;
+    v_bad     NUMBER;
+  BEGIN
+    IF g_ids.COUNT > 0 THEN
+      SELECT COUNT(CASE WHEN d.id IS NULL THEN 1 END),
+             COUNT(CASE WHEN e.exper_date < d.discovery_date THEN 1 END)
+        INTO v_missing, v_bad
+        FROM experiment_tab e
+        LEFT JOIN disease_tab d
+          ON d.id = e.disease_id
+       WHERE e.id IN (SELECT COLUMN_VALUE FROM TABLE(g_ids));
+
+      IF v_missing > 0 THEN
+        RAISE NO_DATA_FOUND;
+      END IF;
+      IF v_bad > 0 THEN
+        RAISE_APPLICATION_ERROR(-20001, 'Experiment date must be on or after the Disease discovery_date');
+      END IF;
+    END IF;
+  END AFTER STATEMENT;
+END;
+/
+
+-- BR13: Disease.discovery_date not in the future
+CREATE OR REPLACE TRIGGER trg_disease_discovery_not_future
+BEFORE INSERT OR UPDATE OF discovery_date ON disease_tab
+FOR EACH ROW
+BEGIN
+  IF :NEW.discovery_date > SYSDATE THEN
+    RAISE_APPLICATION_ERROR(-20002, 'Disease discovery_date cannot be in the future');
+  END IF;
+END;
+/
+
+-- BR9 (part 1): Affected rows only for BiologicalData with condition = 'disease'
+CREATE OR REPLACE TRIGGER trg_affected_insert_check_condition
+FOR INSERT OR UPDATE OF bio_ref, bio_id ON affected_tab
+COMPOUND TRIGGER
+  g_ids id_list_t := id_list_t();
+
+  BEFORE EACH ROW IS
+  BEGIN
+    g_ids.EXTEND;
+    g_ids(g_ids.LAST) := :NEW.id;
+  END BEFORE EACH ROW;
+
+  AFTER STATEMENT IS
+    v_missing NUMBER;
+    v_bad     NUMBER;
+  BEGIN
+    IF g_ids.COUNT > 0 THEN
+      SELECT COUNT(CASE WHEN b.id IS NULL THEN 1 END),
+             COUNT(CASE WHEN LOWER(b.condition) <> 'disease' THEN 1 END)
+        INTO v_missing, v_bad
+        FROM affected_tab a
+        LEFT JOIN biological_data_tab b
+          ON b.id = a.bio_id
+       WHERE a.id IN (SELECT COLUMN_VALUE FROM TABLE(g_ids));
+
+      IF v_missing > 0 THEN
+        RAISE NO_DATA_FOUND;
+      END IF;
+      IF v_bad > 0 THEN
+        RAISE_APPLICATION_ERROR(-20003, 'Affected link allowed only for BiologicalData with condition = disease');
+      END IF;
+    END IF;
+  END AFTER STATEMENT;
+END;
+/
+
+-- BR9 (part 2): Prevent deleting the last Affected when BD.condition = disease
+CREATE OR REPLACE TRIGGER trg_affected_prevent_delete_last
+BEFORE DELETE ON affected_tab
+FOR EACH ROW
+DECLARE
+  v_condition VARCHAR2(200);
+  v_cnt NUMBER;
+BEGIN
+  SELECT b.condition
+    INTO v_condition
+    FROM biological_data_tab b
+   WHERE b.id = :OLD.bio_id;
+
+  IF LOWER(v_condition) = 'disease' THEN
+    SELECT COUNT(*)
+      INTO v_cnt
+      FROM affected_tab a
+     WHERE a.bio_id = :OLD.bio_id
+       AND a.disease_id <> :OLD.disease_id;
+
+    IF v_cnt = 0 THEN
+      RAISE_APPLICATION_ERROR(-20004, 'Cannot delete the last Affected row for a diseased BiologicalData');
+    END IF;
+  END IF;
+END;
+/
+
+-- Enforce: any Future Work must reference a positive experiment
+CREATE OR REPLACE TRIGGER trg_future_work_requires_positive_exp
+FOR INSERT OR UPDATE OF exp_ref, exp_id ON future_work_tab
+COMPOUND TRIGGER
+  g_ids id_list_t := id_list_t();
+
+  BEFORE EACH ROW IS
+  BEGIN
+    g_ids.EXTEND;
+    g_ids(g_ids.LAST) := :NEW.id;
+  END BEFORE EACH ROW;
+
+  AFTER STATEMENT IS
+    v_missing NUMBER;
+    v_bad     NUMBER;
+  BEGIN
+    IF g_ids.COUNT > 0 THEN
+      SELECT COUNT(CASE WHEN e.id IS NULL THEN 1 END),
+             COUNT(CASE WHEN UPPER(e.is_positive) <> 'Y' THEN 1 END)
+        INTO v_missing, v_bad
+        FROM future_work_tab f
+        LEFT JOIN experiment_tab e
+          ON e.id = f.exp_id
+       WHERE f.id IN (SELECT COLUMN_VALUE FROM TABLE(g_ids));
+
+      IF v_missing > 0 THEN
+        RAISE NO_DATA_FOUND;
+      END IF;
+      IF v_bad > 0 THEN
+        RAISE_APPLICATION_ERROR(-20011, 'FutureWork requires a positive Experiment');
+      END IF;
+    END IF;
+  END AFTER STATEMENT;
+END;
+/
+
+-- BR14 (part 1): On Analyze insert/update, ensure BD is diseased and matches Experiment.disease
+CREATE OR REPLACE TRIGGER trg_analyze_consistency
+FOR INSERT OR UPDATE OF bio_ref, exp_ref, bio_id, exp_id ON analyze_tab
+COMPOUND TRIGGER
+  g_ids id_list_t := id_list_t();
+
+  BEFORE EACH ROW IS
+  BEGIN
+    g_ids.EXTEND;
+    g_ids(g_ids.LAST) := :NEW.id;
+  END BEFORE EACH ROW;
+
+  AFTER STATEMENT IS
+    v_missing  NUMBER;
+    v_control  NUMBER;
+    v_no_link  NUMBER;
+  BEGIN
+    IF g_ids.COUNT > 0 THEN
+      -- BD must not be control; there must exist Affected(BD, Experiment.disease)
+      SELECT COUNT(CASE WHEN x.bio_id IS NULL THEN 1 END),
+             COUNT(CASE WHEN LOWER(x.condition) = 'control' THEN 1 END),
+             COUNT(CASE WHEN x.has_link = 0 THEN 1 END)
+        INTO v_missing, v_control, v_no_link
+        FROM (
+          SELECT b.id AS bio_id,
+                 b.condition,
+                 CASE WHEN EXISTS (
+                        SELECT 1
+                          FROM affected_tab a, experiment_tab e
+                         WHERE e.id = z.exp_id
+                           AND a.bio_id = z.bio_id
+                           AND a.disease_id = e.disease_id
+                      ) THEN 1 ELSE 0 END AS has_link
+            FROM analyze_tab z
+            LEFT JOIN biological_data_tab b
+              ON b.id = z.bio_id
+           WHERE z.id IN (SELECT COLUMN_VALUE FROM TABLE(g_ids))
+        ) x;
+
+      IF v_missing > 0 THEN
+        RAISE NO_DATA_FOUND;
+      END IF;
+      IF v_control > 0 THEN
+        RAISE_APPLICATION_ERROR(-20005, 'Control BiologicalData cannot be analyzed in experiments attempting a disease');
+      END IF;
+      IF v_no_link > 0 THEN
+        RAISE_APPLICATION_ERROR(-20006, 'BiologicalData must be affected by the same disease attempted by the Experiment');
+      END IF;
+    END IF;
+  END AFTER STATEMENT;
+END;
+/
+
+-- BR14 (part 2): Prevent deleting Affected if there are Analyze rows relying on it
+CREATE OR REPLACE TRIGGER trg_affected_block_if_analyze_exists
+BEFORE DELETE ON affected_tab
+FOR EACH ROW
+DECLARE
+  v_cnt NUMBER;
+BEGIN
+  SELECT COUNT(*) INTO v_cnt
+  FROM analyze_tab z
+  WHERE z.bio_id = :OLD.bio_id
+    AND EXISTS (
+      SELECT 1 FROM experiment_tab e
+      WHERE e.id = z.exp_id
+        AND e.disease_id = :OLD.disease_id
+    );
+
+  IF v_cnt > 0 THEN
+    RAISE_APPLICATION_ERROR(-20007, 'Cannot remove Affected: existing Analyze rows require this disease link');
+  END IF;
+END;
+/
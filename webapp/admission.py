@@ -0,0 +1,144 @@
+"""Admission control: per-class concurrency limits with load shedding.
+
+Every request is assigned a class from its endpoint: 'heavy' for the
+analytical operations listed in Config.ADMISSION_HEAVY_ENDPOINTS, 'light'
+for everything else. Each class has its own limit of requests running at
+the same time in this process. A request over the limit waits for a slot
+for at most the class timeout, and only if fewer than the class maximum
+are already waiting. Otherwise it is shed with 503 and a Retry-After
+header. A burst of op4/op5 requests therefore fills the heavy slots and
+its own queue, but cannot delay cheap pages in the light class.
+
+Limits are per process: with several worker processes the database sees
+at most workers x limit heavy queries.
+"""
+import threading
+import time
+
+from flask import current_app, g, jsonify, request
+
+from config import Config
+
+EXEMPT_ENDPOINTS = {'static', 'api_admission', 'healthz', 'readyz'}
+
+
+class AdmissionClass:
+    def __init__(self, name, limit, max_waiting, timeout):
+        self.name = name
+        self.limit = limit
+        self.max_waiting = max_waiting
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(limit)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.queued = 0
+        self.rejected_full = 0
+        self.rejected_timeout = 0
+        self.wait_seconds = 0.0
+        self.peak_waiting = 0
+
+    def acquire(self):
+        """Return True when a slot was obtained, False if the request must be shed"""
+        if self._slots.acquire(blocking=False):
+            with self._lock:
+                self.in_flight += 1
+                self.admitted += 1
+            return True
+
+        with self._lock:
+            if self.waiting >= self.max_waiting:
+                self.rejected_full += 1
+                return False
+            self.waiting += 1
+            self.queued += 1
+            self.peak_waiting = max(self.peak_waiting, self.waiting)
+
+        started = time.monotonic()
+        acquired = self._slots.acquire(timeout=self.timeout)
+        with self._lock:
+            self.waiting -= 1
+            self.wait_seconds += time.monotonic() - started
+            if acquired:
+                self.in_flight += 1
+                self.admitted += 1
+            else:
+                self.rejected_timeout += 1
+        return acquired
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def metrics(self):
+        with self._lock:
+            return {
+                'limit': self.limit,
+                'max_waiting': self.max_waiting,
+                'timeout_seconds': self.timeout,
+                'in_flight': self.in_flight,
+                'waiting': self.waiting,
+                'peak_waiting': self.peak_waiting,
+                'admitted': self.admitted,
+                'queued': self.queued,
+                'rejected_queue_full': self.rejected_full,
+                'rejected_timeout': self.rejected_timeout,
+                'avg_wait_seconds': round(self.wait_seconds / self.queued, 4) if self.queued else 0.0,
+            }
+
+
+CLASSES = {
+    'heavy': AdmissionClass('heavy', Config.ADMISSION_HEAVY_LIMIT,
+                            Config.ADMISSION_HEAVY_MAX_WAITING, Config.ADMISSION_HEAVY_TIMEOUT),
+    'light': AdmissionClass('light', Config.ADMISSION_LIGHT_LIMIT,
+                            Config.ADMISSION_LIGHT_MAX_WAITING, Config.ADMISSION_LIGHT_TIMEOUT),
+}
+
+
+def classify(endpoint):
+    """Return the admission class name of an endpoint, or None if it is exempt"""
+    if endpoint is None:
+        return None
+    name = Config.endpoint_name(endpoint)
+    if name in EXEMPT_ENDPOINTS:
+        return None
+    return 'heavy' if name in Config.get_heavy_endpoints() else 'light'
+
+
+def _shed(name):
+    message = f'The server is busy ({name} requests at capacity), please retry shortly.'
+    if request.path.startswith('/api/') or request.accept_mimetypes.best == 'application/json':
+        response = jsonify({'error': message})
+    else:
+        response = current_app.response_class(message, mimetype='text/plain')
+    response.status_code = 503
+    response.headers['Retry-After'] = str(Config.ADMISSION_RETRY_AFTER)
+    return response
+
+
+def metrics():
+    return {name: cls.metrics() for name, cls in CLASSES.items()}
+
+
+def init_app(app):
+    """Install the admission hooks on the Flask app"""
+    if not Config.ADMISSION_CONTROL:
+        return
+
+    @app.before_request
+    def _admit():
+        name = classify(request.endpoint)
+        if name is None:
+            return None
+        if not CLASSES[name].acquire():
+            return _shed(name)
+        g.admission_class = name
+        return None
+
+    @app.teardown_request
+    def _release(exc):
+        name = g.pop('admission_class', None)
+        if name is not None:
+            CLASSES[name].release()
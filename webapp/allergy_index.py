@@ -0,0 +1,253 @@
+"""In-memory treatment -> allergy risk index.
+
+A treatment can trigger an allergy when one of its drugs (assign_tab)
+causes it (cause_tab). The index keeps that closure as bitsets (Python
+ints) in both directions:
+
+- per treatment, the set of allergies it can trigger (forward, op3 without
+  the four-way join);
+- per allergy, the set of treatments that can trigger it, so "treatments
+  that avoid allergies {A, B, C}" is all_treatments & ~(T(A) | T(B) | T(C)).
+
+Both answers cost a few big-int operations plus decoding the result bits.
+
+The index is built from four scans (treatments, allergies, assign and
+cause pairs) and then kept up to date from the change bus. Inserts of
+assign_tab / cause_tab pairs, whether from this process's add forms,
+other workers or SQL scripts, are applied incrementally. Every other change
+(deletes, updates, table-level events) schedules a rebuild, as does
+Config.ALLERGY_INDEX_REFRESH_SECONDS. Callers get None while the index is
+not loaded and query Oracle instead.
+"""
+import threading
+import time
+
+from config import Config
+from db import tuned_cursor
+
+# Change bus tables the index depends on
+TABLES = ('treatment_tab', 'allergy_tab', 'assign_tab', 'cause_tab')
+
+_index = None
+_update_lock = threading.Lock()
+# Pairs applied while a rebuild is loading, replayed onto the new index so none is lost
+_pending = None
+_refresher = None
+_wakeup = threading.Event()
+
+
+# Set bit positions of every byte value, for decoding a mask a byte at a time
+_BYTE_BITS = [tuple(i for i in range(8) if value >> i & 1) for value in range(256)]
+
+
+def _bits(mask):
+    """Positions of the set bits of mask, lowest first"""
+    data = mask.to_bytes((mask.bit_length() + 7) // 8, 'little')
+    return [base + i for base, value in zip(range(0, len(data) * 8, 8), data) if value for i in _BYTE_BITS[value]]
+
+
+class _Index:
+    """Bitset closure of treatment -> drug -> allergy.
+
+    Ids are mapped to bit positions in id order (ids are allocated
+    increasing, so new ones are appended), and decoded results come out
+    sorted. Writers hold _update_lock and only add positions or set bits;
+    readers take no lock.
+    """
+
+    def __init__(self, treatments, allergies, assign_pairs, cause_pairs):
+        self.treatment_ids = []
+        self.treatment_pos = {}
+        self.treatment_names = {}
+        self.allergy_ids = []
+        self.allergy_pos = {}
+        self.allergy_names = {}
+        self.all_treatments = 0
+        self.drug_treatments = {}       # drug -> treatment bits
+        self.drug_allergies = {}        # drug -> allergy bits
+        self.treatment_allergies = {}   # treatment position -> allergy bits (closure)
+        self.allergy_treatments = {}    # allergy position -> treatment bits (closure)
+        for treatment_id, name in treatments:
+            self.add_treatment(treatment_id, name)
+        for allergy_id, name in allergies:
+            self._allergy(allergy_id, name)
+        for treatment_id, drug_id in assign_pairs:
+            self.add_assign(treatment_id, drug_id)
+        for drug_id, allergy_id in cause_pairs:
+            self.add_cause(drug_id, allergy_id)
+        self.refreshed_at = time.time()
+
+    def add_treatment(self, treatment_id, name=None):
+        pos = self.treatment_pos.get(treatment_id)
+        if pos is None:
+            pos = len(self.treatment_ids)
+            self.treatment_ids.append(treatment_id)
+            self.treatment_pos[treatment_id] = pos
+            self.all_treatments |= 1 << pos
+        if name is not None:
+            self.treatment_names[treatment_id] = name
+        return pos
+
+    def _allergy(self, allergy_id, name=None):
+        pos = self.allergy_pos.get(allergy_id)
+        if pos is None:
+            pos = len(self.allergy_ids)
+            self.allergy_ids.append(allergy_id)
+            self.allergy_pos[allergy_id] = pos
+        if name is not None:
+            self.allergy_names[allergy_id] = name
+        return pos
+
+    def add_assign(self, treatment_id, drug_id):
+        """Treatment now uses drug: it inherits every allergy the drug causes"""
+        t = self.add_treatment(treatment_id)
+        self.drug_treatments[drug_id] = self.drug_treatments.get(drug_id, 0) | (1 << t)
+        allergies = self.drug_allergies.get(drug_id, 0)
+        if allergies:
+            self.treatment_allergies[t] = self.treatment_allergies.get(t, 0) | allergies
+            for a in _bits(allergies):
+                self.allergy_treatments[a] = self.allergy_treatments.get(a, 0) | (1 << t)
+
+    def add_cause(self, drug_id, allergy_id):
+        """Drug now causes allergy: every treatment using the drug can trigger it"""
+        a = self._allergy(allergy_id)
+        self.drug_allergies[drug_id] = self.drug_allergies.get(drug_id, 0) | (1 << a)
+        treatments = self.drug_treatments.get(drug_id, 0)
+        if treatments:
+            self.allergy_treatments[a] = self.allergy_treatments.get(a, 0) | treatments
+            for t in _bits(treatments):
+                self.treatment_allergies[t] = self.treatment_allergies.get(t, 0) | (1 << a)
+
+    def allergies_of(self, treatment_id):
+        """Allergy ids treatment_id can trigger, or None if the treatment is unknown"""
+        t = self.treatment_pos.get(treatment_id)
+        if t is None:
+            return None
+        return [self.allergy_ids[a] for a in _bits(self.treatment_allergies.get(t, 0))]
+
+    def treatments_avoiding(self, allergy_ids):
+        """Treatment ids that cannot trigger any of allergy_ids"""
+        risky = 0
+        for allergy_id in allergy_ids:
+            a = self.allergy_pos.get(allergy_id)
+            if a is not None:
+                risky |= self.allergy_treatments.get(a, 0)
+        return [self.treatment_ids[t] for t in _bits(self.all_treatments & ~risky)]
+
+
+def _load(conn):
+    cursor = tuned_cursor(conn, 'export')
+    cursor.execute("SELECT id, name FROM treatment_tab ORDER BY id")
+    treatments = cursor.fetchall()
+    cursor.execute("SELECT id, name FROM allergy_tab ORDER BY id")
+    allergies = cursor.fetchall()
+    cursor.execute("SELECT treatment_id, drug_id FROM assign_tab")
+    assign_pairs = cursor.fetchall()
+    cursor.execute("SELECT drug_id, allergy_id FROM cause_tab")
+    cause_pairs = cursor.fetchall()
+    cursor.close()
+    return _Index(treatments, allergies, assign_pairs, cause_pairs)
+
+
+def refresh(conn):
+    """Rebuild the index from the database"""
+    global _index, _pending
+    if not Config.ALLERGY_INDEX:
+        return
+    with _update_lock:
+        _pending = []
+    try:
+        index = _load(conn)
+    except Exception:
+        with _update_lock:
+            _pending = None
+        raise
+    with _update_lock:
+        for method, args in _pending:
+            getattr(index, method)(*args)
+        _pending = None
+        _index = index
+
+
+def _apply(method, *args):
+    with _update_lock:
+        if _index is not None:
+            getattr(_index, method)(*args)
+        if _pending is not None:
+            _pending.append((method, args))
+
+
+def on_change(event):
+    """Change bus subscriber: apply inserted pairs in place, rebuild for anything else"""
+    if event.op == 'I' and event.key is not None:
+        try:
+            if event.table == 'ASSIGN_TAB':
+                _apply('add_assign', *(int(part) for part in event.key.split('/')))
+                return
+            if event.table == 'CAUSE_TAB':
+                _apply('add_cause', *(int(part) for part in event.key.split('/')))
+                return
+            if event.table == 'TREATMENT_TAB':
+                _apply('add_treatment', int(event.key))
+                # Its name is picked up by the next rebuild
+                _wakeup.set()
+                return
+        except (TypeError, ValueError):
+            pass
+    _wakeup.set()
+
+
+def allergies_of(treatment_id):
+    """Allergy ids a treatment can trigger ([] if none), or None if not answerable from memory"""
+    current = _index
+    return current.allergies_of(treatment_id) if current is not None else None
+
+
+def treatments_avoiding(allergy_ids):
+    """Treatment ids that trigger none of allergy_ids, or None if the index is not loaded"""
+    current = _index
+    return current.treatments_avoiding(allergy_ids) if current is not None else None
+
+
+def names():
+    """(treatment names, allergy names) known to the index"""
+    current = _index
+    if current is None:
+        return {}, {}
+    return current.treatment_names, current.allergy_names
+
+
+def status():
+    current = _index
+    return {
+        'enabled': bool(Config.ALLERGY_INDEX),
+        'loaded': current is not None,
+        'treatments': len(current.treatment_ids) if current is not None else 0,
+        'allergies': len(current.allergy_ids) if current is not None else 0,
+        'refreshed_at': current.refreshed_at if current is not None else None,
+    }
+
+
+def start_refresher(get_connection, interval=None):
+    """Start the background rebuild thread (once per process)"""
+    global _refresher
+    interval = Config.ALLERGY_INDEX_REFRESH_SECONDS if interval is None else interval
+    if _refresher is not None or not Config.ALLERGY_INDEX or interval <= 0:
+        return
+
+    def run():
+        while True:
+            try:
+                conn = get_connection()
+                try:
+                    refresh(conn)
+                finally:
+                    conn.close()
+            except Exception as e:
+                print(f"Error refreshing allergy index: {e}")
+            if _wakeup.wait(interval):
+                time.sleep(Config.CHANGES_COALESCE_SECONDS)
+                _wakeup.clear()
+
+    _refresher = threading.Thread(target=run, name='allergy-index-refresher', daemon=True)
+    _refresher.start()
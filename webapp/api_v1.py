@@ -0,0 +1,489 @@
+"""Versioned read-only JSON API (/api/v1) over the entities, associations and operations.
+
+Every table is described once in RESOURCES: its key, its columns and its
+references (scalar key column -> referenced resource). The SELECT of a
+request is generated for exactly what it asks for:
+
+- ?fields=name,surname selects those columns only; the key is always
+  returned. Without it every column except the CLOBs is returned (CLOB
+  descriptions are only read when named in ?fields=).
+- ?expand=disease,treatment adds one LEFT JOIN per reference and returns
+  the referenced row as a nested object instead of its key. Dotted fields
+  (?fields=id,disease.name) pick its columns and imply the expansion.
+  References that are not expanded are never joined.
+- ?limit= sets the page size (Config.API_PAGE_SIZE, capped at
+  Config.API_MAX_PAGE_SIZE). Pages are keyset-paginated on the key: "next"
+  is the URL of the following page (?after=<last key>), null on the last.
+- ?<scalar key column>=value filters on a reference, e.g.
+  /api/v1/experiments?disease_id=3, through the indexes on those columns.
+
+Operation 2 is biological_data below ?threshold= and takes the same
+parameters. Operations 3, 4 and 5 take ?fields= too and only join the
+tables the requested fields come from. Operation 5 returns the columns
+and order of func_list_fw_for_top_researchers from both of its sources;
+its ?after= is the JSON sort key of the last row. Responses carry
+ETag/Last-Modified from table_version (conditional.py) for the tables they
+read, so an unchanged page revalidates with a 304 without running its query.
+"""
+from itertools import groupby
+import json
+
+from flask import Blueprint, jsonify, request, url_for
+import oracledb
+
+from config import Config
+from conditional import conditional_get
+from db import error_message, get_read_connection, is_timeout, tuned_cursor
+import research_graph
+
+bp = Blueprint('api_v1', __name__, url_prefix='/api/v1')
+
+
+class _Resource:
+    """A table served by the API"""
+
+    def __init__(self, table, key, columns, refs=None, clobs=(), key_type=int):
+        self.table = table
+        self.key = key
+        self.key_type = key_type
+        self.columns = columns      # key first
+        self.refs = refs or {}      # reference name -> (scalar key column, resource name)
+        self.defaults = [column for column in columns if column not in clobs]
+
+    def describe(self, name):
+        return {
+            'url': url_for('api_v1.v1_list', name=name),
+            'key': self.key,
+            'fields': self.columns,
+            'default_fields': self.defaults,
+            'expand': {ref: target for ref, (_, target) in self.refs.items()},
+            'filters': [column for column, _ in self.refs.values()],
+        }
+
+
+RESOURCES = {
+    # Entities
+    'donors': _Resource('donors_tab', 'cf', ['cf', 'name', 'surname', 'birth', 'sex', 'age'], key_type=str),
+    'researchers': _Resource('researchers_tab', 'cf', ['cf', 'name', 'surname', 'birth'], key_type=str),
+    'diseases': _Resource('disease_tab', 'id', ['id', 'name', 'discovery_date', 'description'],
+                          clobs=['description']),
+    'biological_data': _Resource('biological_data_tab', 'id',
+                                 ['id', 'name', 'condition', 'is_required', 'description', 'position',
+                                  'data_type', 'density', 'donor_cf'],
+                                 refs={'donor': ('donor_cf', 'donors')}, clobs=['description']),
+    'treatments': _Resource('treatment_tab', 'id', ['id', 'name', 'success_percentage']),
+    'drugs': _Resource('drugs_tab', 'id', ['id', 'name', 'description'], clobs=['description']),
+    'allergies': _Resource('allergy_tab', 'id', ['id', 'name']),
+    'publications': _Resource('publication_tab', 'doi', ['doi', 'publisher', 'quality', 'title'], key_type=str),
+    'experiments': _Resource('experiment_tab', 'id',
+                             ['id', 'exper_date', 'is_positive', 'effect_description', 'disease_id', 'treatment_id'],
+                             refs={'disease': ('disease_id', 'diseases'), 'treatment': ('treatment_id', 'treatments')}),
+    'future_works': _Resource('future_work_tab', 'id', ['id', 'title', 'exp_id', 'pub_doi'],
+                              refs={'experiment': ('exp_id', 'experiments'), 'publication': ('pub_doi', 'publications')}),
+    # Associations
+    'affected': _Resource('affected_tab', 'id', ['id', 'bio_id', 'disease_id'],
+                          refs={'bio': ('bio_id', 'biological_data'), 'disease': ('disease_id', 'diseases')}),
+    'analyze': _Resource('analyze_tab', 'id', ['id', 'bio_id', 'exp_id'],
+                         refs={'bio': ('bio_id', 'biological_data'), 'experiment': ('exp_id', 'experiments')}),
+    'assign': _Resource('assign_tab', 'id', ['id', 'treatment_id', 'drug_id'],
+                        refs={'treatment': ('treatment_id', 'treatments'), 'drug': ('drug_id', 'drugs')}),
+    'cause': _Resource('cause_tab', 'id', ['id', 'drug_id', 'allergy_id'],
+                       refs={'drug': ('drug_id', 'drugs'), 'allergy': ('allergy_id', 'allergies')}),
+    'writes': _Resource('writes_tab', 'id', ['id', 'publication_doi', 'researcher_cf'],
+                        refs={'publication': ('publication_doi', 'publications'),
+                              'researcher': ('researcher_cf', 'researchers')}),
+    'consider': _Resource('consider_tab', 'id', ['id', 'future_work_id', 'researcher_cf'],
+                          refs={'future_work': ('future_work_id', 'future_works'),
+                                'researcher': ('researcher_cf', 'researchers')}),
+}
+
+OP3_FIELDS = ('name', 'success_percentage', 'drugs', 'allergies')
+OP4_FIELDS = ('cf', 'name', 'surname')
+OP5_FIELDS = ('researcher_cf', 'researcher_name', 'researcher_surname', 'future_work_id', 'future_work_title')
+
+
+def _error(message, status=400):
+    return jsonify({'error': message}), status
+
+
+def _names(value):
+    return [item for item in (value or '').replace(' ', '').split(',') if item]
+
+
+def _typed(key_type, value, name):
+    """value converted to a key type; ValueError naming the parameter"""
+    try:
+        return key_type(value)
+    except ValueError:
+        raise ValueError(f'{name} must be an integer')
+
+
+def _limit():
+    """Page size from ?limit=; ValueError if not a positive integer"""
+    value = request.args.get('limit')
+    if value is None:
+        return Config.API_PAGE_SIZE
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ValueError('limit must be an integer')
+    if limit < 1:
+        raise ValueError('limit must be at least 1')
+    return min(limit, Config.API_MAX_PAGE_SIZE)
+
+
+def _fields(allowed):
+    """Requested ?fields= among allowed (all of them if absent); ValueError for unknown names"""
+    names = _names(request.args.get('fields'))
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise ValueError(f"unknown fields {', '.join(unknown)}; available: {', '.join(allowed)}")
+    return set(names or allowed)
+
+
+def _selection(resource):
+    """(base columns, {reference: columns}) requested by ?fields= and ?expand=; ValueError if invalid"""
+    expand = {}
+    for ref in _names(request.args.get('expand')):
+        if ref not in resource.refs:
+            raise ValueError(f"cannot expand {ref!r}; available: {', '.join(resource.refs) or 'none'}")
+        expand[ref] = None
+    columns = None
+    fields = _names(request.args.get('fields'))
+    if fields:
+        columns = []
+        for name in fields:
+            ref, dot, column = name.partition('.')
+            if dot and ref in resource.refs:
+                target = RESOURCES[resource.refs[ref][1]]
+                if column not in target.columns:
+                    raise ValueError(f"unknown field {name!r}; {ref} has: {', '.join(target.columns)}")
+                expand[ref] = (expand.get(ref) or []) + [column]
+            elif name in resource.refs:
+                expand.setdefault(name, None)
+            elif name in resource.columns:
+                columns.append(name)
+            else:
+                raise ValueError(f"unknown field {name!r}; available: {', '.join(resource.columns)}")
+    if columns is None:
+        # An expanded reference replaces its key column
+        expanded_keys = {resource.refs[ref][0] for ref in expand}
+        columns = [column for column in resource.defaults if column not in expanded_keys]
+    base = [resource.key] + [column for column in dict.fromkeys(columns) if column != resource.key]
+    nested = {}
+    for ref, ref_columns in expand.items():
+        target = RESOURCES[resource.refs[ref][1]]
+        ref_columns = target.defaults if ref_columns is None else ref_columns
+        nested[ref] = [target.key] + [column for column in dict.fromkeys(ref_columns) if column != target.key]
+    return base, nested
+
+
+def _select(resource, base, nested, where, order=True):
+    """SELECT with the requested columns and one LEFT JOIN per expanded reference"""
+    select = [f't.{column}' for column in base]
+    joins = []
+    for i, (ref, columns) in enumerate(nested.items()):
+        key_column, target_name = resource.refs[ref]
+        target = RESOURCES[target_name]
+        select += [f'r{i}.{column}' for column in columns]
+        joins.append(f'LEFT JOIN {target.table} r{i} ON r{i}.{target.key} = t.{key_column}')
+    sql = f"SELECT {', '.join(select)} FROM {resource.table} t {' '.join(joins)} WHERE {' AND '.join(where) or '1 = 1'}"
+    if order:
+        sql += f' ORDER BY t.{resource.key} FETCH FIRST :page_rows ROWS ONLY'
+    return sql
+
+
+def _item(row, base, nested):
+    """Output object of one row: base columns, then each expanded reference (None if dangling)"""
+    item = dict(zip(base, row))
+    pos = len(base)
+    for ref, columns in nested.items():
+        values = row[pos:pos + len(columns)]
+        pos += len(columns)
+        item[ref] = dict(zip(columns, values)) if values[0] is not None else None
+    return item
+
+
+def _tables(resource, nested):
+    return [resource.table] + [RESOURCES[resource.refs[ref][1]].table for ref in nested]
+
+
+def _page(items, limit, last_key, **extra):
+    """Body of one page; items holds up to limit + 1 rows, the extra one only tells that more follow"""
+    next_url = None
+    if len(items) > limit:
+        items = items[:limit]
+        args = dict(request.args.to_dict(), after=last_key(items[-1]))
+        next_url = url_for(request.endpoint, **request.view_args, **args)
+    return jsonify({'data': items, 'count': len(items), 'next': next_url, **extra})
+
+
+def _query(sql, binds, expected):
+    conn = get_read_connection()
+    try:
+        cursor = tuned_cursor(conn, expected)
+        cursor.execute(sql, binds)
+        rows = cursor.fetchall()
+        cursor.close()
+    finally:
+        conn.close()
+    return rows
+
+
+def _list(resource, base, nested, where, binds):
+    limit = _limit()
+    after = request.args.get('after')
+    if after is not None:
+        where = where + [f't.{resource.key} > :after']
+        binds = dict(binds, after=_typed(resource.key_type, after, 'after'))
+    rows = _query(_select(resource, base, nested, where), dict(binds, page_rows=limit + 1), limit + 1)
+    return _page([_item(row, base, nested) for row in rows], limit, lambda item: item[resource.key])
+
+
+def _database_error(e):
+    return _error(error_message(e), 504 if is_timeout(e) else 500)
+
+
+@bp.route('')
+def v1_index():
+    """Resources and operations of the API, with their fields and expandable references"""
+    return jsonify({
+        'resources': {name: resource.describe(name) for name, resource in RESOURCES.items()},
+        'operations': {
+            'op2': {'url': url_for('api_v1.v1_op2'), 'params': ['threshold'], 'fields': RESOURCES['biological_data'].columns},
+            'op3': {'url': f'{bp.url_prefix}/operations/op3/<treatment_id>', 'fields': OP3_FIELDS},
+            'op4': {'url': f'{bp.url_prefix}/operations/op4/<disease_id>', 'fields': OP4_FIELDS},
+            'op5': {'url': url_for('api_v1.v1_op5'), 'fields': OP5_FIELDS},
+        },
+        'page_size': Config.API_PAGE_SIZE,
+        'max_page_size': Config.API_MAX_PAGE_SIZE,
+    })
+
+
+@bp.route('/<name>')
+def v1_list(name):
+    """One page of a table: ?fields=, ?expand=, ?limit=, ?after= and reference filters"""
+    resource = RESOURCES.get(name)
+    if resource is None:
+        return _error(f'unknown resource {name!r}', 404)
+    where, binds = [], {}
+    try:
+        base, nested = _selection(resource)
+        for i, (column, target_name) in enumerate(resource.refs.values()):
+            value = request.args.get(column)
+            if value is not None:
+                where.append(f't.{column} = :f{i}')
+                binds[f'f{i}'] = _typed(RESOURCES[target_name].key_type, value, column)
+        return conditional_get(*_tables(resource, nested))(_list)(resource, base, nested, where, binds)
+    except ValueError as e:
+        return _error(str(e))
+    except oracledb.Error as e:
+        return _database_error(e)
+
+
+def _one(resource, base, nested, key):
+    rows = _query(_select(resource, base, nested, [f't.{resource.key} = :key'], order=False), {'key': key}, 1)
+    if not rows:
+        return _error('not found', 404)
+    return jsonify(_item(rows[0], base, nested))
+
+
+@bp.route('/<name>/<path:key>')
+def v1_item(name, key):
+    """One row by key, with the same ?fields= and ?expand= as the list"""
+    resource = RESOURCES.get(name)
+    if resource is None:
+        return _error(f'unknown resource {name!r}', 404)
+    try:
+        base, nested = _selection(resource)
+        key = _typed(resource.key_type, key, resource.key)
+        return conditional_get(*_tables(resource, nested))(_one)(resource, base, nested, key)
+    except ValueError as e:
+        return _error(str(e))
+    except oracledb.Error as e:
+        return _database_error(e)
+
+
+# ==================== OPERATIONS ====================
+@bp.route('/operations/op2')
+def v1_op2():
+    """Operation 2: biological data below ?threshold=, paged like /biological_data"""
+    resource = RESOURCES['biological_data']
+    threshold = request.args.get('threshold', type=float)
+    if threshold is None:
+        return _error('threshold is required')
+    try:
+        base, nested = _selection(resource)
+        return conditional_get(*_tables(resource, nested))(_list)(
+            resource, base, nested, ['t.density < :threshold'], {'threshold': threshold})
+    except ValueError as e:
+        return _error(str(e))
+    except oracledb.Error as e:
+        return _database_error(e)
+
+
+@bp.route('/operations/op3/<int:treatment_id>')
+@conditional_get('treatment_tab', 'assign_tab', 'drugs_tab', 'cause_tab', 'allergy_tab')
+def v1_op3(treatment_id):
+    """Operation 3: a treatment, its drugs and their allergies; drugs/allergies are only joined if requested"""
+    try:
+        fields = _fields(OP3_FIELDS)
+    except ValueError as e:
+        return _error(str(e))
+    columns = [column for column in ('name', 'success_percentage') if column in fields]
+    drugs = 'drugs' in fields or 'allergies' in fields
+    allergies = 'allergies' in fields
+    select = ['t.id'] + [f't.{column}' for column in columns]
+    joins, order = [], []
+    if drugs:
+        select += ['d.id', 'd.name']
+        joins += ['LEFT JOIN assign_tab a ON a.treatment_id = t.id', 'LEFT JOIN drugs_tab d ON d.id = a.drug_id']
+        order.append('d.id')
+    if allergies:
+        select += ['al.id', 'al.name']
+        joins += ['LEFT JOIN cause_tab c ON c.drug_id = a.drug_id', 'LEFT JOIN allergy_tab al ON al.id = c.allergy_id']
+        order.append('al.id')
+    sql = f"SELECT {', '.join(select)} FROM treatment_tab t {' '.join(joins)} WHERE t.id = :treatment_id"
+    if order:
+        sql += f" ORDER BY {', '.join(order)}"
+    try:
+        rows = _query(sql, {'treatment_id': treatment_id}, 'list' if drugs else 1)
+    except oracledb.Error as e:
+        return _database_error(e)
+    if not rows:
+        return _error('Treatment not found', 404)
+    result = {'id': treatment_id, **dict(zip(columns, rows[0][1:]))}
+    if drugs:
+        pos = 1 + len(columns)
+        result['drugs'] = []
+        for drug_id, drug_rows in groupby(rows, key=lambda row: row[pos]):
+            if drug_id is None:
+                continue
+            drug_rows = list(drug_rows)
+            drug = {'id': drug_id, 'name': drug_rows[0][pos + 1]}
+            if allergies:
+                drug['allergies'] = [{'id': row[pos + 2], 'name': row[pos + 3]}
+                                     for row in drug_rows if row[pos + 2] is not None]
+            result['drugs'].append(drug)
+    return jsonify(result)
+
+
+@bp.route('/operations/op4/<int:disease_id>')
+@conditional_get('affected_tab', 'biological_data_tab', 'donors_tab', 'analyze_tab', 'future_work_tab')
+def v1_op4(disease_id):
+    """Operation 4: donors of a disease, paged by CF; donors_tab is only joined for name/surname"""
+    try:
+        fields = _fields(OP4_FIELDS)
+        limit = _limit()
+    except ValueError as e:
+        return _error(str(e))
+    columns = [column for column in ('name', 'surname') if column in fields]
+    if columns:
+        select = ['dn.cf'] + [f'dn.{column}' for column in columns]
+        join = 'JOIN donors_tab dn ON dn.CF = b.donor_cf'
+    else:
+        select, join = ['b.donor_cf'], ''
+    where = ["a.disease_id = :disease_id", "b.is_required = 'Y'",
+             "EXISTS (SELECT 1 FROM analyze_tab z JOIN future_work_tab f ON f.exp_id = z.exp_id WHERE z.bio_id = b.id)"]
+    binds = {'disease_id': disease_id, 'page_rows': limit + 1}
+    if request.args.get('after') is not None:
+        where.append('b.donor_cf > :after')
+        binds['after'] = request.args['after']
+    sql = f"""
+        SELECT DISTINCT {', '.join(select)}
+        FROM affected_tab a
+        JOIN biological_data_tab b ON b.id = a.bio_id
+        {join}
+        WHERE {' AND '.join(where)}
+        ORDER BY 1
+        FETCH FIRST :page_rows ROWS ONLY
+    """
+    try:
+        rows = _query(sql, binds, limit + 1)
+    except oracledb.Error as e:
+        return _database_error(e)
+    return _page([dict(zip(['cf'] + columns, row)) for row in rows], limit, lambda item: item['cf'])
+
+
+def _op5_key(value):
+    """?after= of operation 5: JSON [researcher_surname, researcher_name, future_work_id, researcher_cf]"""
+    try:
+        surname, name, future_work_id, cf = json.loads(value)
+    except (ValueError, TypeError):
+        raise ValueError('after must be a JSON array [surname, name, future_work_id, cf]')
+    return cf, name, surname, _typed(int, future_work_id, 'after'), None
+
+
+def _after_op5(key, binds):
+    """Predicate for the rows after key in ORDER BY surname, name, future_work_id, CF (NULLs last)"""
+    cf, name, surname, future_work_id, _ = key
+    columns = [('r.surname', surname, True), ('r.name', name, True),
+               ('c.future_work_id', future_work_id, False), ('c.researcher_cf', cf, False)]
+    predicate = None
+    for i, (column, value, nullable) in reversed(list(enumerate(columns))):
+        if value is None:
+            # Nothing sorts after a NULL but other NULLs
+            greater, equal = None, f'{column} IS NULL'
+        else:
+            binds[f'after_{i}'] = value
+            greater = f'{column} > :after_{i}' + (f' OR {column} IS NULL' if nullable else '')
+            equal = f'{column} = :after_{i}'
+        if predicate is None:
+            predicate = f'({greater})' if greater else '1 = 0'
+        elif greater is None:
+            predicate = f'({equal} AND {predicate})'
+        else:
+            predicate = f'({greater} OR ({equal} AND {predicate}))'
+    return predicate
+
+
+@bp.route('/operations/op5')
+@conditional_get('writes_tab', 'publication_tab', 'consider_tab', 'researchers_tab', 'future_work_tab')
+def v1_op5():
+    """Operation 5: future works of top researchers, paged; from the research graph when loaded.
+
+    Same columns and order as func_list_fw_for_top_researchers (surname, name,
+    future_work_id; the CF breaks ties so pages never overlap).
+    """
+    try:
+        fields = _fields(OP5_FIELDS)
+        limit = _limit()
+        after = _op5_key(request.args['after']) if request.args.get('after') else None
+    except ValueError as e:
+        return _error(str(e))
+    rows = research_graph.op5()
+    if rows is not None:
+        if after is not None:
+            after_order = research_graph.op5_order(after)
+            rows = [row for row in rows if research_graph.op5_order(row) > after_order]
+        rows = rows[:limit + 1]
+        source = 'graph'
+    else:
+        # researchers_tab is always joined for the ordering; future_work_tab only for the title
+        title = 'f.title' if 'future_work_title' in fields else 'NULL'
+        joins = ['JOIN researchers_tab r ON r.CF = c.researcher_cf']
+        if 'future_work_title' in fields:
+            joins.append('JOIN future_work_tab f ON f.id = c.future_work_id')
+        where = ["""c.researcher_cf IN (SELECT w.researcher_cf
+                                          FROM writes_tab w
+                                          JOIN publication_tab p ON p.DOI = w.publication_doi
+                                         WHERE LOWER(p.quality) = 'top')"""]
+        binds = {'page_rows': limit + 1}
+        if after is not None:
+            where.append(_after_op5(after, binds))
+        sql = f"""
+            SELECT RTRIM(c.researcher_cf), r.name, r.surname, c.future_work_id, {title}
+            FROM consider_tab c
+            {' '.join(joins)}
+            WHERE {' AND '.join(where)}
+            ORDER BY r.surname, r.name, c.future_work_id, c.researcher_cf
+            FETCH FIRST :page_rows ROWS ONLY
+        """
+        try:
+            rows = _query(sql, binds, limit + 1)
+        except oracledb.Error as e:
+            return _database_error(e)
+        source = 'database'
+    items = [{column: value for column, value in zip(OP5_FIELDS, row) if column in fields} for row in rows]
+    keys = [json.dumps([surname, name, fw, cf]) for cf, name, surname, fw, _ in rows]
+    return _page(items, limit, lambda item: keys[limit - 1], source=source)
@@ -0,0 +1,414 @@
+"""Association pages: list and add forms of the relationship tables"""
+from flask import Blueprint, render_template, request, redirect, url_for, flash
+from db import get_db_connection, get_read_connection, mark_write, tuned_cursor
+import stats
+from conditional import conditional_get
+import changes
+
+bp = Blueprint('associations', __name__)
+
+# ==================== ASSOCIATION TABLES ====================
+
+# ASSIGN (Treatment-Drug)
+@bp.route('/assign')
+@conditional_get('assign_tab', 'treatment_tab', 'drugs_tab')
+def assign():
+    """List all treatment-drug assignments"""
+    conn = get_read_connection()
+    cursor = tuned_cursor(conn, 'list')
+    cursor.execute("""
+        SELECT a.id, 
+               a.treatment_id,
+               t.name AS treatment_name,
+               a.drug_id,
+               d.name AS drug_name
+        FROM assign_tab a
+        JOIN treatment_tab t ON t.id = a.treatment_id
+        JOIN drugs_tab d ON d.id = a.drug_id
+        ORDER BY a.id
+    """)
+    assigns = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return render_template('assign.html', assigns=assigns)
+
+@bp.route('/assign/add', methods=['GET', 'POST'])
+def add_assign():
+    """Add treatment-drug assignment"""
+    if request.method == 'POST':
+        try:
+            conn = get_db_connection()
+            cursor = tuned_cursor(conn, 'row')
+            
+            cursor.execute("SELECT NVL(MAX(id), 0) + 1 FROM assign_tab")
+            assign_id = cursor.fetchone()[0]
+            
+            treatment_id = request.form['treatment_id']
+            drug_id = request.form['drug_id']
+            
+            cursor.execute("""
+                INSERT INTO assign_tab
+                SELECT assign_typ(:id, REF(t), REF(d), t.id, d.id)
+                FROM treatment_tab t, drugs_tab d
+                WHERE t.id = :tid AND d.id = :did
+            """, {'id': assign_id, 'tid': treatment_id, 'did': drug_id})
+            
+            conn.commit()
+            cursor.close()
+            conn.close()
+            mark_write()
+            changes.publish('assign_tab', f'{int(treatment_id)}/{int(drug_id)}', 'I')
+            stats.record_insert('assign')
+            
+            flash('Assignment added successfully!', 'success')
+            return redirect(url_for('associations.assign'))
+        except Exception as e:
+            flash(f'Error adding assignment: {str(e)}', 'error')
+    
+    conn = get_read_connection()
+    cursor = tuned_cursor(conn, 'dropdown')
+    cursor.execute("SELECT id, name FROM treatment_tab ORDER BY name")
+    treatments = cursor.fetchall()
+    cursor.execute("SELECT id, name FROM drugs_tab ORDER BY name")
+    drugs = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    
+    return render_template('add_assign.html', treatments=treatments, drugs=drugs)
+
+# ==================== WRITES (Researcher-Publication) ====================
+@bp.route('/writes')
+@conditional_get('writes_tab', 'researchers_tab', 'publication_tab')
+def writes():
+    """List all researcher-publication associations"""
+    conn = get_read_connection()
+    cursor = tuned_cursor(conn, 'list')
+    cursor.execute("""
+        SELECT w.id,
+               w.researcher_cf,
+               r.name AS researcher_name,
+               r.surname AS researcher_surname,
+               w.publication_doi AS pub_doi,
+               p.title AS pub_title
+        FROM writes_tab w
+        JOIN researchers_tab r ON r.CF = w.researcher_cf
+        JOIN publication_tab p ON p.DOI = w.publication_doi
+        ORDER BY w.id
+    """)
+    writes = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return render_template('writes.html', writes=writes)
+
+@bp.route('/writes/add', methods=['GET', 'POST'])
+def add_writes():
+    """Add a new researcher-publication association"""
+    if request.method == 'POST':
+        try:
+            conn = get_db_connection()
+            cursor = tuned_cursor(conn, 'row')
+            
+            researcher_cf = request.form.get('researcher_cf')
+            publication_doi = request.form.get('publication_doi')
+            
+            # Get next ID
+            cursor.execute("SELECT NVL(MAX(id), 0) + 1 FROM writes_tab")
+            next_id = cursor.fetchone()[0]
+            
+            # Insert using subquery to get REFs inline (avoids DPY-3006 error)
+            cursor.execute("""
+                INSERT INTO writes_tab
+                SELECT writes_typ(
+                    :id,
+                    (SELECT REF(p) FROM publication_tab p WHERE p.DOI = :doi),
+                    (SELECT REF(r) FROM researchers_tab r WHERE r.CF = :cf),
+                    :doi,
+                    :cf
+                ) FROM DUAL
+            """, {
+                'id': next_id,
+                'doi': publication_doi,
+                'cf': researcher_cf
+            })
+            
+            conn.commit()
+            cursor.close()
+            conn.close()
+            mark_write()
+            changes.publish('writes_tab', f'{publication_doi}/{researcher_cf.strip()}', 'I')
+            stats.record_insert('writes')
+            
+            flash('Publication assignment added successfully!', 'success')
+            return redirect(url_for('associations.writes'))
+        except Exception as e:
+            flash(f'Error adding assignment: {str(e)}', 'error')
+    
+    # GET request - load data for form
+    conn = get_read_connection()
+    cursor = tuned_cursor(conn, 'dropdown')
+    cursor.execute("SELECT CF, name, surname FROM researchers_tab ORDER BY name")
+    researchers = cursor.fetchall()
+    cursor.execute("SELECT DOI, title FROM publication_tab ORDER BY title")
+    publications = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    
+    return render_template('add_writes.html', researchers=researchers, publications=publications)
+
+# ==================== AFFECTED (BiologicalData-Disease) ====================
+@bp.route('/affected')
+@conditional_get('affected_tab', 'biological_data_tab', 'disease_tab')
+def affected():
+    """List all biological data-disease associations"""
+    conn = get_read_connection()
+    cursor = tuned_cursor(conn, 'list')
+    cursor.execute("""
+        SELECT a.id,
+               a.bio_id,
+               b.name AS bio_name,
+               a.disease_id,
+               d.name AS disease_name
+        FROM affected_tab a
+        JOIN biological_data_tab b ON b.id = a.bio_id
+        JOIN disease_tab d ON d.id = a.disease_id
+        ORDER BY a.id
+    """)
+    affected = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return render_template('affected.html', affected=affected)
+
+@bp.route('/affected/add', methods=['GET', 'POST'])
+def add_affected():
+    """Add a new biological data-disease association"""
+    if request.method == 'POST':
+        try:
+            conn = get_db_connection()
+            cursor = tuned_cursor(conn, 'row')
+            
+            disease_id = request.form.get('disease_id')
+            bio_id = request.form.get('bio_id')
+            
+            # Get next ID
+            cursor.execute("SELECT NVL(MAX(id), 0) + 1 FROM affected_tab")
+            next_id = cursor.fetchone()[0]
+            
+            # Insert using subquery to get REFs inline (avoids DPY-3006 error)
+            cursor.execute("""
+                INSERT INTO affected_tab
+                SELECT affected_typ(
+                    :id,
+                    (SELECT REF(b) FROM biological_data_tab b WHERE b.id = :bio_id),
+                    (SELECT REF(d) FROM disease_tab d WHERE d.id = :disease_id),
+                    :bio_id,
+                    :disease_id
+                ) FROM DUAL
+            """, {
+                'id': next_id,
+                'bio_id': int(bio_id),
+                'disease_id': int(disease_id)
+            })
+            
+            conn.commit()
+            cursor.close()
+            conn.close()
+            mark_write()
+            changes.publish('affected_tab', f'{int(bio_id)}/{int(disease_id)}', 'I')
+            stats.record_affected(int(disease_id))
+            
+            flash('Disease-BioData link added successfully!', 'success')
+            return redirect(url_for('associations.affected'))
+        except Exception as e:
+            flash(f'Error adding link: {str(e)}', 'error')
+    
+    # GET request - load data for form
+    conn = get_read_connection()
+    cursor = tuned_cursor(conn, 'dropdown')
+    cursor.execute("SELECT id, name FROM disease_tab ORDER BY name")
+    diseases = cursor.fetchall()
+    cursor.execute("SELECT id, name, condition FROM biological_data_tab WHERE LOWER(condition) = 'disease' ORDER BY name")
+    biological_data = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    
+    return render_template('add_affected.html', diseases=diseases, biological_data=biological_data)
+
+# ==================== CAUSE (Drug-Allergy) ====================
+@bp.route('/cause')
+@conditional_get('cause_tab', 'drugs_tab', 'allergy_tab')
+def cause():
+    """List all drug-allergy associations"""
+    conn = get_read_connection()
+    cursor = tuned_cursor(conn, 'list')
+    cursor.execute("""
+        SELECT c.id,
+               c.drug_id,
+               d.name AS drug_name,
+               c.allergy_id,
+               al.name AS allergy_name
+        FROM cause_tab c
+        JOIN drugs_tab d ON d.id = c.drug_id
+        JOIN allergy_tab al ON al.id = c.allergy_id
+        ORDER BY c.id
+    """)
+    causes = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return render_template('cause.html', causes=causes)
+
+@bp.route('/cause/add', methods=['GET', 'POST'])
+def add_cause():
+    """Add a new drug-allergy association"""
+    if request.method == 'POST':
+        try:
+            conn = get_db_connection()
+            cursor = tuned_cursor(conn, 'row')
+            
+            drug_id = request.form.get('drug_id')
+            allergy_id = request.form.get('allergy_id')
+            
+            # Get next ID
+            cursor.execute("SELECT NVL(MAX(id), 0) + 1 FROM cause_tab")
+            next_id = cursor.fetchone()[0]
+            
+            # Insert using subquery to get REFs inline (avoids DPY-3006 error)
+            cursor.execute("""
+                INSERT INTO cause_tab
+                SELECT cause_typ(
+                    :id,
+                    (SELECT REF(d) FROM drugs_tab d WHERE d.id = :drug_id),
+                    (SELECT REF(a) FROM allergy_tab a WHERE a.id = :allergy_id),
+                    :drug_id,
+                    :allergy_id
+                ) FROM DUAL
+            """, {
+                'id': next_id,
+                'drug_id': int(drug_id),
+                'allergy_id': int(allergy_id)
+            })
+            
+            conn.commit()
+            cursor.close()
+            conn.close()
+            mark_write()
+            changes.publish('cause_tab', f'{int(drug_id)}/{int(allergy_id)}', 'I')
+            stats.record_insert('cause')
+            
+            flash('Drug-Allergy link added successfully!', 'success')
+            return redirect(url_for('associations.cause'))
+        except Exception as e:
+            flash(f'Error adding link: {str(e)}', 'error')
+    
+    # GET request - load data for form
+    conn = get_read_connection()
+    cursor = tuned_cursor(conn, 'dropdown')
+    cursor.execute("SELECT id, name FROM drugs_tab ORDER BY name")
+    drugs = cursor.fetchall()
+    cursor.execute("SELECT id, name FROM allergy_tab ORDER BY name")
+    allergies = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    
+    return render_template('add_cause.html', drugs=drugs, allergies=allergies)
+
+# ==================== ANALYZE (BiologicalData-Experiment) ====================
+@bp.route('/analyze')
+@conditional_get('analyze_tab', 'biological_data_tab', 'experiment_tab')
+def analyze():
+    """List all biological data-experiment associations"""
+    conn = get_read_connection()
+    cursor = tuned_cursor(conn, 'list')
+    cursor.execute("""
+        SELECT a.id,
+               a.bio_id,
+               b.name AS bio_name,
+               a.exp_id,
+               e.exper_date AS exp_date
+        FROM analyze_tab a
+        JOIN biological_data_tab b ON b.id = a.bio_id
+        JOIN experiment_tab e ON e.id = a.exp_id
+        ORDER BY a.id
+    """)
+    analyzes = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return render_template('analyze.html', analyzes=analyzes)
+
+@bp.route('/analyze/add', methods=['GET', 'POST'])
+def add_analyze():
+    """Add a new biological data-experiment association"""
+    if request.method == 'POST':
+        try:
+            conn = get_db_connection()
+            cursor = tuned_cursor(conn, 'row')
+            
+            bio_id = request.form.get('bio_id')
+            exp_id = request.form.get('exp_id')
+            
+            # Get next ID
+            cursor.execute("SELECT NVL(MAX(id), 0) + 1 FROM analyze_tab")
+            next_id = cursor.fetchone()[0]
+            
+            # Insert using subquery to get REFs inline (avoids DPY-3006 error)
+            cursor.execute("""
+                INSERT INTO analyze_tab
+                SELECT analyze_typ(
+                    :id,
+                    (SELECT REF(b) FROM biological_data_tab b WHERE b.id = :bio_id),
+                    (SELECT REF(e) FROM experiment_tab e WHERE e.id = :exp_id),
+                    :bio_id,
+                    :exp_id
+                ) FROM DUAL
+            """, {
+                'id': next_id,
+                'bio_id': int(bio_id),
+                'exp_id': int(exp_id)
+            })
+            
+            conn.commit()
+            cursor.close()
+            conn.close()
+            mark_write()
+            changes.publish('analyze_tab', f'{int(bio_id)}/{int(exp_id)}', 'I')
+            stats.record_insert('analyze')
+            
+            flash('BioData-Experiment link added successfully!', 'success')
+            return redirect(url_for('associations.analyze'))
+        except Exception as e:
+            flash(f'Error adding link: {str(e)}', 'error')
+    
+    # GET request - load data for form
+    conn = get_read_connection()
+    cursor = tuned_cursor(conn, 'dropdown')
+    
+    # Get biological data with their affected diseases
+    cursor.execute("""
+        SELECT DISTINCT b.id, 
+               b.name, 
+               b.condition,
+               LISTAGG(d.name, ', ') WITHIN GROUP (ORDER BY d.name) AS diseases
+        FROM biological_data_tab b
+        LEFT JOIN affected_tab a ON a.bio_id = b.id
+        LEFT JOIN disease_tab d ON d.id = a.disease_id
+        WHERE LOWER(b.condition) = 'disease'
+        GROUP BY b.id, b.name, b.condition
+        ORDER BY b.name
+    """)
+    biological_data = cursor.fetchall()
+    
+    # Get experiments with their disease info
+    cursor.execute("""
+        SELECT e.id, 
+               e.exper_date,
+               e.disease_id,
+               d.name AS disease_name
+        FROM experiment_tab e
+        JOIN disease_tab d ON d.id = e.disease_id
+        ORDER BY e.exper_date DESC
+    """)
+    experiments = cursor.fetchall()
+    
+    cursor.close()
+    conn.close()
+    
+    return render_template('add_analyze.html', biological_data=biological_data, experiments=experiments)
@@ -0,0 +1,106 @@
+"""Batch variants of operations 3 and 4: many treatment or disease ids in one execution.
+
+The ids are bound as one SYS.ODCINUMBERLIST collection to
+proc_get_treatment_info_batch / proc_list_donors_required_disease_with_fw_batch
+(sql/operations.sql), so a batch of any size up to Config.BATCH_MAX_IDS is
+one call and one statement instead of one request, connection and call per
+id. The procedures return rows ordered by id; treatment_groups() and
+disease_groups() group them while they are fetched, so large batches can be
+streamed to the client one id at a time.
+"""
+from itertools import groupby
+
+from config import Config
+from db import tuned_cursor
+
+OPERATIONS = {
+    'op3': 'proc_get_treatment_info_batch',
+    'op4': 'proc_list_donors_required_disease_with_fw_batch',
+}
+
+
+def parse_ids(value):
+    """Sorted distinct ids from a list or a comma-separated string; ValueError if invalid"""
+    if isinstance(value, str):
+        value = [item for item in value.replace(' ', '').split(',') if item]
+    if not isinstance(value, (list, tuple)):
+        raise ValueError('ids must be a list or a comma-separated string')
+    try:
+        ids = sorted({int(item) for item in value})
+    except (TypeError, ValueError):
+        raise ValueError('ids must be integers')
+    if not ids:
+        raise ValueError('at least one id is required')
+    if len(ids) > Config.BATCH_MAX_IDS:
+        raise ValueError(f'at most {Config.BATCH_MAX_IDS} ids per batch')
+    return ids
+
+
+def id_list(conn, ids):
+    """ids as a SYS.ODCINUMBERLIST bind value"""
+    return conn.gettype('SYS.ODCINUMBERLIST').newobject(ids)
+
+
+def execute(conn, operation, ids):
+    """Run the batch procedure of operation ('op3' or 'op4') for ids; return the open result cursor"""
+    result = tuned_cursor(conn, 'list')
+    cursor = conn.cursor()
+    try:
+        cursor.callproc(OPERATIONS[operation], [id_list(conn, ids), result])
+    finally:
+        cursor.close()
+    return result
+
+
+def _by_id(ids, rows):
+    """(id, rows of that id) for every requested id, in order; ids without rows get []"""
+    groups = groupby(rows, key=lambda row: row[0])
+    current = next(groups, None)
+    for wanted in ids:
+        while current is not None and current[0] < wanted:
+            current = next(groups, None)
+        if current is not None and current[0] == wanted:
+            yield wanted, list(current[1])
+            current = next(groups, None)
+        else:
+            yield wanted, []
+
+
+def treatment_groups(ids, rows):
+    """Operation 3 results per treatment: its drugs, each with the allergies it can cause"""
+    for treatment_id, group in _by_id(ids, rows):
+        if not group:
+            yield {'treatment_id': treatment_id, 'found': False}
+            continue
+        drugs = []
+        for drug_id, drug_rows in groupby(group, key=lambda row: row[3]):
+            if drug_id is None:
+                continue
+            drug_rows = list(drug_rows)
+            drugs.append({
+                'id': drug_id,
+                'name': drug_rows[0][4],
+                'allergies': [{'id': row[5], 'name': row[6]} for row in drug_rows if row[5] is not None],
+            })
+        yield {
+            'treatment_id': treatment_id,
+            'found': True,
+            'name': group[0][1],
+            'success_percentage': group[0][2],
+            'drugs': drugs,
+        }
+
+
+def disease_groups(ids, rows):
+    """Operation 4 results per disease: the donors found for it"""
+    for disease_id, group in _by_id(ids, rows):
+        yield {
+            'disease_id': disease_id,
+            'donors': [{'cf': row[1], 'name': row[2], 'surname': row[3]} for row in group],
+        }
+
+
+GROUPS = {
+    'op3': treatment_groups,
+    'op4': disease_groups,
+}
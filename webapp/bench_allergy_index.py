@@ -0,0 +1,54 @@
+"""Benchmark: the in-memory treatment -> allergy index on synthetic data.
+
+Builds allergy_index._Index from random assign / cause pairs (no database
+needed) and prints the build time, then the median latency of forward
+lookups ("allergies of treatment T"), exclusion queries ("treatments that
+avoid allergies A, B, C") and incremental inserts of assign and cause pairs.
+
+    python bench_allergy_index.py [treatments] [drugs] [allergies]
+"""
+import random
+import statistics
+import sys
+import time
+
+from allergy_index import _Index
+
+
+def _median_us(fn, args_list):
+    timings = []
+    for args in args_list:
+        started = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1e6
+
+
+def main(treatments=10000, drugs=2000, allergies=300, seed=42):
+    rng = random.Random(seed)
+    assign_pairs = {(t, rng.randrange(1, drugs + 1)) for t in range(1, treatments + 1) for _ in range(3)}
+    cause_pairs = {(d, rng.randrange(1, allergies + 1)) for d in range(1, drugs + 1) for _ in range(2)}
+
+    started = time.perf_counter()
+    index = _Index([(t, f'T{t}') for t in range(1, treatments + 1)],
+                   [(a, f'A{a}') for a in range(1, allergies + 1)],
+                   sorted(assign_pairs), sorted(cause_pairs))
+    build = time.perf_counter() - started
+    print(f"{treatments} treatments, {drugs} drugs, {allergies} allergies, "
+          f"{len(assign_pairs)} assign / {len(cause_pairs)} cause pairs: built in {build * 1000:.1f} ms")
+
+    forward = [(rng.randrange(1, treatments + 1),) for _ in range(2000)]
+    print(f"{'allergies_of':<28}{_median_us(index.allergies_of, forward):>10.1f} us")
+    for size in (1, 3, 10):
+        avoid = [([rng.randrange(1, allergies + 1) for _ in range(size)],) for _ in range(500)]
+        result = len(index.treatments_avoiding(avoid[0][0]))
+        print(f"{f'treatments_avoiding({size})':<28}{_median_us(index.treatments_avoiding, avoid):>10.1f} us"
+              f"   ({result} of {treatments} treatments)")
+    new_assign = [(rng.randrange(1, treatments + 1), rng.randrange(1, drugs + 1)) for _ in range(2000)]
+    print(f"{'add_assign':<28}{_median_us(index.add_assign, new_assign):>10.1f} us")
+    new_cause = [(rng.randrange(1, drugs + 1), rng.randrange(1, allergies + 1)) for _ in range(2000)]
+    print(f"{'add_cause':<28}{_median_us(index.add_cause, new_cause):>10.1f} us")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:4]))
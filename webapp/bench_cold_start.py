@@ -0,0 +1,81 @@
+"""Benchmark: cold start of the app, with and without warm-up.
+
+Starts `python app.py` on a free port for each mode and prints, in seconds
+from launch, when /healthz first answers, when /readyz first answers 200
+and how long the first request to PATH took once the app was live. Requires
+the database to be reachable.
+
+    python bench_cold_start.py [path] [runs]
+
+With WARMUP=0 the app reports ready at once, so the first request pays for
+opening the pool, compiling the template and parsing its statements.
+"""
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_DEADLINE = 120
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _status(url):
+    try:
+        with urllib.request.urlopen(url, timeout=_DEADLINE) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except OSError:
+        return None
+
+
+def _wait(url, started, expected=200):
+    while time.time() - started < _DEADLINE:
+        if _status(url) == expected:
+            return time.time() - started
+        time.sleep(0.05)
+    raise RuntimeError(f'{url} did not answer {expected} within {_DEADLINE}s')
+
+
+def run(path, warmup):
+    """Return (healthz, readyz, first request) seconds for one start of the app"""
+    port = _free_port()
+    env = dict(os.environ, PORT=str(port), WARMUP='1' if warmup else '0', FLASK_DEBUG='0')
+    base = f'http://127.0.0.1:{port}'
+    started = time.time()
+    process = subprocess.Popen([sys.executable, 'app.py'], cwd=_HERE, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        live = _wait(base + '/healthz', started)
+        ready = _wait(base + '/readyz', started)
+        before = time.time()
+        _status(base + path)
+        first = time.time() - before
+    finally:
+        process.terminate()
+        process.wait()
+    return live, ready, first
+
+
+def main(path='/donors', runs=3):
+    print(f"{'mode':<12}{'healthz s':>11}{'readyz s':>11}{f'first {path} ms':>22}")
+    for warmup in (False, True):
+        results = [run(path, warmup) for _ in range(runs)]
+        live, ready, first = min(results, key=lambda r: r[2])
+        mode = 'warm-up' if warmup else 'no warm-up'
+        print(f"{mode:<12}{live:>11.2f}{ready:>11.2f}{first * 1000:>22.1f}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1] if len(sys.argv) > 1 else '/donors',
+         int(sys.argv[2]) if len(sys.argv) > 2 else 3)
@@ -0,0 +1,95 @@
+"""Benchmark: default cursors vs tuned_cursor() and the CLOB output type handler.
+
+Runs the queries of a few pages both ways and prints, for each, the best
+elapsed time, the SQL*Net round trips of that run (from V$MYSTAT) and the
+number of rows. Requires a populated schema (sql/insert_auto.sql) and
+SELECT on V$MYSTAT / V$STATNAME.
+
+    python bench_fetch.py [runs]
+
+"default" is a plain cursor without output type handler, as every page
+used before: arraysize 100, prefetchrows 2, CLOBs read one locator at a time.
+"""
+import sys
+import time
+
+from db import get_read_connection, tuned_cursor
+
+CASES = [
+    ('donors dropdown', 'dropdown', "SELECT CF, name, surname FROM donors_tab ORDER BY surname, name"),
+    ('treatment dropdown', 'dropdown', "SELECT id, name FROM treatment_tab ORDER BY name"),
+    ('biological_data list', 'list', """
+        SELECT b.id, b.name, b.data_type, b.condition, b.is_required,
+               b.density, b.position, b.donor_cf
+        FROM biological_data_tab b
+        ORDER BY b.id"""),
+    ('experiments list', 'list', """
+        SELECT id, exper_date, is_positive, SUBSTR(effect_description, 1, 100),
+               disease_id, treatment_id
+        FROM experiment_tab
+        ORDER BY exper_date DESC"""),
+    ('diseases list (CLOB)', 'list', "SELECT id, name, discovery_date, description FROM disease_tab ORDER BY name"),
+    ('drugs list (CLOB)', 'list', "SELECT id, name, description FROM drugs_tab ORDER BY name"),
+    ('op5', 'list', "SELECT * FROM TABLE(func_list_fw_for_top_researchers())"),
+    ('biological_data export', 'export', """
+        SELECT id, name, condition, is_required, position, data_type, density, donor_cf
+        FROM biological_data_tab"""),
+]
+
+
+def round_trips(conn):
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT m.value
+        FROM v$mystat m JOIN v$statname n ON n.statistic# = m.statistic#
+        WHERE n.name = 'SQL*Net roundtrips to/from client'
+    """)
+    value = cursor.fetchone()[0]
+    cursor.close()
+    return value
+
+
+def run(conn, tuned, size, sql):
+    """Fetch sql to completion the way the pages do; return (seconds, round trips, rows)"""
+    if tuned:
+        cursor = tuned_cursor(conn, size)
+    else:
+        conn.outputtypehandler = None
+        cursor = conn.cursor()
+    before = round_trips(conn)
+    started = time.perf_counter()
+    cursor.execute(sql)
+    rows = 0
+    for row in cursor:
+        for value in row:
+            if hasattr(value, 'read'):
+                value.read()
+        rows += 1
+    elapsed = time.perf_counter() - started
+    cursor.close()
+    # The V$MYSTAT query itself costs one round trip
+    trips = round_trips(conn) - before - 1
+    return elapsed, trips, rows
+
+
+def main(runs=5):
+    conn = get_read_connection()
+    handler = conn.outputtypehandler
+    try:
+        print(f"{'case':<26}{'mode':<9}{'best ms':>10}{'trips':>8}{'rows':>9}")
+        for label, size, sql in CASES:
+            for tuned in (False, True):
+                results = []
+                for _ in range(runs):
+                    conn.outputtypehandler = handler
+                    results.append(run(conn, tuned, size, sql))
+                elapsed, trips, rows = min(results)
+                mode = size if tuned else 'default'
+                print(f"{label:<26}{mode:<9}{elapsed * 1000:>10.1f}{trips:>8}{rows:>9}")
+    finally:
+        conn.outputtypehandler = handler
+        conn.close()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,84 @@
+"""Benchmark: single cursor vs. parallel_fetch.ParallelRows at several degrees.
+
+Fetches each query to completion and prints the best elapsed time, the
+rows and the speedup over the single-cursor run. Requires a populated
+schema (sql/insert_auto.sql) with optimizer statistics gathered. Degrees
+above PARALLEL_FETCH_MAX_CONNECTIONS are capped by it (raise it and
+DB_POOL_MAX for the run).
+
+    python bench_parallel_fetch.py [runs] [degree ...]
+"""
+import sys
+import time
+
+import parallel_fetch
+from db import get_read_connection, tuned_cursor
+
+# Densities generated by insert_auto.sql are uniform in [0.1, 100): op2 at 90 returns ~90% of the rows
+CASES = [
+    ('op2 density < 10', 'biological_data_tab', None, False, """
+        SELECT id, name, data_type, density, donor_cf, is_required, condition
+        FROM biological_data_tab {as_of}
+        WHERE density < :threshold AND {range}""", {'threshold': 10}),
+    ('op2 density < 90', 'biological_data_tab', None, False, """
+        SELECT id, name, data_type, density, donor_cf, is_required, condition
+        FROM biological_data_tab {as_of}
+        WHERE density < :threshold AND {range}""", {'threshold': 90}),
+    ('biological_data list', 'biological_data_tab', None, False, """
+        SELECT b.id, b.name, b.data_type, b.condition, b.is_required,
+               b.density, b.position, b.donor_cf
+        FROM biological_data_tab {as_of} b
+        WHERE {range}
+        ORDER BY b.id""", {}),
+    ('experiments list', 'experiment_tab', 1, True, """
+        SELECT id, exper_date, is_positive, SUBSTR(effect_description, 1, 100),
+               disease_id, treatment_id
+        FROM experiment_tab {as_of}
+        WHERE {range}
+        ORDER BY exper_date DESC""", {}),
+]
+
+
+def single(sql, binds):
+    conn = get_read_connection()
+    try:
+        cursor = tuned_cursor(conn, 'export')
+        cursor.execute(parallel_fetch.single_sql(sql), binds)
+        rows = 0
+        for _ in cursor:
+            rows += 1
+        cursor.close()
+    finally:
+        conn.close()
+    return rows
+
+
+def parallel(table, order, reverse, sql, binds, degree):
+    rows = 0
+    for _ in parallel_fetch.ParallelRows(sql, binds, table, order=order, reverse=reverse, degree=degree):
+        rows += 1
+    return rows
+
+
+def best(func, runs):
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        rows = func()
+        times.append(time.perf_counter() - started)
+    return min(times), rows
+
+
+def main(runs=3, degrees=(2, 4, 8)):
+    print(f"{'case':<24}{'mode':<12}{'best ms':>10}{'rows':>10}{'speedup':>9}")
+    for label, table, order, reverse, sql, binds in CASES:
+        base, rows = best(lambda: single(sql, binds), runs)
+        print(f"{label:<24}{'single':<12}{base * 1000:>10.1f}{rows:>10}{1:>9.2f}")
+        for degree in degrees:
+            elapsed, rows = best(lambda: parallel(table, order, reverse, sql, binds, degree), runs)
+            print(f"{'':<24}{f'degree {degree}':<12}{elapsed * 1000:>10.1f}{rows:>10}{base / elapsed:>9.2f}")
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:]]
+    main(args[0] if args else 3, tuple(args[1:]) or (2, 4, 8))
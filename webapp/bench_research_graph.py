@@ -0,0 +1,85 @@
+"""Benchmark: memory and latency of the in-memory research graph at scale.
+
+Builds research_graph._Graph from a synthetic graph (no database needed;
+NumPy required) and prints the build time, the size of the CSR arrays, the
+peak memory allocated while building, and the median latency of op5,
+co-author lookups, 2-hop neighbourhoods, distances, rankings and an
+incremental merge of 100 inserted edges. The "first" times of op5 and the
+rankings are paid by the refresher thread (_Graph.warm()), not by requests.
+
+    python bench_research_graph.py [edges] [researchers] [publications]
+
+Defaults: 1,000,000 writes edges over 200,000 researchers and 400,000
+publications (10% top quality), 100,000 consider edges.
+"""
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from research_graph import _Graph, _Nodes
+
+
+def _median_ms(fn, args_list):
+    timings = []
+    for args in args_list:
+        started = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main(edges=1000000, researchers=200000, publications=400000, seed=42):
+    rng = np.random.default_rng(seed)
+    future_works = max(1, researchers // 4)
+    nodes = _Nodes(
+        [(f'R{i:015d}', f'Name{i}', f'Surname{i}') for i in range(researchers)],
+        [(f'10.1000/{i}', 'top' if i % 10 == 0 else 'middle') for i in range(publications)],
+        [(i, f'Future work {i}') for i in range(1, future_works + 1)],
+    )
+    # Skewed authorship: a few prolific researchers, many occasional ones
+    writes_r = np.minimum(rng.zipf(1.6, edges) - 1, researchers - 1).astype(np.int32)
+    writes_r = rng.permutation(researchers).astype(np.int32)[writes_r]
+    writes_p = rng.integers(0, publications, edges, dtype=np.int32)
+    consider_edges = edges // 10
+    consider_r = rng.integers(0, researchers, consider_edges, dtype=np.int32)
+    consider_fw = rng.integers(1, future_works + 1, consider_edges).astype(np.int64)
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    graph = _Graph(nodes, writes_r, writes_p, consider_r, consider_fw)
+    build = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{edges} writes / {consider_edges} consider edges, {researchers} researchers, {publications} publications")
+    print(f"{'build':<26}{build * 1000:>10.1f} ms")
+    print(f"{'CSR arrays':<26}{graph.nbytes() / 2**20:>10.1f} MiB   (build peak {peak / 2**20:.1f} MiB)")
+
+    sample = [(int(r),) for r in rng.integers(0, researchers, 200)]
+    started = time.perf_counter()
+    rows = graph.op5()
+    print(f"{'op5 (first call)':<26}{(time.perf_counter() - started) * 1000:>10.1f} ms   ({len(rows)} rows)")
+    print(f"{'op5 (cached)':<26}{_median_ms(graph.op5, [()] * 50):>10.3f} ms")
+    print(f"{'coauthors':<26}{_median_ms(graph.coauthors, sample):>10.3f} ms")
+    print(f"{'neighborhood (2 hops)':<26}{_median_ms(lambda r: graph.neighborhood(r, 2, 100), sample[:50]):>10.3f} ms")
+    pairs = [(int(a), int(b), 6) for a, b in rng.integers(0, researchers, (50, 2))]
+    print(f"{'distance (max 6 hops)':<26}{_median_ms(graph.distance, pairs):>10.3f} ms")
+    for by in ('pagerank', 'publications', 'top_publications'):
+        started = time.perf_counter()
+        graph.ranking(by, 20)
+        first = time.perf_counter() - started
+        cached = _median_ms(lambda: graph.ranking(by, 20), [()] * 20)
+        print(f"{f'ranking {by}':<26}{first * 1000:>10.1f} ms first, {cached:.3f} ms cached")
+
+    pending = [('writes', nodes.cfs[random.randrange(researchers)], nodes.dois[random.randrange(publications)])
+               for _ in range(100)]
+    started = time.perf_counter()
+    graph.merged(pending)
+    print(f"{'merge 100 edges':<26}{(time.perf_counter() - started) * 1000:>10.1f} ms")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:4]))
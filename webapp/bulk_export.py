@@ -0,0 +1,272 @@
+"""Parallel export of every entity and association table to Parquet or Arrow IPC.
+
+Each table is split into key ranges whose boundaries come from NTILE over
+its primary key, so ranges hold about the same number of rows whatever the
+key distribution (ids with gaps, CF and DOI strings). The ranges of all
+tables are fetched concurrently, one pooled connection per range, and each
+range streams record batches of Config.EXPORT_BATCH_ROWS rows into its own
+part file: <out>/<table>/part-NNNN.parquet (or .arrow). Nothing holds more
+than one batch per range in memory.
+
+All ranges read AS OF the same SCN, taken when the export starts, so the
+files form one consistent snapshot even though they come from different
+sessions. REF columns are left out: every REF has a scalar shadow key
+column (donor_cf, disease_id, ...) that is exported instead.
+
+Incremental exports (since_scn, or since= a datetime converted with
+TIMESTAMP_TO_SCN) only contain rows whose ORA_ROWSCN is above that SCN.
+ORA_ROWSCN is tracked per block, so this can include some unchanged rows,
+never miss a changed one; deleted rows do not appear. The SCN of every
+export is written to manifest.json and is the since_scn of the next one.
+
+Needs pyarrow (optional dependency). Runs as the 'dump' background job or
+from the command line:
+
+    python bulk_export.py OUT_DIR [--format arrow] [--since-scn N | --since ISO_TIME | --since-manifest OUT/manifest.json]
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency
+    pa = None
+
+from config import Config
+from db import get_db_connection, tuned_cursor
+
+# Exported tables and the key used to split them into ranges
+TABLES = {
+    'donors_tab': 'cf',
+    'researchers_tab': 'cf',
+    'disease_tab': 'id',
+    'biological_data_tab': 'id',
+    'treatment_tab': 'id',
+    'drugs_tab': 'id',
+    'allergy_tab': 'id',
+    'publication_tab': 'doi',
+    'experiment_tab': 'id',
+    'future_work_tab': 'id',
+    'assign_tab': 'id',
+    'writes_tab': 'id',
+    'affected_tab': 'id',
+    'cause_tab': 'id',
+    'analyze_tab': 'id',
+    'consider_tab': 'id',
+}
+
+FORMATS = ('parquet', 'arrow')
+
+# Tables smaller than this are exported as a single range
+_MIN_RANGE_ROWS = 10000
+
+
+def _current_scn(cursor):
+    cursor.execute("SELECT DBMS_FLASHBACK.GET_SYSTEM_CHANGE_NUMBER FROM DUAL")
+    return cursor.fetchone()[0]
+
+
+def _columns(cursor, table):
+    """Scalar columns of an object table as (name, data_type, precision, scale); REF and BLOB left out"""
+    cursor.execute("""
+        SELECT LOWER(column_name), data_type, data_precision, data_scale
+        FROM user_tab_columns
+        WHERE table_name = :t
+          AND NVL(data_type_mod, '-') <> 'REF'
+          AND data_type <> 'BLOB'
+        ORDER BY column_id
+    """, {'t': table.upper()})
+    return cursor.fetchall()
+
+
+def _schema(cursor, table, columns, scn):
+    """Arrow schema of the table; unconstrained NUMBER columns become int64 if every value is whole"""
+    open_numbers = [name for name, data_type, precision, scale in columns
+                    if data_type == 'NUMBER' and precision is None and scale is None]
+    whole = {}
+    if open_numbers:
+        checks = ', '.join(f"COUNT(CASE WHEN {name} <> TRUNC({name}) THEN 1 END)" for name in open_numbers)
+        cursor.execute(f"SELECT {checks} FROM {table} AS OF SCN :scn", {'scn': scn})
+        whole = {name: fractional == 0 for name, fractional in zip(open_numbers, cursor.fetchone())}
+
+    fields = []
+    for name, data_type, precision, scale in columns:
+        if data_type == 'NUMBER':
+            if name in whole:
+                arrow_type = pa.int64() if whole[name] else pa.float64()
+            else:
+                arrow_type = pa.int64() if scale == 0 and (precision or 0) <= 18 else pa.float64()
+        elif data_type == 'DATE':
+            arrow_type = pa.timestamp('s')
+        elif data_type.startswith('TIMESTAMP'):
+            arrow_type = pa.timestamp('us')
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+def _ranges(cursor, table, key, parallelism, scn, since_scn):
+    """Inclusive (low, high) key ranges of about equal row counts, [] when there is nothing to export"""
+    where, binds = _since_clause(since_scn)
+    cursor.execute(f"SELECT COUNT(*) FROM {table} AS OF SCN :scn WHERE 1 = 1{where}", dict(binds, scn=scn))
+    rows = cursor.fetchone()[0]
+    if rows == 0:
+        return []
+    count = max(1, min(parallelism * 2, rows // _MIN_RANGE_ROWS))
+    cursor.execute(f"""
+        SELECT MIN({key}), MAX({key})
+        FROM (SELECT {key}, NTILE(:n) OVER (ORDER BY {key}) AS bucket
+              FROM {table} AS OF SCN :scn WHERE 1 = 1{where})
+        GROUP BY bucket
+        ORDER BY bucket
+    """, dict(binds, n=count, scn=scn))
+    return cursor.fetchall()
+
+
+def _since_clause(since_scn):
+    if since_scn is None:
+        return '', {}
+    return ' AND ORA_ROWSCN > :since_scn', {'since_scn': since_scn}
+
+
+def _open_writer(path, schema, fmt):
+    if fmt == 'parquet':
+        return pq.ParquetWriter(path, schema)
+    return pa.ipc.new_file(path, schema)
+
+
+def _export_range(table, key, schema, low, high, path, fmt, scn, since_scn):
+    """Stream one key range of a table into its part file; return the number of rows written"""
+    names = ', '.join(schema.names)
+    where, binds = _since_clause(since_scn)
+    conn = get_db_connection()
+    written = 0
+    try:
+        cursor = tuned_cursor(conn, 'export')
+        cursor.execute(f"""
+            SELECT {names} FROM {table} AS OF SCN :scn
+            WHERE {key} BETWEEN :low AND :high{where}
+        """, dict(binds, scn=scn, low=low, high=high))
+        writer = _open_writer(path, schema, fmt)
+        try:
+            while True:
+                rows = cursor.fetchmany(Config.EXPORT_BATCH_ROWS)
+                if not rows:
+                    break
+                arrays = [pa.array(values, type=field.type) for values, field in zip(zip(*rows), schema)]
+                writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+                written += len(rows)
+        finally:
+            writer.close()
+        cursor.close()
+    finally:
+        conn.close()
+    return written
+
+
+def export_all(out_dir, fmt='parquet', since_scn=None, since=None, tables=None, parallelism=None, progress=None):
+    """Export tables (default: all of TABLES) into out_dir and return the manifest dict.
+
+    progress, if given, is called with (fraction, message) as ranges complete.
+    """
+    if pa is None:
+        raise RuntimeError('pyarrow is required for exports (pip install pyarrow)')
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    tables = list(tables or TABLES)
+    for table in tables:
+        if table not in TABLES:
+            raise ValueError(f"Unknown table: {table}")
+    # One pooled connection per concurrent range; leave one in the pool for this process's requests
+    parallelism = max(1, min(parallelism or Config.EXPORT_PARALLELISM, Config.DB_POOL_MAX - 1))
+    started = time.time()
+
+    conn = get_db_connection()
+    try:
+        cursor = tuned_cursor(conn, 'dropdown')
+        scn = _current_scn(cursor)
+        if since is not None:
+            cursor.execute("SELECT TIMESTAMP_TO_SCN(:ts) FROM DUAL", {'ts': since})
+            since_scn = cursor.fetchone()[0]
+        plan = []
+        for table in tables:
+            columns = _columns(cursor, table)
+            schema = _schema(cursor, table, columns, scn)
+            ranges = _ranges(cursor, table, TABLES[table], parallelism, scn, since_scn)
+            plan.append((table, schema, ranges))
+        cursor.close()
+    finally:
+        conn.close()
+
+    manifest = {
+        'format': fmt,
+        'scn': scn,
+        'since_scn': since_scn,
+        'started_at': started,
+        'tables': {},
+    }
+    extension = 'parquet' if fmt == 'parquet' else 'arrow'
+    tasks = []
+    for table, schema, ranges in plan:
+        os.makedirs(os.path.join(out_dir, table), exist_ok=True)
+        manifest['tables'][table] = {'columns': schema.names, 'parts': [], 'rows': 0}
+        for number, (low, high) in enumerate(ranges):
+            part = os.path.join(table, f'part-{number:04d}.{extension}')
+            tasks.append((table, schema, low, high, part))
+
+    with ThreadPoolExecutor(max_workers=parallelism, thread_name_prefix='export') as pool:
+        futures = {
+            pool.submit(_export_range, table, TABLES[table], schema, low, high,
+                        os.path.join(out_dir, part), fmt, scn, since_scn): (table, part)
+            for table, schema, low, high, part in tasks
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            table, part = futures[future]
+            rows = future.result()
+            entry = manifest['tables'][table]
+            entry['parts'].append(part)
+            entry['rows'] += rows
+            if progress is not None:
+                progress(done / len(tasks), f'{done}/{len(tasks)} ranges exported')
+
+    for entry in manifest['tables'].values():
+        entry['parts'].sort()
+    manifest['finished_at'] = time.time()
+    with open(os.path.join(out_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export every table to Parquet or Arrow IPC files')
+    parser.add_argument('out_dir')
+    parser.add_argument('--format', choices=FORMATS, default='parquet')
+    parser.add_argument('--parallelism', type=int, default=None)
+    parser.add_argument('--table', action='append', dest='tables', choices=sorted(TABLES))
+    since = parser.add_mutually_exclusive_group()
+    since.add_argument('--since-scn', type=int, default=None)
+    since.add_argument('--since', type=datetime.fromisoformat, default=None,
+                       help='ISO timestamp, within the database flashback window')
+    since.add_argument('--since-manifest', help='manifest.json of a previous export')
+    args = parser.parse_args()
+
+    since_scn = args.since_scn
+    if args.since_manifest:
+        with open(args.since_manifest, encoding='utf-8') as f:
+            since_scn = json.load(f)['scn']
+    manifest = export_all(args.out_dir, args.format, since_scn=since_scn, since=args.since, tables=args.tables,
+                          parallelism=args.parallelism,
+                          progress=lambda fraction, message: print(message))
+    for table, entry in manifest['tables'].items():
+        print(f"{table:<22}{entry['rows']:>10} rows  {len(entry['parts'])} parts")
+    print(f"SCN {manifest['scn']} (use --since-scn {manifest['scn']} for the next incremental export)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+"""Cross-worker invalidation bus.
+
+In-process caches (stats counters, the density snapshot, ...) subscribe to
+table changes with subscribe(callback, tables) and are told when another
+worker, another app instance or a SQL script wrote to those tables. An
+Event is (table, key, op): key is the changed row's key as written by the
+triggers of sql/oracle_change_log.sql, or None for "the whole table".
+
+Backends (Config.CHANGES_BACKEND):
+
+- 'oracle': a listener thread polls change_log (filled by triggers) for
+  event_id above the last one seen, plus table_version, both in one
+  read-only transaction. The version moves by one per statement and the
+  events of a statement share a statement_id, so a table whose version
+  moved by more than the statements seen (a transaction that committed
+  after later sequence values had already been read) yields a table-level
+  event: no change is ever missed, only widened.
+- 'file': stand-in for offline testing without the triggers. publish()
+  appends JSON lines to Config.CHANGES_FILE and every process on the host
+  tails it.
+- 'none': only local publish() calls are delivered.
+
+Every event reaches each subscriber once. With the oracle listener running,
+publish() delivers nothing itself: the triggers log the write and the
+listener of this process reads it back like any other. Otherwise publish()
+delivers to the subscribers of this process right away (the file backend
+skips its own lines when tailing).
+"""
+import json
+import os
+import threading
+import time
+import uuid
+from collections import namedtuple
+
+from config import Config
+from db import tuned_cursor
+
+Event = namedtuple('Event', 'table key op')
+
+# Events published by this process carry its token, so the file backend does not deliver them twice
+_ORIGIN = uuid.uuid4().hex
+
+_subscribers = []
+_subscribers_lock = threading.Lock()
+_file_lock = threading.Lock()
+_listener = None
+_status = {'backend': Config.CHANGES_BACKEND, 'last_event_id': None, 'last_poll_at': None,
+           'events': 0, 'errors': 0}
+
+
+def subscribe(callback, tables=None):
+    """Call callback(event) for changes to tables (upper-case names), or to every table if None"""
+    wanted = frozenset(t.upper() for t in tables) if tables else None
+    with _subscribers_lock:
+        _subscribers.append((wanted, callback))
+
+
+def _dispatch(events):
+    with _subscribers_lock:
+        subscribers = list(_subscribers)
+    for event in events:
+        _status['events'] += 1
+        for wanted, callback in subscribers:
+            if wanted is None or event.table in wanted:
+                try:
+                    callback(event)
+                except Exception as e:
+                    print(f"Error in change subscriber for {event.table}: {e}")
+
+
+def publish(table, key=None, op='U'):
+    """Announce a change made by this process"""
+    if Config.CHANGES_BACKEND == 'oracle' and _listener is not None:
+        # Logged by the triggers: the listener delivers it with the next poll
+        return
+    event = Event(table.upper(), None if key is None else str(key), op)
+    _dispatch([event])
+    if Config.CHANGES_BACKEND == 'file':
+        line = json.dumps({'origin': _ORIGIN, 'table': event.table, 'key': event.key, 'op': op}) + '\n'
+        try:
+            with _file_lock, open(Config.CHANGES_FILE, 'a', encoding='utf-8') as f:
+                f.write(line)
+        except OSError as e:
+            print(f"Error writing change event: {e}")
+
+
+class _OracleSource:
+    """Polls change_log and table_version"""
+
+    def __init__(self, get_connection):
+        self._get_connection = get_connection
+        self._last_id = None
+        self._versions = None
+
+    def poll(self):
+        conn = self._get_connection()
+        try:
+            cursor = tuned_cursor(conn, 'dropdown')
+            # Versions and events from the same snapshot
+            cursor.execute("SET TRANSACTION READ ONLY")
+            cursor.execute("SELECT table_name, version FROM table_version")
+            versions = dict(cursor.fetchall())
+            if self._last_id is None:
+                # Start from now: earlier changes are already reflected in the caches' first load
+                cursor.execute("SELECT NVL(MAX(event_id), 0) FROM change_log")
+                self._last_id = cursor.fetchone()[0]
+                self._versions = versions
+                conn.rollback()
+                cursor.close()
+                return []
+            cursor.execute("""
+                SELECT event_id, statement_id, table_name, key_value, op
+                FROM change_log
+                WHERE event_id > :last_id
+                ORDER BY event_id
+            """, {'last_id': self._last_id})
+            rows = cursor.fetchall()
+            conn.rollback()
+            cursor.close()
+        finally:
+            conn.close()
+
+        events = [Event(table, key, op) for _, _, table, key, op in rows]
+        if rows:
+            self._last_id = rows[-1][0]
+        statements = {}
+        for _, statement_id, table, _, _ in rows:
+            statements.setdefault(table, set()).add(statement_id)
+        for table, version in versions.items():
+            # More statements than seen: some committed below _last_id (or changed no rows)
+            if version - self._versions.get(table, 0) > len(statements.get(table, ())):
+                events.append(Event(table, None, 'U'))
+        self._versions = versions
+        _status['last_event_id'] = self._last_id
+        return events
+
+
+class _FileSource:
+    """Tails Config.CHANGES_FILE"""
+
+    def __init__(self):
+        path = Config.CHANGES_FILE
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._offset = os.path.getsize(path) if os.path.exists(path) else 0
+
+    def poll(self):
+        path = Config.CHANGES_FILE
+        if not os.path.exists(path):
+            return []
+        if os.path.getsize(path) < self._offset:
+            # Truncated or replaced: start over
+            self._offset = 0
+        with open(path, 'rb') as f:
+            f.seek(self._offset)
+            data = f.read()
+        # Only consume complete lines; a writer may be halfway through the last one
+        end = data.rfind(b'\n') + 1
+        self._offset += end
+        events = []
+        for line in data[:end].decode('utf-8').splitlines():
+            try:
+                item = json.loads(line)
+            except ValueError:
+                continue
+            if item.get('origin') != _ORIGIN:
+                events.append(Event(item['table'], item.get('key'), item.get('op', 'U')))
+        return events
+
+
+def status():
+    return dict(_status, subscribers=len(_subscribers))
+
+
+def start_listener(get_connection, interval=None):
+    """Start the polling thread (once per process)"""
+    global _listener
+    interval = Config.CHANGES_POLL_SECONDS if interval is None else interval
+    backend = Config.CHANGES_BACKEND
+    if _listener is not None or backend not in ('oracle', 'file') or interval <= 0:
+        return
+    source = _OracleSource(get_connection) if backend == 'oracle' else _FileSource()
+
+    def run():
+        while True:
+            try:
+                events = source.poll()
+                _status['last_poll_at'] = time.time()
+                if events:
+                    _dispatch(events)
+            except Exception as e:
+                _status['errors'] += 1
+                print(f"Error polling changes: {e}")
+            time.sleep(interval)
+
+    _listener = threading.Thread(target=run, name='change-listener', daemon=True)
+    _listener.start()
@@ -0,0 +1,110 @@
+"""HTTP conditional GET for pages that only depend on a few tables.
+
+Each table has a change counter in table_version (sql/oracle_table_versions.sql),
+bumped by a statement-level trigger on every write. A page decorated with
+@conditional_get('donors_tab', ...) gets an ETag built from the versions of
+its tables and a Last-Modified from their latest change. When the browser
+revalidates with a matching If-None-Match / If-Modified-Since, the view is
+not run at all: the request costs one primary-key lookup and a 304. The
+versions are read like any other query of the request, and db.py keeps all
+reads of a request on one database, so they describe the replica (or the
+primary) the view then reads from.
+
+Responses carry Cache-Control: no-cache, so browsers always revalidate and
+never show a page older than the data.
+"""
+import functools
+import hashlib
+import os
+from datetime import timezone
+
+from flask import current_app, g, make_response, message_flashed, request, session
+
+from db import get_read_connection, tuned_cursor
+
+_WEBAPP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _build_token():
+    """Changes whenever code, templates or static files are redeployed"""
+    latest = 0
+    for root, _dirs, files in os.walk(_WEBAPP_DIR):
+        for name in files:
+            if name.endswith(('.py', '.html', '.css', '.js')):
+                latest = max(latest, os.path.getmtime(os.path.join(root, name)))
+    return str(int(latest))
+
+
+_BUILD = _build_token()
+
+
+def _on_flash(sender, message, category, **extra):
+    # A page that flashed a message must not be revalidated later as "unchanged"
+    g.conditional_skip = True
+
+
+message_flashed.connect(_on_flash)
+
+
+def table_versions(tables):
+    """Return ({table: version}, latest change as an aware UTC datetime)"""
+    names = [table.upper() for table in tables]
+    binds = {f't{i}': name for i, name in enumerate(names)}
+    placeholders = ', '.join(f':{key}' for key in binds)
+    conn = get_read_connection()
+    try:
+        cursor = tuned_cursor(conn, len(names))
+        cursor.execute(f"""
+            SELECT table_name, version, SYS_EXTRACT_UTC(changed_at)
+            FROM table_version
+            WHERE table_name IN ({placeholders})
+        """, binds)
+        rows = cursor.fetchall()
+        cursor.close()
+    finally:
+        conn.close()
+    versions = {name: version for name, version, _ in rows}
+    changed = [changed_at for _, _, changed_at in rows if changed_at is not None]
+    last_modified = max(changed).replace(tzinfo=timezone.utc, microsecond=0) if changed else None
+    return versions, last_modified
+
+
+def _not_modified(etag, last_modified):
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    return (last_modified is not None and request.if_modified_since is not None
+            and last_modified <= request.if_modified_since)
+
+
+def conditional_get(*tables):
+    """Decorator: ETag/Last-Modified from the versions of tables, 304 when unchanged"""
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            # Non-GET requests and pages carrying flash messages are always rendered
+            if request.method != 'GET' or session.get('_flashes'):
+                return view(*args, **kwargs)
+
+            try:
+                versions, last_modified = table_versions(tables)
+            except Exception as e:
+                print(f"Error reading table versions, serving without validators: {e}")
+                return view(*args, **kwargs)
+
+            key = '|'.join([_BUILD, request.full_path] + [f'{t}={versions.get(t)}' for t in sorted(versions)])
+            etag = hashlib.sha1(key.encode()).hexdigest()
+
+            if _not_modified(etag, last_modified):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200 or g.get('conditional_skip'):
+                    return response
+
+            response.set_etag(etag, weak=True)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
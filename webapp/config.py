@@ -7,8 +7,123 @@ class Config:
     DB_HOST = os.getenv('DB_HOST', 'localhost')
     DB_PORT = os.getenv('DB_PORT', '1521')
     DB_SERVICE = os.getenv('DB_SERVICE', 'XEPDB1')
-    
+
+    # Read replicas (Active Data Guard standby, second local instance, ...).
+    # Comma-separated list of DSNs; empty means every read goes to the primary.
+    DB_READ_DSN = os.getenv('DB_READ_DSN', '')
+
+    # Connection pool sizing (per DSN)
+    DB_POOL_MIN = int(os.getenv('DB_POOL_MIN', '1'))
+    DB_POOL_MAX = int(os.getenv('DB_POOL_MAX', '8'))
+
+    # After a write, the same browser session reads from the primary for this many
+    # seconds so that the page it is redirected to shows its own changes.
+    READ_YOUR_WRITES_SECONDS = int(os.getenv('READ_YOUR_WRITES_SECONDS', '10'))
+
+    # A replica that failed to hand out a connection is skipped for this many seconds
+    REPLICA_RETRY_SECONDS = int(os.getenv('REPLICA_RETRY_SECONDS', '30'))
+
+    # Dashboard counters are reloaded from the database this often (0 disables)
+    STATS_REFRESH_SECONDS = int(os.getenv('STATS_REFRESH_SECONDS', '300'))
+
+    # Operation 2 served from an in-memory columnar snapshot (needs NumPy; ignored without it)
+    DENSITY_SNAPSHOT = os.getenv('DENSITY_SNAPSHOT', '1') == '1'
+    DENSITY_SNAPSHOT_REFRESH_SECONDS = int(os.getenv('DENSITY_SNAPSHOT_REFRESH_SECONDS', '60'))
+
+    # Treatment -> allergy risk index in memory (allergy_index.py), kept current by the change bus;
+    # full rebuild at this interval (picks up deletes)
+    ALLERGY_INDEX = os.getenv('ALLERGY_INDEX', '1') == '1'
+    ALLERGY_INDEX_REFRESH_SECONDS = int(os.getenv('ALLERGY_INDEX_REFRESH_SECONDS', '600'))
+
+    # Researcher-publication graph in memory (research_graph.py, needs NumPy): op5 and co-authorship
+    # analytics; full reload interval (inserted edges are merged in between) and BFS depth limit
+    RESEARCH_GRAPH = os.getenv('RESEARCH_GRAPH', '1') == '1'
+    RESEARCH_GRAPH_REFRESH_SECONDS = int(os.getenv('RESEARCH_GRAPH_REFRESH_SECONDS', '600'))
+    RESEARCH_GRAPH_MAX_HOPS = int(os.getenv('RESEARCH_GRAPH_MAX_HOPS', '6'))
+
+    # Background jobs: local persistent queue, worker threads per process, limits and retention
+    JOBS_DIR = os.getenv('JOBS_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'jobs'))
+    JOBS_WORKERS = int(os.getenv('JOBS_WORKERS', '2'))
+    JOBS_MAX_QUEUED = int(os.getenv('JOBS_MAX_QUEUED', '100'))
+    JOBS_RETENTION_SECONDS = int(os.getenv('JOBS_RETENTION_SECONDS', '86400'))
+    JOBS_POLL_SECONDS = float(os.getenv('JOBS_POLL_SECONDS', '2'))
+
+    # Full-database Parquet/Arrow export (bulk_export.py): concurrent ranges and rows per record batch
+    EXPORT_PARALLELISM = int(os.getenv('EXPORT_PARALLELISM', '4'))
+    EXPORT_BATCH_ROWS = int(os.getenv('EXPORT_BATCH_ROWS', '50000'))
+
+    # Parallel chunked fetch of large queries (parallel_fetch.py): ranges per query (1 disables), table
+    # size from which it is used, and pooled connections all parallel queries of a process may hold
+    PARALLEL_FETCH_DEGREE = int(os.getenv('PARALLEL_FETCH_DEGREE', '4'))
+    PARALLEL_FETCH_MIN_ROWS = int(os.getenv('PARALLEL_FETCH_MIN_ROWS', '20000'))
+    PARALLEL_FETCH_MAX_CONNECTIONS = int(os.getenv('PARALLEL_FETCH_MAX_CONNECTIONS', str(max(1, DB_POOL_MAX // 2))))
+
+    # Batch variants of operations 3 and 4 (batch_ops.py): most ids accepted in one request or job
+    BATCH_MAX_IDS = int(os.getenv('BATCH_MAX_IDS', '1000'))
+
+    # Read-only JSON API (api_v1.py): rows per page by default and the largest ?limit= accepted
+    API_PAGE_SIZE = int(os.getenv('API_PAGE_SIZE', '100'))
+    API_MAX_PAGE_SIZE = int(os.getenv('API_MAX_PAGE_SIZE', '1000'))
+
+    # Start-up: warm-up (pools, templates, WARMUP_PATHS requested once) before /readyz reports ready,
+    # and the Jinja bytecode cache shared by the worker processes
+    WARMUP = os.getenv('WARMUP', '1') == '1'
+    WARMUP_PATHS = os.getenv('WARMUP_PATHS', '/,/operations,/jobs,/donors,/researchers,/diseases,/treatments,/drugs,/allergies,/publications')
+    WARMUP_RETRY_SECONDS = int(os.getenv('WARMUP_RETRY_SECONDS', '5'))
+    JINJA_CACHE_DIR = os.getenv('JINJA_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'jinja_cache'))
+    DEBUG = os.getenv('FLASK_DEBUG', '0') == '1'
+
+    # Cross-worker invalidation bus: 'oracle' (poll change_log / table_version), 'file' (offline stand-in), 'none'
+    CHANGES_BACKEND = os.getenv('CHANGES_BACKEND', 'oracle')
+    CHANGES_FILE = os.getenv('CHANGES_FILE', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'changes.log'))
+    CHANGES_POLL_SECONDS = float(os.getenv('CHANGES_POLL_SECONDS', '2'))
+    CHANGES_COALESCE_SECONDS = float(os.getenv('CHANGES_COALESCE_SECONDS', '5'))
+
+    # Admission control (per process): concurrent requests per class, bounded wait queue, shedding
+    ADMISSION_CONTROL = os.getenv('ADMISSION_CONTROL', '1') == '1'
+    ADMISSION_HEAVY_ENDPOINTS = os.getenv('ADMISSION_HEAVY_ENDPOINTS', 'operation_2,operation_3,operation_4,operation_5,api_op3_batch,api_op4_batch,v1_op2,v1_op4,v1_op5')
+    ADMISSION_HEAVY_LIMIT = int(os.getenv('ADMISSION_HEAVY_LIMIT', '2'))
+    ADMISSION_HEAVY_MAX_WAITING = int(os.getenv('ADMISSION_HEAVY_MAX_WAITING', '4'))
+    ADMISSION_HEAVY_TIMEOUT = float(os.getenv('ADMISSION_HEAVY_TIMEOUT', '5'))
+    ADMISSION_LIGHT_LIMIT = int(os.getenv('ADMISSION_LIGHT_LIMIT', '16'))
+    ADMISSION_LIGHT_MAX_WAITING = int(os.getenv('ADMISSION_LIGHT_MAX_WAITING', '32'))
+    ADMISSION_LIGHT_TIMEOUT = float(os.getenv('ADMISSION_LIGHT_TIMEOUT', '10'))
+    ADMISSION_RETRY_AFTER = int(os.getenv('ADMISSION_RETRY_AFTER', '5'))
+
+    # Statement deadlines (seconds, 0 = none) for connections used by a request: default, heavy
+    # endpoints (ADMISSION_HEAVY_ENDPOINTS) and per-endpoint overrides ("operation_4=120,donors=5")
+    QUERY_TIMEOUT_SECONDS = float(os.getenv('QUERY_TIMEOUT_SECONDS', '15'))
+    QUERY_TIMEOUT_HEAVY_SECONDS = float(os.getenv('QUERY_TIMEOUT_HEAVY_SECONDS', '60'))
+    QUERY_TIMEOUTS = os.getenv('QUERY_TIMEOUTS', '')
+
     @staticmethod
     def get_dsn():
         """Returns the DSN string for Oracle connection"""
         return f"{Config.DB_HOST}:{Config.DB_PORT}/{Config.DB_SERVICE}"
+
+    @staticmethod
+    def get_read_dsns():
+        """Returns the list of read replica DSNs (may be empty)"""
+        return [dsn.strip() for dsn in Config.DB_READ_DSN.split(',') if dsn.strip()]
+
+    @staticmethod
+    def endpoint_name(endpoint):
+        """Endpoint without its blueprint prefix ('operations.operation_2' -> 'operation_2')"""
+        return (endpoint or '').rpartition('.')[2]
+
+    @staticmethod
+    def get_heavy_endpoints():
+        """Returns the set of endpoints admitted in the 'heavy' class"""
+        return {name.strip() for name in Config.ADMISSION_HEAVY_ENDPOINTS.split(',') if name.strip()}
+
+    @staticmethod
+    def get_query_timeout(endpoint):
+        """Returns the statement deadline in seconds for an endpoint"""
+        endpoint = Config.endpoint_name(endpoint)
+        for item in Config.QUERY_TIMEOUTS.split(','):
+            name, _, seconds = item.partition('=')
+            if name.strip() == endpoint and seconds.strip():
+                return float(seconds)
+        if endpoint in Config.get_heavy_endpoints():
+            return Config.QUERY_TIMEOUT_HEAVY_SECONDS
+        return Config.QUERY_TIMEOUT_SECONDS
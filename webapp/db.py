@@ -0,0 +1,267 @@
+"""Data-access layer: connection pools and read/write routing.
+
+Writes always go to the primary (Config.get_dsn()). Reads go to one of the
+replicas in Config.get_read_dsns(), round-robin, unless:
+
+- the current browser session wrote recently (read-your-writes: the page an
+  add_* form redirects to must show the new row even if the standby lags), or
+- every replica is marked unhealthy, in which case reads fail over to the primary.
+
+Inside a request the first read picks the database and later reads of the
+same request reuse it, so e.g. the ETag versions of conditional.py and the
+page they validate come from the same replica.
+
+Connections are returned to their pool by the usual conn.close().
+
+Every connection handed out inside a request gets a call_timeout (the
+deadline of its endpoint, see Config.get_query_timeout): any single round
+trip to the database that takes longer is interrupted by the driver. Outside requests
+(background jobs, refresher threads) statements are not limited.
+
+Every connection also fetches CLOB columns directly as str (see
+_output_type_handler), and tuned_cursor() sizes arraysize/prefetchrows for
+the expected number of rows of a statement.
+"""
+import itertools
+import threading
+import time
+
+import oracledb
+from flask import g, has_request_context, request, session
+
+from config import Config
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+# dsn -> time before which the replica is not tried again
+_unhealthy_until = {}
+_replica_cycle = None
+
+
+def _get_pool(dsn):
+    """Return the pool for a DSN, creating it on first use"""
+    pool = _pools.get(dsn)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(dsn)
+            if pool is None:
+                pool = oracledb.create_pool(
+                    user=Config.DB_USER,
+                    password=Config.DB_PASSWORD,
+                    dsn=dsn,
+                    min=Config.DB_POOL_MIN,
+                    max=Config.DB_POOL_MAX,
+                    increment=1
+                )
+                _pools[dsn] = pool
+    return pool
+
+
+def _output_type_handler(cursor, metadata):
+    # CLOB/NCLOB fetched inline as str with the rest of the row, instead of a
+    # LOB locator that costs one more round trip per row when read()
+    if metadata.type_code is oracledb.DB_TYPE_CLOB:
+        return cursor.var(oracledb.DB_TYPE_LONG, arraysize=cursor.arraysize)
+    if metadata.type_code is oracledb.DB_TYPE_NCLOB:
+        return cursor.var(oracledb.DB_TYPE_LONG_NVARCHAR, arraysize=cursor.arraysize)
+    return None
+
+
+def _prepare(conn):
+    """Set the statement deadline of the current endpoint and the output type handler on a pooled connection"""
+    seconds = Config.get_query_timeout(request.endpoint) if has_request_context() else 0
+    conn.call_timeout = int(seconds * 1000)
+    conn.outputtypehandler = _output_type_handler
+    return conn
+
+
+# (arraysize, prefetchrows) by expected result size. prefetchrows above the
+# row count lets execute() bring back the whole result and the end-of-fetch
+# marker in its own round trip.
+FETCH_SIZES = {
+    'row': (1, 2),            # single-row lookups (next id, counts)
+    'dropdown': (200, 201),   # option lists of the add_* forms
+    'list': (1000, 1000),     # list pages and operation results
+    'export': (5000, 5000),   # exports, snapshots, background jobs
+}
+
+
+def tuned_cursor(conn, expected='list'):
+    """Return a cursor sized for the expected rows: a FETCH_SIZES key or an estimated row count"""
+    cursor = conn.cursor()
+    if isinstance(expected, str):
+        arraysize, prefetchrows = FETCH_SIZES[expected]
+    else:
+        arraysize = min(max(int(expected) + 1, 2), FETCH_SIZES['export'][0])
+        prefetchrows = arraysize
+    cursor.arraysize = arraysize
+    cursor.prefetchrows = prefetchrows
+    return cursor
+
+
+def get_db_connection():
+    """Return a connection to the primary (use for writes)"""
+    try:
+        return _prepare(_get_pool(Config.get_dsn()).acquire())
+    except Exception as e:
+        print(f"Error connecting to database: {e}")
+        raise
+
+
+def mark_write():
+    """Record that the current session has just written to the primary"""
+    if has_request_context():
+        session['last_write'] = time.time()
+        # Reads after the write in this request go to the primary as well
+        g.pop('read_dsn', None)
+
+
+def _recently_wrote():
+    if not has_request_context():
+        return False
+    last_write = session.get('last_write')
+    return last_write is not None and time.time() - last_write < Config.READ_YOUR_WRITES_SECONDS
+
+
+def _next_replica():
+    """Return the next healthy replica DSN, or None if there is none"""
+    global _replica_cycle
+    replicas = Config.get_read_dsns()
+    if not replicas:
+        return None
+    if _replica_cycle is None:
+        _replica_cycle = itertools.cycle(replicas)
+    now = time.time()
+    for _ in range(len(replicas)):
+        dsn = next(_replica_cycle)
+        if _unhealthy_until.get(dsn, 0) <= now:
+            return dsn
+    return None
+
+
+def _route_read():
+    if not _recently_wrote():
+        dsn = _next_replica()
+        while dsn is not None:
+            try:
+                return _prepare(_get_pool(dsn).acquire()), dsn
+            except Exception as e:
+                print(f"Read replica {dsn} unavailable, skipping for {Config.REPLICA_RETRY_SECONDS}s: {e}")
+                _unhealthy_until[dsn] = time.time() + Config.REPLICA_RETRY_SECONDS
+                dsn = _next_replica()
+    return get_db_connection(), Config.get_dsn()
+
+
+def get_read_connection_with_dsn():
+    """Return (connection, dsn) for read-only queries (replica when possible).
+
+    Further connections that must read the same database, e.g. from worker
+    threads outside the request, pass dsn to get_read_connection().
+    """
+    if not has_request_context():
+        return _route_read()
+    pinned = g.get('read_dsn')
+    if pinned == Config.get_dsn():
+        return get_db_connection(), pinned
+    if pinned is not None:
+        try:
+            return _prepare(_get_pool(pinned).acquire()), pinned
+        except Exception as e:
+            print(f"Read replica {pinned} unavailable, skipping for {Config.REPLICA_RETRY_SECONDS}s: {e}")
+            _unhealthy_until[pinned] = time.time() + Config.REPLICA_RETRY_SECONDS
+    conn, g.read_dsn = _route_read()
+    return conn, g.read_dsn
+
+
+def get_read_connection(dsn=None):
+    """Return a connection for read-only queries (replica when possible), or to dsn when given"""
+    if dsn is not None:
+        return _prepare(_get_pool(dsn).acquire())
+    return get_read_connection_with_dsn()[0]
+
+
+def open_pools():
+    """Create the pools of the primary and of every replica and check one connection of each (warm-up)"""
+    for dsn in [Config.get_dsn()] + Config.get_read_dsns():
+        try:
+            conn = _get_pool(dsn).acquire()
+            conn.ping()
+            conn.close()
+        except Exception as e:
+            if dsn == Config.get_dsn():
+                raise
+            print(f"Read replica {dsn} unavailable at start-up, skipping for {Config.REPLICA_RETRY_SECONDS}s: {e}")
+            _unhealthy_until[dsn] = time.time() + Config.REPLICA_RETRY_SECONDS
+
+
+def replica_status():
+    """Return {dsn: healthy} for every configured replica"""
+    now = time.time()
+    return {dsn: _unhealthy_until.get(dsn, 0) <= now for dsn in Config.get_read_dsns()}
+
+
+# Errors raised when call_timeout expires (thin mode) or a statement is cancelled
+_TIMEOUT_CODES = {'DPY-4024', 'DPI-1067', 'ORA-03156', 'ORA-01013'}
+
+
+def is_timeout(exc):
+    """True if an oracledb error means the statement hit its deadline or was cancelled"""
+    if not isinstance(exc, oracledb.Error) or not exc.args:
+        return False
+    error_obj = exc.args[0]
+    return getattr(error_obj, 'full_code', None) in _TIMEOUT_CODES
+
+
+def error_message(exc):
+    """User-facing message for a database error"""
+    if is_timeout(exc):
+        seconds = Config.get_query_timeout(request.endpoint) if has_request_context() else 0
+        return (f'The query was stopped after {seconds:g} seconds. '
+                'Try a more selective value, or run it as a background job.')
+    if isinstance(exc, oracledb.Error) and exc.args:
+        return f'Database error: {exc.args[0].message}'
+    return f'Error executing operation: {exc}'
+
+
+class RowStream:
+    """Rows of an executed cursor, fetched lazily while a streamed template renders.
+
+    Truthiness tells whether there is at least one row (templates use
+    {% if rows %}). close() is registered with response.call_on_close: if the
+    client goes away before the last row, the open cursor is closed, which
+    stops the statement on the server instead of fetching it to the end.
+    """
+
+    def __init__(self, conn, cursor):
+        self._conn = conn
+        self._cursor = cursor
+        self._first = cursor.fetchone()
+        self._closed = False
+        if self._first is None:
+            self.close()
+
+    def __bool__(self):
+        return self._first is not None
+
+    def __iter__(self):
+        if self._first is None:
+            return
+        yield self._first
+        while not self._closed:
+            rows = self._cursor.fetchmany()
+            if not rows:
+                break
+            yield from rows
+        self.close()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._cursor.close()
+        except oracledb.Error as e:
+            print(f"Error closing streamed cursor: {e}")
+        finally:
+            self._conn.close()
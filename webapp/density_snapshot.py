@@ -0,0 +1,220 @@
+"""In-memory columnar snapshot of biological_data_tab for operation 2.
+
+The columns needed by func_list_bio_below_density are kept as NumPy arrays
+sorted by density, so "density < threshold" is a binary search followed by
+zero-copy slices of every column, and the result size or a density
+histogram can be answered without fetching any row.
+
+The snapshot is optional: it is only built when NumPy is installed and
+Config.DENSITY_SNAPSHOT is on. Callers check available() and otherwise
+query Oracle as before.
+
+Refreshes are incremental: only rows whose ORA_ROWSCN is above the highest
+one already seen are fetched and merged. Deletes are invisible to
+ORA_ROWSCN, so each refresh also compares the row count with the database
+and rebuilds from scratch when they differ. Every refresh publishes a new
+immutable _Snapshot object; readers never take a lock.
+"""
+import threading
+import time
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+from config import Config
+from db import tuned_cursor
+
+_COLUMNS = ('id', 'name', 'data_type', 'density', 'donor_cf', 'is_required', 'condition')
+
+_snapshot = None
+_refresh_lock = threading.Lock()
+_refresher = None
+_wakeup = threading.Event()
+
+
+class _Snapshot:
+    """Immutable column arrays sorted by (density, id)"""
+
+    def __init__(self, columns, max_scn):
+        order = np.lexsort((columns['id'], columns['density']))
+        self.columns = {name: values[order] for name, values in columns.items()}
+        self.max_scn = max_scn
+        self.refreshed_at = time.time()
+
+    def __len__(self):
+        return len(self.columns['id'])
+
+    def count_below(self, threshold):
+        return int(np.searchsorted(self.columns['density'], threshold, side='left'))
+
+    def below(self, threshold):
+        """Rows with density < threshold, in the op2 column order"""
+        end = self.count_below(threshold)
+        sliced = [self.columns[name][:end] for name in _COLUMNS]
+        sliced[0] = sliced[0].tolist()
+        sliced[3] = sliced[3].tolist()
+        return list(zip(*sliced))
+
+
+def _empty_columns():
+    return {
+        'id': np.empty(0, dtype=np.int64),
+        'name': np.empty(0, dtype=object),
+        'data_type': np.empty(0, dtype=object),
+        'density': np.empty(0, dtype=np.float64),
+        'donor_cf': np.empty(0, dtype=object),
+        'is_required': np.empty(0, dtype=object),
+        'condition': np.empty(0, dtype=object),
+    }
+
+
+def _to_columns(rows):
+    """Turn fetched (ora_rowscn, id, name, ...) rows into column arrays"""
+    if not rows:
+        return _empty_columns(), 0
+    transposed = list(zip(*rows))
+    columns = {
+        'id': np.array(transposed[1], dtype=np.int64),
+        'name': np.array(transposed[2], dtype=object),
+        'data_type': np.array(transposed[3], dtype=object),
+        'density': np.array(transposed[4], dtype=np.float64),
+        'donor_cf': np.array(transposed[5], dtype=object),
+        'is_required': np.array(transposed[6], dtype=object),
+        'condition': np.array(transposed[7], dtype=object),
+    }
+    return columns, max(transposed[0])
+
+
+def _fetch(conn, since_scn):
+    cursor = tuned_cursor(conn, 'export')
+    cursor.execute("""
+        SELECT ORA_ROWSCN, id, name, data_type, density, donor_cf, is_required, condition
+        FROM biological_data_tab
+        WHERE ORA_ROWSCN > :since_scn
+    """, {'since_scn': since_scn})
+    rows = cursor.fetchall()
+    cursor.execute("SELECT COUNT(*) FROM biological_data_tab")
+    total = cursor.fetchone()[0]
+    cursor.close()
+    return rows, total
+
+
+def _merge(current, delta, delta_scn):
+    """Replace the rows of current whose id appears in delta, then add the rest of delta"""
+    keep = ~np.isin(current.columns['id'], delta['id'])
+    columns = {name: np.concatenate((current.columns[name][keep], delta[name])) for name in current.columns}
+    return _Snapshot(columns, max(current.max_scn, delta_scn))
+
+
+def available():
+    """True when the snapshot is enabled and loaded"""
+    return _snapshot is not None
+
+
+def refresh(conn):
+    """Bring the snapshot up to date (full load the first time, then incremental)"""
+    global _snapshot
+    if np is None or not Config.DENSITY_SNAPSHOT:
+        return
+    with _refresh_lock:
+        current = _snapshot
+        since_scn = current.max_scn if current is not None else 0
+        rows, total = _fetch(conn, since_scn)
+        delta, delta_scn = _to_columns(rows)
+
+        if current is None:
+            updated = _Snapshot(delta, delta_scn)
+        else:
+            updated = _merge(current, delta, delta_scn) if rows else current
+        if len(updated) != total:
+            # Rows were deleted (or a concurrent commit raced the count): rebuild
+            rows, total = _fetch(conn, 0)
+            updated = _Snapshot(*_to_columns(rows))
+        _snapshot = updated
+
+
+def record_insert(bio_id, name, data_type, density, donor_cf, is_required, condition):
+    """Add a row just inserted by this process, without waiting for the next refresh"""
+    global _snapshot
+    if _snapshot is None:
+        return
+    with _refresh_lock:
+        current = _snapshot
+        delta = {
+            'id': np.array([bio_id], dtype=np.int64),
+            'name': np.array([name], dtype=object),
+            'data_type': np.array([data_type], dtype=object),
+            'density': np.array([density], dtype=np.float64),
+            'donor_cf': np.array([donor_cf], dtype=object),
+            'is_required': np.array([is_required], dtype=object),
+            'condition': np.array([condition], dtype=object),
+        }
+        # Keep max_scn: the next refresh still fetches the row and replaces it with the stored version
+        _snapshot = _merge(current, delta, current.max_scn)
+
+
+def below(threshold):
+    """Equivalent of func_list_bio_below_density, or None if the snapshot is not loaded"""
+    current = _snapshot
+    return current.below(threshold) if current is not None else None
+
+
+def estimate(threshold):
+    """Number of rows op2 would return for threshold, or None if the snapshot is not loaded"""
+    current = _snapshot
+    return current.count_below(threshold) if current is not None else None
+
+
+def histogram(bins=20):
+    """Density histogram as a list of {'from', 'to', 'count'}, or None if the snapshot is not loaded"""
+    current = _snapshot
+    if current is None or len(current) == 0:
+        return None if current is None else []
+    counts, edges = np.histogram(current.columns['density'], bins=bins)
+    return [
+        {'from': float(edges[i]), 'to': float(edges[i + 1]), 'count': int(counts[i])}
+        for i in range(len(counts))
+    ]
+
+
+def status():
+    current = _snapshot
+    return {
+        'enabled': np is not None and bool(Config.DENSITY_SNAPSHOT),
+        'loaded': current is not None,
+        'rows': len(current) if current is not None else 0,
+        'refreshed_at': current.refreshed_at if current is not None else None,
+    }
+
+
+def invalidate(event=None):
+    """Change bus subscriber: reload soon instead of at the next interval"""
+    _wakeup.set()
+
+
+def start_refresher(get_connection, interval=None):
+    """Start the background refresh thread (once per process, only if NumPy is available)"""
+    global _refresher
+    interval = Config.DENSITY_SNAPSHOT_REFRESH_SECONDS if interval is None else interval
+    if _refresher is not None or np is None or not Config.DENSITY_SNAPSHOT or interval <= 0:
+        return
+
+    def run():
+        while True:
+            try:
+                conn = get_connection()
+                try:
+                    refresh(conn)
+                finally:
+                    conn.close()
+            except Exception as e:
+                print(f"Error refreshing density snapshot: {e}")
+            if _wakeup.wait(interval):
+                # Let a burst of changes (bulk load, several workers) settle into one reload
+                time.sleep(Config.CHANGES_COALESCE_SECONDS)
+                _wakeup.clear()
+
+    _refresher = threading.Thread(target=run, name='density-snapshot-refresher', daemon=True)
+    _refresher.start()
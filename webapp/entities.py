@@ -0,0 +1,672 @@
+"""Entity pages: list and add forms of the object tables"""
+from flask import Blueprint, current_app, render_template, stream_template, request, redirect, url_for, flash
+from db import get_db_connection, get_read_connection, mark_write, RowStream, tuned_cursor
+import stats
+import density_snapshot
+from conditional import conditional_get
+import changes
+import parallel_fetch
+
+bp = Blueprint('entities', __name__)
+
+def render_stream(template, rows, **context):
+    """Render a template while rows are fetched; the cursor is closed when the response ends or the client leaves"""
+    response = current_app.response_class(stream_template(template, **context))
+    response.call_on_close(rows.close)
+    return response
+
+# ==================== DONORS ====================
+@bp.route('/donors')
+@conditional_get('donors_tab')
+def donors():
+    """List all donors"""
+    conn = get_read_connection()
+    cursor = tuned_cursor(conn, 'list')
+    cursor.execute("""
+        SELECT CF, name, surname, birth, sex, age
+        FROM donors_tab
+        ORDER BY surname, name
+    """)
+    donors = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return render_template('donors.html', donors=donors)
+
+@bp.route('/donors/add', methods=['GET', 'POST'])
+def add_donor():
+    """Add a new donor"""
+    if request.method == 'POST':
+        try:
+            conn = get_db_connection()
+            cursor = tuned_cursor(conn, 'row')
+            
+            cf = request.form['cf']
+            name = request.form['name']
+            surname = request.form['surname']
+            birth = request.form['birth']
+            sex = request.form['sex']
+            age = request.form['age']
+            
+            cursor.execute("""
+                INSERT INTO donors_tab VALUES (
+                    donor_typ(:cf, :name, :surname, TO_DATE(:birth, 'YYYY-MM-DD'), :sex, :age)
+                )
+            """, {
+                'cf': cf,
+                'name': name,
+                'surname': surname,
+                'birth': birth,
+                'sex': sex,
+                'age': age
+            })
+            
+            conn.commit()
+            cursor.close()
+            conn.close()
+            mark_write()
+            changes.publish('donors_tab', cf.strip(), 'I')
+            stats.record_insert('donors')
+            
+            flash('Donor added successfully!', 'success')
+            return redirect(url_for('entities.donors'))
+        except Exception as e:
+            flash(f'Error adding donor: {str(e)}', 'error')
+    
+    return render_template('add_donor.html')
+
+# ==================== RESEARCHERS ====================
+@bp.route('/researchers')
+@conditional_get('researchers_tab')
+def researchers():
+    """List all researchers"""
+    conn = get_read_connection()
+    cursor = tuned_cursor(conn, 'list')
+    cursor.execute("""
+        SELECT CF, name, surname, birth
+        FROM researchers_tab
+        ORDER BY surname, name
+    """)
+    researchers = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return render_template('researchers.html', researchers=researchers)
+
+@bp.route('/researchers/add', methods=['GET', 'POST'])
+def add_researcher():
+    """Add a new researcher"""
+    if request.method == 'POST':
+        try:
+            conn = get_db_connection()
+            cursor = tuned_cursor(conn, 'row')
+            
+            cf = request.form['cf']
+            name = request.form['name']
+            surname = request.form['surname']
+            birth = request.form['birth']
+            
+            cursor.execute("""
+                INSERT INTO researchers_tab VALUES (
+                    researcher_typ(:cf, :name, :surname, TO_DATE(:birth, 'YYYY-MM-DD'))
+                )
+            """, {
+                'cf': cf,
+                'name': name,
+                'surname': surname,
+                'birth': birth
+            })
+            
+            conn.commit()
+            cursor.close()
+            conn.close()
+            mark_write()
+            changes.publish('researchers_tab', cf.strip(), 'I')
+            stats.record_insert('researchers')
+            
+            flash('Researcher added successfully!', 'success')
+            return redirect(url_for('entities.researchers'))
+        except Exception as e:
+            flash(f'Error adding researcher: {str(e)}', 'error')
+    
+    return render_template('add_researcher.html')
+
+# ==================== DISEASES ====================
+@bp.route('/diseases')
+@conditional_get('disease_tab')
+def diseases():
+    """List all diseases"""
+    conn = get_read_connection()
+    cursor = tuned_cursor(conn, 'list')
+    cursor.execute("""
+        SELECT id, name, discovery_date, description
+        FROM disease_tab
+        ORDER BY name
+    """)
+    raw_diseases = cursor.fetchall()
+    
+    # Convert CLOB to string
+    diseases = []
+    for row in raw_diseases:
+        diseases.append((
+            row[0],  # id
+            row[1],  # name
+            row[2],  # discovery_date
+            row[3][:100] if row[3] else 'N/A'  # description (CLOB, fetched as str)
+        ))
+    
+    cursor.close()
+    conn.close()
+    return render_template('diseases.html', diseases=diseases)
+
+@bp.route('/diseases/add', methods=['GET', 'POST'])
+def add_disease():
+    """Add a new disease"""
+    if request.method == 'POST':
+        try:
+            conn = get_db_connection()
+            cursor = tuned_cursor(conn, 'row')
+            
+            # Get next ID
+            cursor.execute("SELECT NVL(MAX(id), 0) + 1 FROM disease_tab")
+            disease_id = cursor.fetchone()[0]
+            
+            name = request.form['name']
+            discovery_date = request.form['discovery_date']
+            description = request.form['description']
+            
+            cursor.execute("""
+                INSERT INTO disease_tab VALUES (
+                    disease_typ(:id, :name, TO_DATE(:discovery_date, 'YYYY-MM-DD'), :description)
+                )
+            """, {
+                'id': disease_id,
+                'name': name,
+                'discovery_date': discovery_date,
+                'description': description
+            })
+            
+            conn.commit()
+            cursor.close()
+            conn.close()
+            mark_write()
+            changes.publish('disease_tab', disease_id, 'I')
+            stats.record_disease(disease_id, name)
+            
+            flash('Disease added successfully!', 'success')
+            return redirect(url_for('entities.diseases'))
+        except Exception as e:
+            flash(f'Error adding disease: {str(e)}', 'error')
+    
+    return render_template('add_disease.html')
+
+# ==================== BIOLOGICAL DATA ====================
+@bp.route('/biological_data')
+@conditional_get('biological_data_tab')
+def biological_data():
+    """List all biological data"""
+    sql = """
+        SELECT b.id, b.name, b.data_type, b.condition, b.is_required, 
+               b.density, b.position, b.donor_cf
+        FROM biological_data_tab {as_of} b
+        WHERE {range}
+        ORDER BY b.id
+    """
+    if parallel_fetch.worthwhile('biological_data_tab'):
+        # Id ranges on several connections; ranges come back in id order
+        bio_data = parallel_fetch.ParallelRows(sql, {}, 'biological_data_tab')
+    else:
+        conn = get_read_connection()
+        cursor = tuned_cursor(conn, 'list')
+        cursor.execute(parallel_fetch.single_sql(sql))
+        bio_data = RowStream(conn, cursor)
+    return render_stream('biological_data.html', bio_data, bio_data=bio_data)
+
+@bp.route('/biological_data/add', methods=['GET', 'POST'])
+def add_biological_data():
+    """Add biological data using the stored procedure"""
+    if request.method == 'POST':
+        try:
+            conn = get_db_connection()
+            cursor = tuned_cursor(conn, 'row')
+            
+            # Get next ID
+            cursor.execute("SELECT NVL(MAX(id), 0) + 1 FROM biological_data_tab")
+            bio_id = cursor.fetchone()[0]
+            
+            # Call the stored procedure
+            cursor.callproc('proc_record_biological_data', [
+                bio_id,
+                request.form['name'],
+                request.form['condition'],
+                request.form['is_required'],
+                request.form['description'],
+                request.form['position'],
+                request.form['data_type'],
+                float(request.form['density']),
+                request.form['donor_cf']
+            ])
+            
+            cursor.close()
+            conn.close()
+            mark_write()
+            changes.publish('biological_data_tab', bio_id, 'I')
+            stats.record_insert('biological_data')
+            density_snapshot.record_insert(
+                bio_id,
+                request.form['name'],
+                request.form['data_type'],
+                float(request.form['density']),
+                request.form['donor_cf'],
+                request.form['is_required'],
+                request.form['condition']
+            )
+            
+            flash('Biological data added successfully!', 'success')
+            return redirect(url_for('entities.biological_data'))
+        except Exception as e:
+            flash(f'Error adding biological data: {str(e)}', 'error')
+    
+    # Get list of donors for dropdown
+    conn = get_read_connection()
+    cursor = tuned_cursor(conn, 'dropdown')
+    cursor.execute("SELECT CF, name, surname FROM donors_tab ORDER BY surname, name")
+    donors = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    
+    return render_template('add_biological_data.html', donors=donors)
+
+# ==================== TREATMENTS ====================
+@bp.route('/treatments')
+@conditional_get('treatment_tab')
+def treatments():
+    """List all treatments"""
+    conn = get_read_connection()
+    cursor = tuned_cursor(conn, 'list')
+    cursor.execute("""
+        SELECT id, name, success_percentage
+        FROM treatment_tab
+        ORDER BY name
+    """)
+    treatments = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return render_template('treatments.html', treatments=treatments)
+
+@bp.route('/treatments/add', methods=['GET', 'POST'])
+def add_treatment():
+    """Add a new treatment"""
+    if request.method == 'POST':
+        try:
+            conn = get_db_connection()
+            cursor = tuned_cursor(conn, 'row')
+            
+            # Get next ID
+            cursor.execute("SELECT NVL(MAX(id), 0) + 1 FROM treatment_tab")
+            treatment_id = cursor.fetchone()[0]
+            
+            name = request.form['name']
+            success_percentage = request.form['success_percentage']
+            
+            cursor.execute("""
+                INSERT INTO treatment_tab VALUES (
+                    treatment_typ(:id, :name, :success_percentage)
+                )
+            """, {
+                'id': treatment_id,
+                'name': name,
+                'success_percentage': success_percentage
+            })
+            
+            conn.commit()
+            cursor.close()
+            conn.close()
+            mark_write()
+            changes.publish('treatment_tab', treatment_id, 'I')
+            stats.record_insert('treatments')
+            
+            flash('Treatment added successfully!', 'success')
+            return redirect(url_for('entities.treatments'))
+        except Exception as e:
+            flash(f'Error adding treatment: {str(e)}', 'error')
+    
+    return render_template('add_treatment.html')
+
+# ==================== DRUGS ====================
+@bp.route('/drugs')
+@conditional_get('drugs_tab')
+def drugs():
+    """List all drugs"""
+    conn = get_read_connection()
+    cursor = tuned_cursor(conn, 'list')
+    cursor.execute("""
+        SELECT id, name, description
+        FROM drugs_tab
+        ORDER BY name
+    """)
+    raw_drugs = cursor.fetchall()
+    
+    # Convert CLOB to string
+    drugs_list = []
+    for row in raw_drugs:
+        drugs_list.append((
+            row[0],  # id
+            row[1],  # name
+            row[2][:100] if row[2] else 'N/A'  # description (CLOB, fetched as str)
+        ))
+    
+    cursor.close()
+    conn.close()
+    return render_template('drugs.html', drugs=drugs_list)
+
+@bp.route('/drugs/add', methods=['GET', 'POST'])
+def add_drug():
+    """Add a new drug"""
+    if request.method == 'POST':
+        try:
+            conn = get_db_connection()
+            cursor = tuned_cursor(conn, 'row')
+            
+            # Get next ID
+            cursor.execute("SELECT NVL(MAX(id), 0) + 1 FROM drugs_tab")
+            drug_id = cursor.fetchone()[0]
+            
+            name = request.form['name']
+            description = request.form['description']
+            
+            cursor.execute("""
+                INSERT INTO drugs_tab VALUES (
+                    drugs_typ(:id, :name, :description)
+                )
+            """, {
+                'id': drug_id,
+                'name': name,
+                'description': description
+            })
+            
+            conn.commit()
+            cursor.close()
+            conn.close()
+            mark_write()
+            changes.publish('drugs_tab', drug_id, 'I')
+            stats.record_insert('drugs')
+            
+            flash('Drug added successfully!', 'success')
+            return redirect(url_for('entities.drugs'))
+        except Exception as e:
+            flash(f'Error adding drug: {str(e)}', 'error')
+    
+    return render_template('add_drug.html')
+
+# ==================== PUBLICATIONS ====================
+@bp.route('/publications')
+@conditional_get('publication_tab')
+def publications():
+    """List all publications"""
+    conn = get_read_connection()
+    cursor = tuned_cursor(conn, 'list')
+    cursor.execute("""
+        SELECT DOI, publisher, quality, title
+        FROM publication_tab
+        ORDER BY title
+    """)
+    publications = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return render_template('publications.html', publications=publications)
+
+@bp.route('/publications/add', methods=['GET', 'POST'])
+def add_publication():
+    """Add a new publication"""
+    if request.method == 'POST':
+        try:
+            conn = get_db_connection()
+            cursor = tuned_cursor(conn, 'row')
+            
+            doi = request.form.get('doi')
+            title = request.form.get('title')
+            quality = request.form.get('quality')
+            publisher = request.form.get('publisher')
+            
+            # publication_typ has (DOI, publisher, quality, title) - NO id, year, journal
+            cursor.execute("""
+                INSERT INTO publication_tab VALUES (
+                    publication_typ(:doi, :publisher, :quality, :title)
+                )
+            """, {
+                'doi': doi,
+                'publisher': publisher,
+                'quality': quality,
+                'title': title
+            })
+            
+            conn.commit()
+            cursor.close()
+            conn.close()
+            mark_write()
+            changes.publish('publication_tab', doi, 'I')
+            stats.record_publication(quality)
+            
+            flash('Publication added successfully!', 'success')
+            return redirect(url_for('entities.publications'))
+        except Exception as e:
+            flash(f'Error adding publication: {str(e)}', 'error')
+    
+    return render_template('add_publication.html')
+
+# ==================== ALLERGIES ====================
+@bp.route('/allergies')
+@conditional_get('allergy_tab')
+def allergies():
+    """List all allergies"""
+    conn = get_read_connection()
+    cursor = tuned_cursor(conn, 'list')
+    cursor.execute("""
+        SELECT id, name
+        FROM allergy_tab
+        ORDER BY name
+    """)
+    allergies = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return render_template('allergies.html', allergies=allergies)
+
+@bp.route('/allergies/add', methods=['GET', 'POST'])
+def add_allergy():
+    """Add a new allergy"""
+    if request.method == 'POST':
+        try:
+            conn = get_db_connection()
+            cursor = tuned_cursor(conn, 'row')
+            
+            # Get next ID
+            cursor.execute("SELECT NVL(MAX(id), 0) + 1 FROM allergy_tab")
+            allergy_id = cursor.fetchone()[0]
+            
+            name = request.form.get('name')
+            
+            # allergy_typ has only (id, name) - NO description
+            cursor.execute("""
+                INSERT INTO allergy_tab VALUES (
+                    allergy_typ(:id, :name)
+                )
+            """, {
+                'id': allergy_id,
+                'name': name
+            })
+            
+            conn.commit()
+            cursor.close()
+            conn.close()
+            mark_write()
+            changes.publish('allergy_tab', allergy_id, 'I')
+            stats.record_insert('allergies')
+            
+            flash('Allergy added successfully!', 'success')
+            return redirect(url_for('entities.allergies'))
+        except Exception as e:
+            flash(f'Error adding allergy: {str(e)}', 'error')
+    
+    return render_template('add_allergy.html')
+
+# ==================== EXPERIMENTS ====================
+@bp.route('/experiments')
+@conditional_get('experiment_tab')
+def experiments():
+    """List all experiments"""
+    sql = """
+        SELECT id, exper_date, is_positive, 
+               SUBSTR(effect_description, 1, 100) as effect_desc,
+               disease_id,
+               treatment_id
+        FROM experiment_tab {as_of}
+        WHERE {range}
+        ORDER BY exper_date DESC
+    """
+    if parallel_fetch.worthwhile('experiment_tab'):
+        # Id ranges on several connections, merged on exper_date (column 1)
+        experiments = parallel_fetch.ParallelRows(sql, {}, 'experiment_tab', order=1, reverse=True)
+    else:
+        conn = get_read_connection()
+        cursor = tuned_cursor(conn, 'list')
+        cursor.execute(parallel_fetch.single_sql(sql))
+        experiments = RowStream(conn, cursor)
+    return render_stream('experiments.html', experiments, experiments=experiments)
+
+@bp.route('/experiments/add', methods=['GET', 'POST'])
+def add_experiment():
+    """Add a new experiment"""
+    if request.method == 'POST':
+        try:
+            conn = get_db_connection()
+            cursor = tuned_cursor(conn, 'row')
+            
+            # Get next ID
+            cursor.execute("SELECT NVL(MAX(id), 0) + 1 FROM experiment_tab")
+            exp_id = cursor.fetchone()[0]
+            
+            exper_date = request.form.get('exper_date')
+            is_positive = request.form.get('is_positive')
+            effect_description = request.form.get('effect_description')
+            disease_id = request.form.get('disease_id')
+            treatment_id = request.form.get('treatment_id')
+            
+            # Insert using subquery to get REFs inline (avoids DPY-3006 error)
+            cursor.execute("""
+                INSERT INTO experiment_tab
+                SELECT experiment_typ(
+                    :id, 
+                    TO_DATE(:exper_date, 'YYYY-MM-DD'), 
+                    :is_positive, 
+                    :effect_description,
+                    (SELECT REF(d) FROM disease_tab d WHERE d.id = :disease_id),
+                    (SELECT REF(t) FROM treatment_tab t WHERE t.id = :treatment_id),
+                    :disease_id,
+                    :treatment_id
+                ) FROM DUAL
+            """, {
+                'id': exp_id,
+                'exper_date': exper_date,
+                'is_positive': is_positive,
+                'effect_description': effect_description,
+                'disease_id': int(disease_id),
+                'treatment_id': int(treatment_id)
+            })
+            
+            conn.commit()
+            cursor.close()
+            conn.close()
+            mark_write()
+            changes.publish('experiment_tab', exp_id, 'I')
+            stats.record_experiment(is_positive)
+            
+            flash('Experiment added successfully!', 'success')
+            return redirect(url_for('entities.experiments'))
+        except Exception as e:
+            flash(f'Error adding experiment: {str(e)}', 'error')
+    
+    # GET request - load diseases and treatments for dropdown
+    conn = get_read_connection()
+    cursor = tuned_cursor(conn, 'dropdown')
+    cursor.execute("SELECT id, name FROM disease_tab ORDER BY name")
+    diseases = cursor.fetchall()
+    cursor.execute("SELECT id, name FROM treatment_tab ORDER BY name")
+    treatments = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    
+    return render_template('add_experiment.html', diseases=diseases, treatments=treatments)
+
+# ==================== FUTURE WORKS ====================
+@bp.route('/future_works')
+@conditional_get('future_work_tab')
+def future_works():
+    """List all future works"""
+    conn = get_read_connection()
+    cursor = tuned_cursor(conn, 'list')
+    cursor.execute("""
+        SELECT f.id, f.title, f.exp_id, f.pub_doi
+        FROM future_work_tab f
+        ORDER BY f.id
+    """)
+    future_works = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return render_template('future_works.html', future_works=future_works)
+
+@bp.route('/future_works/add', methods=['GET', 'POST'])
+def add_future_work():
+    """Add a new future work"""
+    if request.method == 'POST':
+        try:
+            conn = get_db_connection()
+            cursor = tuned_cursor(conn, 'row')
+            
+            # Get next ID
+            cursor.execute("SELECT NVL(MAX(id), 0) + 1 FROM future_work_tab")
+            fw_id = cursor.fetchone()[0]
+            
+            title = request.form.get('title')
+            exp_id = request.form.get('exp_id')
+            pub_doi = request.form.get('pub_doi')
+            
+            # Insert using subquery to get REFs inline (avoids DPY-3006 error)
+            cursor.execute("""
+                INSERT INTO future_work_tab
+                SELECT future_work_typ(
+                    :id, 
+                    :title,
+                    (SELECT REF(e) FROM experiment_tab e WHERE e.id = :exp_id),
+                    (SELECT REF(p) FROM publication_tab p WHERE p.DOI = :pub_doi),
+                    :exp_id,
+                    :pub_doi
+                ) FROM DUAL
+            """, {
+                'id': fw_id,
+                'title': title,
+                'exp_id': int(exp_id),
+                'pub_doi': pub_doi
+            })
+            
+            conn.commit()
+            cursor.close()
+            conn.close()
+            mark_write()
+            changes.publish('future_work_tab', fw_id, 'I')
+            stats.record_insert('future_works')
+            
+            flash('Future work added successfully!', 'success')
+            return redirect(url_for('entities.future_works'))
+        except Exception as e:
+            flash(f'Error adding future work: {str(e)}', 'error')
+    
+    # GET request - load experiments and publications for dropdown
+    conn = get_read_connection()
+    cursor = tuned_cursor(conn, 'dropdown')
+    cursor.execute("SELECT id, exper_date FROM experiment_tab ORDER BY exper_date DESC")
+    experiments = cursor.fetchall()
+    cursor.execute("SELECT DOI, title FROM publication_tab ORDER BY title")
+    publications = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    
+    return render_template('add_future_work.html', experiments=experiments, publications=publications)
@@ -0,0 +1,458 @@
+"""Background jobs for work that must not run in a request thread.
+
+Jobs are kept in a local SQLite file (Config.JOBS_DIR/jobs.sqlite3), so the
+queue survives restarts and is shared by every worker process on the host.
+Each process runs Config.JOBS_WORKERS threads that claim queued jobs one
+at a time; a claim is a single UPDATE inside BEGIN IMMEDIATE, so two
+workers never run the same job.
+
+A job is a kind (a function registered in KINDS) plus JSON parameters. The
+function receives a Job handle to report progress and returns either a
+JSON-serialisable result or the name of a file it wrote in the job
+directory (exports). Finished jobs and their files are deleted after
+Config.JOBS_RETENTION_SECONDS.
+"""
+import csv
+import json
+import os
+import shutil
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+import zipfile
+from datetime import datetime
+
+from config import Config
+from db import get_db_connection, get_read_connection, tuned_cursor
+import stats
+import changes
+import bulk_export
+import batch_ops
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = 'queued', 'running', 'done', 'failed', 'cancelled'
+
+KINDS = {}
+
+_wakeup = threading.Event()
+_workers = []
+_workers_lock = threading.Lock()
+_schema_ready = False
+_schema_lock = threading.Lock()
+# host:pid:token - the token tells this process apart from an earlier one with the same pid (containers)
+_owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class QueueFull(Exception):
+    """Raised by submit() when Config.JOBS_MAX_QUEUED jobs are already waiting"""
+
+
+def job_kind(name):
+    """Register a function as the handler of a job kind"""
+    def decorator(func):
+        KINDS[name] = func
+        return func
+    return decorator
+
+
+def _connect():
+    """Open the job store, creating its schema on the first connection of the process"""
+    global _schema_ready
+    os.makedirs(Config.JOBS_DIR, exist_ok=True)
+    conn = sqlite3.connect(os.path.join(Config.JOBS_DIR, 'jobs.sqlite3'), timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    if not _schema_ready:
+        # Pages and API calls need the table even when this process runs no workers
+        with _schema_lock:
+            if not _schema_ready:
+                _create_schema(conn)
+                _schema_ready = True
+    return conn
+
+
+def _create_schema(conn):
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id          TEXT PRIMARY KEY,
+            kind        TEXT NOT NULL,
+            params      TEXT NOT NULL,
+            status      TEXT NOT NULL,
+            progress    REAL NOT NULL DEFAULT 0,
+            message     TEXT,
+            result      TEXT,
+            result_file TEXT,
+            owner       TEXT,
+            created_at  REAL NOT NULL,
+            started_at  REAL,
+            finished_at REAL
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at)")
+
+
+def _row_to_dict(row):
+    job = dict(row)
+    job['params'] = json.loads(job['params'])
+    job['result'] = json.loads(job['result']) if job['result'] is not None else None
+    return job
+
+
+class Job:
+    """Handle passed to job functions"""
+
+    def __init__(self, job_id, params):
+        self.id = job_id
+        self.params = params
+        self.dir = os.path.join(Config.JOBS_DIR, job_id)
+
+    def progress(self, fraction, message=None):
+        conn = _connect()
+        conn.execute("UPDATE jobs SET progress = ?, message = COALESCE(?, message) WHERE id = ?",
+                     (max(0.0, min(1.0, fraction)), message, self.id))
+        conn.close()
+
+    def path(self, filename):
+        os.makedirs(self.dir, exist_ok=True)
+        return os.path.join(self.dir, filename)
+
+
+def submit(kind, params=None):
+    """Queue a job and return its id"""
+    if kind not in KINDS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    job_id = uuid.uuid4().hex
+    conn = _connect()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        queued = conn.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (QUEUED,)).fetchone()[0]
+        if queued >= Config.JOBS_MAX_QUEUED:
+            conn.execute("ROLLBACK")
+            raise QueueFull(f"{queued} jobs already queued")
+        conn.execute("INSERT INTO jobs (id, kind, params, status, created_at) VALUES (?, ?, ?, ?, ?)",
+                     (job_id, kind, json.dumps(params or {}), QUEUED, time.time()))
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+    _wakeup.set()
+    return job_id
+
+
+def get(job_id):
+    """Return a job as a dict, or None"""
+    conn = _connect()
+    row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    conn.close()
+    return _row_to_dict(row) if row else None
+
+
+def recent(limit=50):
+    conn = _connect()
+    rows = conn.execute("SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+    conn.close()
+    return [_row_to_dict(row) for row in rows]
+
+
+def cancel(job_id):
+    """Cancel a job that has not started yet; returns True if it was cancelled"""
+    conn = _connect()
+    cur = conn.execute("UPDATE jobs SET status = ?, finished_at = ? WHERE id = ? AND status = ?",
+                       (CANCELLED, time.time(), job_id, QUEUED))
+    conn.close()
+    return cur.rowcount == 1
+
+
+def result_path(job):
+    """Absolute path of the file produced by a finished job, or None"""
+    if job is None or not job['result_file']:
+        return None
+    return os.path.join(Config.JOBS_DIR, job['id'], job['result_file'])
+
+
+def _claim():
+    conn = _connect()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute("SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1", (QUEUED,)).fetchone()
+        if row is None:
+            conn.execute("COMMIT")
+            return None
+        conn.execute("UPDATE jobs SET status = ?, owner = ?, started_at = ?, progress = 0 WHERE id = ?",
+                     (RUNNING, _owner, time.time(), row['id']))
+        job = conn.execute("SELECT * FROM jobs WHERE id = ?", (row['id'],)).fetchone()
+        conn.execute("COMMIT")
+        return _row_to_dict(job)
+    finally:
+        conn.close()
+
+
+def _finish(job_id, status, message=None, result=None, result_file=None):
+    conn = _connect()
+    conn.execute("""
+        UPDATE jobs SET status = ?, message = ?, result = ?, result_file = ?, finished_at = ?,
+                        progress = CASE WHEN ? = 'done' THEN 1 ELSE progress END
+        WHERE id = ?
+    """, (status, message, json.dumps(result) if result is not None else None, result_file,
+          time.time(), status, job_id))
+    conn.close()
+
+
+def _requeue_orphans():
+    """Put back jobs left running by a process of this host that no longer exists"""
+    host = socket.gethostname()
+    conn = _connect()
+    for row in conn.execute("SELECT id, owner FROM jobs WHERE status = ?", (RUNNING,)).fetchall():
+        owner_host, pid, _token = ((row['owner'] or '').split(':') + ['', '', ''])[:3]
+        if owner_host != host or not pid.isdigit():
+            continue
+        if int(pid) == os.getpid():
+            orphan = row['owner'] != _owner
+        else:
+            try:
+                os.kill(int(pid), 0)
+                orphan = False
+            except ProcessLookupError:
+                orphan = True
+            except PermissionError:
+                orphan = False
+        if orphan:
+            conn.execute("UPDATE jobs SET status = ?, owner = NULL, started_at = NULL WHERE id = ? AND status = ?",
+                         (QUEUED, row['id'], RUNNING))
+    conn.close()
+
+
+def _purge_expired():
+    cutoff = time.time() - Config.JOBS_RETENTION_SECONDS
+    conn = _connect()
+    expired = conn.execute("SELECT id FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?",
+                           (cutoff,)).fetchall()
+    for row in expired:
+        job_dir = os.path.join(Config.JOBS_DIR, row['id'])
+        # Job directories can hold subdirectories (dump parts); a failure must not stop the purge
+        shutil.rmtree(job_dir, ignore_errors=True)
+        if os.path.exists(job_dir):
+            print(f"Error removing files of expired job {row['id']}, retrying at the next purge: {job_dir}")
+            continue
+        conn.execute("DELETE FROM jobs WHERE id = ?", (row['id'],))
+    conn.close()
+
+
+def _run(job):
+    handle = Job(job['id'], job['params'])
+    try:
+        outcome = KINDS[job['kind']](handle)
+    except Exception as e:
+        print(f"Job {job['id']} ({job['kind']}) failed: {e}")
+        _finish(job['id'], FAILED, message=str(e))
+        return
+    if isinstance(outcome, dict) and 'file' in outcome:
+        _finish(job['id'], DONE, result=outcome, result_file=outcome['file'])
+    else:
+        _finish(job['id'], DONE, result=outcome)
+
+
+def _worker():
+    last_purge = 0
+    while True:
+        try:
+            if time.time() - last_purge > 60:
+                _purge_expired()
+                last_purge = time.time()
+            job = _claim()
+        except Exception as e:
+            print(f"Error reading job queue: {e}")
+            job = None
+        if job is None:
+            _wakeup.wait(Config.JOBS_POLL_SECONDS)
+            _wakeup.clear()
+            continue
+        _run(job)
+
+
+def start_workers():
+    """Start the worker threads of this process (once)"""
+    with _workers_lock:
+        if _workers or Config.JOBS_WORKERS <= 0:
+            return
+        _requeue_orphans()
+        for i in range(Config.JOBS_WORKERS):
+            thread = threading.Thread(target=_worker, name=f'job-worker-{i}', daemon=True)
+            thread.start()
+            _workers.append(thread)
+
+
+# ==================== JOB KINDS ====================
+
+def _query_result(cursor, sql, binds=None):
+    cursor.execute(sql, binds or {})
+    columns = [d[0].lower() for d in cursor.description]
+    rows = [[value.isoformat() if hasattr(value, 'isoformat') else value for value in row]
+            for row in cursor.fetchall()]
+    return {'columns': columns, 'rows': rows}
+
+
+@job_kind('op2')
+def _job_op2(job):
+    conn = get_read_connection()
+    try:
+        return _query_result(tuned_cursor(conn, 'export'), "SELECT * FROM TABLE(func_list_bio_below_density(:threshold))",
+                             {'threshold': float(job.params['threshold'])})
+    finally:
+        conn.close()
+
+
+def _batch_result(operation, ids):
+    """Rows of the batch procedure of operation 3 or 4 for many ids, in one execution"""
+    conn = get_read_connection()
+    try:
+        cursor = batch_ops.execute(conn, operation, batch_ops.parse_ids(ids))
+        columns = [d[0].lower() for d in cursor.description]
+        rows = [list(row) for row in cursor.fetchall()]
+        cursor.close()
+        return {'columns': columns, 'rows': rows}
+    finally:
+        conn.close()
+
+
+@job_kind('op3')
+def _job_op3(job):
+    """One treatment (treatment_id) or many in one execution (treatment_ids: list or "1,2,3")"""
+    if 'treatment_ids' in job.params:
+        return _batch_result('op3', job.params['treatment_ids'])
+    conn = get_read_connection()
+    try:
+        return _query_result(tuned_cursor(conn, 'export'), "SELECT * FROM TABLE(func_get_treatment_info(:treatment_id))",
+                             {'treatment_id': int(job.params['treatment_id'])})
+    finally:
+        conn.close()
+
+
+@job_kind('op4')
+def _job_op4(job):
+    """One disease (disease_id) or many in one execution (disease_ids: list or "1,2,3")"""
+    if 'disease_ids' in job.params:
+        return _batch_result('op4', job.params['disease_ids'])
+    conn = get_read_connection()
+    try:
+        return _query_result(tuned_cursor(conn, 'export'), "SELECT * FROM TABLE(func_list_donors_required_disease_with_fw(:disease_id))",
+                             {'disease_id': int(job.params['disease_id'])})
+    finally:
+        conn.close()
+
+
+@job_kind('op5')
+def _job_op5(job):
+    conn = get_read_connection()
+    try:
+        return _query_result(tuned_cursor(conn, 'export'), "SELECT * FROM TABLE(func_list_fw_for_top_researchers())")
+    finally:
+        conn.close()
+
+
+@job_kind('export')
+def _job_export(job):
+    """Export one of the stats.TABLES entities to CSV"""
+    entity = job.params['entity']
+    if entity not in stats.TABLES:
+        raise ValueError(f"Unknown entity: {entity}")
+    table = stats.TABLES[entity]
+    conn = get_read_connection()
+    try:
+        cursor = tuned_cursor(conn, 'export')
+        cursor.execute(f"SELECT COUNT(*) FROM {table}")
+        total = cursor.fetchone()[0] or 1
+        # Object tables: export the scalar attributes (REF and BLOB columns left out;
+        # CLOBs arrive as str through the connection's output type handler)
+        cursor.execute("""
+            SELECT column_name FROM user_tab_columns
+            WHERE table_name = :t
+              AND NVL(data_type_mod, '-') <> 'REF'
+              AND data_type <> 'BLOB'
+            ORDER BY column_id
+        """, {'t': table.upper()})
+        columns = [row[0] for row in cursor.fetchall()]
+        cursor.execute(f"SELECT {', '.join(columns)} FROM {table}")
+        filename = f'{entity}.csv'
+        written = 0
+        with open(job.path(filename), 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow([c.lower() for c in columns])
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    break
+                writer.writerows(rows)
+                written += len(rows)
+                job.progress(written / total, f'{written} rows written')
+        cursor.close()
+    finally:
+        conn.close()
+    return {'file': filename, 'rows': written}
+
+
+@job_kind('populate')
+def _job_populate(job):
+    """Run PopulateDatabase (sql/insert_auto.sql) with the given sizes"""
+    names = ('donors', 'researchers', 'diseases', 'drugs', 'allergies', 'publications',
+             'treatments', 'experiments', 'biological_data', 'future_works')
+    sizes = [int(job.params.get(name, 0)) for name in names]
+    conn = get_db_connection()
+    try:
+        job.progress(0, 'PopulateDatabase running')
+        conn.cursor().callproc('PopulateDatabase', sizes)
+        conn.commit()
+        stats.refresh(conn)
+    finally:
+        conn.close()
+    for table in stats.TABLES.values():
+        changes.publish(table, op='I')
+    return dict(zip(names, sizes))
+
+
+@job_kind('dump')
+def _job_dump(job):
+    """Export every table to Parquet/Arrow (bulk_export.py), zipped for download"""
+    out_dir = job.path('dump')
+    since = job.params.get('since')
+    since_scn = job.params.get('since_scn')
+    manifest = bulk_export.export_all(
+        out_dir,
+        job.params.get('format', 'parquet'),
+        since_scn=int(since_scn) if since_scn not in (None, '') else None,
+        since=datetime.fromisoformat(since) if since else None,
+        progress=lambda fraction, message: job.progress(fraction * 0.95, message),
+    )
+    job.progress(0.95, 'Compressing')
+    # Parquet parts are already compressed: store them as they are
+    with zipfile.ZipFile(job.path('dump.zip'), 'w', zipfile.ZIP_STORED) as archive:
+        for root, _dirs, files in os.walk(out_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                archive.write(path, os.path.relpath(path, out_dir))
+    shutil.rmtree(out_dir)
+    return {
+        'file': 'dump.zip',
+        'scn': manifest['scn'],
+        'since_scn': manifest['since_scn'],
+        'rows': {table: entry['rows'] for table, entry in manifest['tables'].items()},
+    }
+
+
+@job_kind('dw_load')
+def _job_dw_load(job):
+    """Run the data warehouse load (sql/dw_etl.sql)"""
+    full = 'Y' if job.params.get('full') else 'N'
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        job.progress(0, 'proc_dw_load running')
+        cursor.callproc('proc_dw_load', [full])
+        cursor.execute("""
+            SELECT load_id, rows_loaded FROM dw_etl_run
+            WHERE load_id = (SELECT MAX(load_id) FROM dw_etl_run WHERE status = 'OK')
+        """)
+        row = cursor.fetchone()
+    finally:
+        conn.close()
+    return {'load_id': row[0], 'rows_loaded': row[1]} if row else {}
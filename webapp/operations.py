@@ -0,0 +1,449 @@
+"""Operations 2-5 and the background job pages"""
+from flask import Blueprint, current_app, render_template, request, redirect, url_for, flash, jsonify, send_file, abort
+import oracledb
+import json
+import os
+from config import Config
+from db import RowStream, get_read_connection, error_message, is_timeout, tuned_cursor
+import batch_ops
+import allergy_index
+import research_graph
+import stats
+import density_snapshot
+from conditional import conditional_get
+import jobs
+import parallel_fetch
+
+bp = Blueprint('operations', __name__)
+
+# ==================== OPERATIONS ====================
+@bp.route('/operations')
+def operations():
+    """Operations page"""
+    return render_template('operations.html')
+
+@bp.route('/operations/op2', methods=['GET', 'POST'])
+def operation_2():
+    """Operation 2: List organs/tissues below density threshold"""
+    results = None
+    threshold = ''
+    
+    if request.method == 'POST':
+        try:
+            threshold = request.form.get('threshold', '')
+            
+            if not threshold:
+                flash('Please enter a threshold value', 'error')
+                return render_template('operation_2.html', results=None, threshold='',
+                                       histogram=density_snapshot.histogram())
+                
+            threshold_val = float(threshold)
+
+            # Answered from the in-memory snapshot when it is loaded
+            results = density_snapshot.below(threshold_val)
+            if results is None and parallel_fetch.worthwhile('biological_data_tab'):
+                # Same query as func_list_bio_below_density, split into id ranges
+                rows = parallel_fetch.ParallelRows("""
+                    SELECT id, name, data_type, density, donor_cf, is_required, condition
+                    FROM biological_data_tab {as_of}
+                    WHERE density < :threshold AND {range}
+                """, {'threshold': threshold_val}, 'biological_data_tab')
+                results = list(rows)
+            elif results is None:
+                conn = get_read_connection()
+                cursor = tuned_cursor(conn, 'list')
+                
+                # Call pipelined table function
+                cursor.execute("""
+                    SELECT * FROM TABLE(func_list_bio_below_density(:threshold))
+                """, {'threshold': threshold_val})
+                
+                results = cursor.fetchall()
+                
+                cursor.close()
+                conn.close()
+        except oracledb.Error as e:
+            flash(error_message(e), 'error')
+        except Exception as e:
+            flash(f'Error executing operation: {str(e)}', 'error')
+    
+    return render_template('operation_2.html', results=results, threshold=threshold,
+                           histogram=density_snapshot.histogram())
+
+@bp.route('/api/op2/estimate')
+def api_op2_estimate():
+    """Number of rows operation 2 would return, from the in-memory snapshot"""
+    threshold = request.args.get('threshold', type=float)
+    if threshold is None:
+        return jsonify({'error': 'threshold is required'}), 400
+    return jsonify({
+        'threshold': threshold,
+        'rows': density_snapshot.estimate(threshold),
+        'snapshot': density_snapshot.status()
+    })
+
+@bp.route('/operations/op3', methods=['GET', 'POST'])
+def operation_3():
+    """Operation 3: Get treatment info with drugs and allergies"""
+    results = None
+    treatment_id = ''
+    treatments = []
+    
+    # Get list of treatments for dropdown
+    try:
+        conn = get_read_connection()
+        cursor = tuned_cursor(conn, 'dropdown')
+        cursor.execute("SELECT id, name FROM treatment_tab ORDER BY name")
+        treatments = cursor.fetchall()
+        cursor.close()
+        conn.close()
+    except Exception as e:
+        flash(f'Error loading treatments: {str(e)}', 'error')
+    
+    if request.method == 'POST':
+        try:
+            treatment_id = request.form.get('treatment_id', '')
+            
+            if not treatment_id:
+                flash('Please select a treatment', 'error')
+                return render_template('operation_3.html', results=None, treatments=treatments, treatment_id='')
+                
+            treatment_id_val = int(treatment_id)
+            conn = get_read_connection()
+            cursor = tuned_cursor(conn, 'list')
+            
+            # Call pipelined table function
+            cursor.execute("""
+                SELECT * FROM TABLE(func_get_treatment_info(:treatment_id))
+            """, {'treatment_id': treatment_id_val})
+            
+            results = cursor.fetchall()
+            
+            cursor.close()
+            conn.close()
+        except oracledb.Error as e:
+            flash(error_message(e), 'error')
+        except Exception as e:
+            flash(f'Error executing operation: {str(e)}', 'error')
+    
+    return render_template('operation_3.html', results=results, treatments=treatments, treatment_id=treatment_id)
+
+@bp.route('/operations/op4', methods=['GET', 'POST'])
+def operation_4():
+    """Operation 4: Donors with disease affecting required organs with future works"""
+    results = None
+    disease_id = ''
+    diseases = []
+    
+    # Get list of diseases for dropdown
+    try:
+        conn = get_read_connection()
+        cursor = tuned_cursor(conn, 'dropdown')
+        cursor.execute("SELECT id, name FROM disease_tab ORDER BY name")
+        diseases = cursor.fetchall()
+        cursor.close()
+        conn.close()
+    except Exception as e:
+        flash(f'Error loading diseases: {str(e)}', 'error')
+    
+    if request.method == 'POST':
+        try:
+            disease_id = request.form.get('disease_id', '')
+            
+            if not disease_id:
+                flash('Please select a disease', 'error')
+                return render_template('operation_4.html', results=None, diseases=diseases, disease_id='')
+                
+            disease_id_val = int(disease_id)
+            conn = get_read_connection()
+            cursor = tuned_cursor(conn, 'list')
+            
+            # Call pipelined table function
+            cursor.execute("""
+                SELECT * FROM TABLE(func_list_donors_required_disease_with_fw(:disease_id))
+            """, {'disease_id': disease_id_val})
+            
+            results = cursor.fetchall()
+            
+            cursor.close()
+            conn.close()
+        except oracledb.Error as e:
+            flash(error_message(e), 'error')
+        except Exception as e:
+            flash(f'Error executing operation: {str(e)}', 'error')
+    
+    return render_template('operation_4.html', results=results, diseases=diseases, disease_id=disease_id)
+
+def _stream_batch(operation, ids, fmt):
+    """Streamed JSON (or NDJSON) of the batch results, one group per requested id"""
+    conn = get_read_connection()
+    try:
+        rows = RowStream(conn, batch_ops.execute(conn, operation, ids))
+    except Exception:
+        conn.close()
+        raise
+    groups = batch_ops.GROUPS[operation](ids, rows)
+
+    def generate():
+        if fmt == 'ndjson':
+            for group in groups:
+                yield json.dumps(group, default=str) + '\n'
+            return
+        yield '{"operation": %s, "ids": %d, "results": [' % (json.dumps(operation), len(ids))
+        for i, group in enumerate(groups):
+            yield (',' if i else '') + json.dumps(group, default=str)
+        yield ']}'
+
+    mimetype = 'application/x-ndjson' if fmt == 'ndjson' else 'application/json'
+    response = current_app.response_class(generate(), mimetype=mimetype)
+    response.call_on_close(rows.close)
+    return response
+
+def _batch(operation, field):
+    """Batch endpoint body: ids from ?ids=1,2,3 or JSON {"ids": [...]} (or {field: [...]})"""
+    if request.is_json:
+        body = request.get_json(silent=True) or {}
+        value = body.get('ids', body.get(field))
+        fmt = body.get('format', request.args.get('format', 'json'))
+    else:
+        value = request.values.get('ids', request.values.get(field))
+        fmt = request.values.get('format', 'json')
+    if value is None:
+        return jsonify({'error': 'ids is required'}), 400
+    try:
+        ids = batch_ops.parse_ids(value)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    try:
+        return _stream_batch(operation, ids, fmt)
+    except oracledb.Error as e:
+        return jsonify({'error': error_message(e)}), 504 if is_timeout(e) else 500
+
+@bp.route('/api/op3/batch', methods=['GET', 'POST'])
+def api_op3_batch():
+    """Operation 3 for many treatments in one execution, grouped by treatment id"""
+    return _batch('op3', 'treatment_ids')
+
+@bp.route('/api/op4/batch', methods=['GET', 'POST'])
+def api_op4_batch():
+    """Operation 4 for many diseases in one execution, grouped by disease id"""
+    return _batch('op4', 'disease_ids')
+
+@bp.route('/api/allergy_risk/<int:treatment_id>')
+def api_allergy_risk(treatment_id):
+    """Allergies a treatment can trigger through its drugs, from the in-memory index"""
+    allergy_ids = allergy_index.allergies_of(treatment_id)
+    if allergy_ids is not None:
+        _, allergy_names = allergy_index.names()
+        allergies = [{'id': a, 'name': allergy_names.get(a)} for a in allergy_ids]
+        source = 'index'
+    else:
+        conn = get_read_connection()
+        try:
+            cursor = tuned_cursor(conn, 'dropdown')
+            cursor.execute("""
+                SELECT DISTINCT t.id, al.id, al.name
+                FROM treatment_tab t
+                LEFT JOIN assign_tab a ON a.treatment_id = t.id
+                LEFT JOIN cause_tab c ON c.drug_id = a.drug_id
+                LEFT JOIN allergy_tab al ON al.id = c.allergy_id
+                WHERE t.id = :treatment_id
+                ORDER BY al.id
+            """, {'treatment_id': treatment_id})
+            rows = cursor.fetchall()
+            cursor.close()
+        finally:
+            conn.close()
+        if not rows:
+            return jsonify({'error': 'Treatment not found'}), 404
+        allergies = [{'id': row[1], 'name': row[2]} for row in rows if row[1] is not None]
+        source = 'database'
+    return jsonify({'treatment_id': treatment_id, 'allergies': allergies, 'source': source})
+
+@bp.route('/api/safe_treatments')
+def api_safe_treatments():
+    """Treatments that cannot trigger any of the allergies in ?avoid=1,2,3"""
+    try:
+        avoid = batch_ops.parse_ids(request.args.get('avoid', ''))
+    except ValueError as e:
+        return jsonify({'error': f'avoid: {e}'}), 400
+    treatment_ids = allergy_index.treatments_avoiding(avoid)
+    if treatment_ids is not None:
+        treatment_names, _ = allergy_index.names()
+        treatments = [{'id': t, 'name': treatment_names.get(t)} for t in treatment_ids]
+        source = 'index'
+    else:
+        conn = get_read_connection()
+        try:
+            cursor = tuned_cursor(conn, 'list')
+            cursor.execute("""
+                SELECT t.id, t.name
+                FROM treatment_tab t
+                WHERE NOT EXISTS (
+                    SELECT 1
+                    FROM assign_tab a
+                    JOIN cause_tab c ON c.drug_id = a.drug_id
+                    WHERE a.treatment_id = t.id
+                      AND c.allergy_id IN (SELECT column_value FROM TABLE(:avoid))
+                )
+                ORDER BY t.id
+            """, {'avoid': batch_ops.id_list(conn, avoid)})
+            treatments = [{'id': row[0], 'name': row[1]} for row in cursor]
+            cursor.close()
+        finally:
+            conn.close()
+        source = 'database'
+    return jsonify({'avoid': avoid, 'count': len(treatments), 'treatments': treatments, 'source': source})
+
+@bp.route('/operations/op5')
+@conditional_get('writes_tab', 'publication_tab', 'consider_tab', 'researchers_tab', 'future_work_tab')
+def operation_5():
+    """Operation 5: Future works for top researchers"""
+    # Answered from the in-memory research graph when it is loaded
+    results = research_graph.op5()
+    if results is not None:
+        return render_template('operation_5.html', results=results)
+    try:
+        conn = get_read_connection()
+        cursor = tuned_cursor(conn, 'list')
+        
+        # Call pipelined table function
+        cursor.execute("SELECT * FROM TABLE(func_list_fw_for_top_researchers())")
+        results = cursor.fetchall()
+        
+        cursor.close()
+        conn.close()
+    except oracledb.Error as e:
+        flash(error_message(e), 'error')
+    except Exception as e:
+        flash(f'Error executing operation: {str(e)}', 'error')
+    
+    return render_template('operation_5.html', results=results)
+
+# ==================== RESEARCH GRAPH ====================
+def _graph_result(result, **body):
+    if result is None:
+        return jsonify({'error': 'Research graph not loaded', 'graph': research_graph.status()}), 503
+    return jsonify(body)
+
+@bp.route('/api/researchers/<cf>/coauthors')
+def api_coauthors(cf):
+    """Co-authors of a researcher with the number of shared publications"""
+    limit = request.args.get('limit', 50, type=int)
+    try:
+        result = research_graph.coauthors(cf, limit)
+    except KeyError:
+        return jsonify({'error': 'Researcher not found'}), 404
+    return _graph_result(result, cf=cf, coauthors=result)
+
+@bp.route('/api/researchers/<cf>/neighborhood')
+def api_neighborhood(cf):
+    """Researchers within ?hops= co-authorship steps, nearest first"""
+    hops = min(max(request.args.get('hops', 2, type=int), 1), Config.RESEARCH_GRAPH_MAX_HOPS)
+    limit = request.args.get('limit', 100, type=int)
+    try:
+        result = research_graph.neighborhood(cf, hops, limit)
+    except KeyError:
+        return jsonify({'error': 'Researcher not found'}), 404
+    if result is None:
+        return _graph_result(None)
+    researchers, reached = result
+    return jsonify({'cf': cf, 'hops': hops, 'reached': reached, 'researchers': researchers})
+
+@bp.route('/api/researchers/distance')
+def api_distance():
+    """Co-authorship hops between ?from= and ?to= (-1 if farther than max_hops)"""
+    cf_from, cf_to = request.args.get('from', ''), request.args.get('to', '')
+    max_hops = min(max(request.args.get('max_hops', 6, type=int), 1), Config.RESEARCH_GRAPH_MAX_HOPS)
+    try:
+        hops = research_graph.distance(cf_from, cf_to, max_hops)
+    except KeyError as e:
+        return jsonify({'error': f'Researcher not found: {e.args[0]}'}), 404
+    return _graph_result(hops, **{'from': cf_from, 'to': cf_to, 'max_hops': max_hops, 'hops': hops})
+
+@bp.route('/api/researchers/ranking')
+def api_ranking():
+    """Top researchers by ?by=pagerank|publications|top_publications"""
+    by = request.args.get('by', 'pagerank')
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 1000)
+    try:
+        result = research_graph.ranking(by, limit)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return _graph_result(result, by=by, researchers=result)
+
+@bp.route('/api/research_graph')
+def api_research_graph():
+    """Size and state of the in-memory research graph"""
+    return jsonify(research_graph.status())
+
+# ==================== BACKGROUND JOBS ====================
+@bp.route('/jobs')
+def jobs_list():
+    """Recent background jobs and submission forms"""
+    return render_template('jobs.html', jobs=jobs.recent(), kinds=sorted(jobs.KINDS),
+                           entities=list(stats.TABLES))
+
+@bp.route('/jobs', methods=['POST'])
+def submit_job():
+    """Queue a background job (form post or JSON {"kind": ..., "params": {...}})"""
+    if request.is_json:
+        body = request.get_json(silent=True) or {}
+        kind, params = body.get('kind'), body.get('params') or {}
+    else:
+        kind = request.form.get('kind')
+        params = {key: value for key, value in request.form.items() if key != 'kind' and value != ''}
+
+    try:
+        job_id = jobs.submit(kind, params)
+    except jobs.QueueFull as e:
+        if request.is_json:
+            return jsonify({'error': f'Job queue is full: {e}'}), 503
+        flash(f'Job queue is full, try again later ({e})', 'error')
+        return redirect(url_for('operations.jobs_list'))
+    except ValueError as e:
+        if request.is_json:
+            return jsonify({'error': str(e)}), 400
+        flash(str(e), 'error')
+        return redirect(url_for('operations.jobs_list'))
+
+    if request.is_json:
+        status_url = url_for('operations.api_job', job_id=job_id)
+        return jsonify({'id': job_id, 'status': jobs.QUEUED, 'status_url': status_url}), 202, {'Location': status_url}
+    flash('Job queued', 'success')
+    return redirect(url_for('operations.job_status', job_id=job_id))
+
+@bp.route('/jobs/<job_id>')
+def job_status(job_id):
+    """Status and result of a background job"""
+    job = jobs.get(job_id)
+    if job is None:
+        abort(404)
+    return render_template('job.html', job=job)
+
+@bp.route('/api/jobs/<job_id>')
+def api_job(job_id):
+    """Status and result of a background job as JSON"""
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    if job['result_file']:
+        job['download_url'] = url_for('operations.job_download', job_id=job_id)
+    return jsonify(job)
+
+@bp.route('/jobs/<job_id>/download')
+def job_download(job_id):
+    """File produced by a finished job (exports)"""
+    path = jobs.result_path(jobs.get(job_id))
+    if path is None or not os.path.exists(path):
+        abort(404)
+    return send_file(path, as_attachment=True)
+
+@bp.route('/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Cancel a job that has not started yet"""
+    if jobs.cancel(job_id):
+        flash('Job cancelled', 'success')
+    else:
+        flash('Only queued jobs can be cancelled', 'error')
+    return redirect(url_for('operations.job_status', job_id=job_id))
@@ -0,0 +1,277 @@
+"""Parallel chunked fetch of one large query.
+
+A query over biological_data_tab or experiment_tab can be split into
+disjoint ranges of the table's id. Each range runs as its own statement on
+its own pooled connection, in a thread pool. The rows are merged back into
+one stream, either range after range (ranges are in id order) or with a
+k-way merge on a sort column when the query has its own ORDER BY.
+
+Range boundaries come from optimizer statistics: the id histogram in
+USER_TAB_HISTOGRAMS when it has enough buckets, otherwise an even split of
+MIN(id)..MAX(id). The first and last ranges are open-ended, so rows
+inserted after the statistics were gathered are still covered.
+
+Connections for ranges are reserved from a process-wide budget
+(Config.PARALLEL_FETCH_MAX_CONNECTIONS) without waiting. A query that finds
+the budget exhausted runs with fewer ranges, down to a single cursor, so
+concurrent requests can never deadlock on the pool.
+
+The database and the snapshot are chosen once, in the calling thread: its
+read routing picks the DSN (the primary after a recent write of the
+session, else a replica) and the current SCN is read there. Every range
+connects to that DSN and reads its table AS OF that SCN, as bulk_export.py
+does, so the merged rows are one consistent snapshot.
+"""
+import heapq
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import has_request_context, request
+
+from config import Config
+from db import get_read_connection, get_read_connection_with_dsn, tuned_cursor
+
+# Tables that can be split, and the numeric key used for the ranges
+SPLIT_KEYS = {
+    'biological_data_tab': 'id',
+    'experiment_tab': 'id',
+}
+
+_STATS_TTL = 300
+# Boundaries are kept for this many ranges and merged down to the degree of each query
+_STATS_PARTS = 64
+_stats_cache = {}   # table -> (expires_at, num_rows, boundaries for _STATS_PARTS ranges)
+_stats_lock = threading.Lock()
+_budget = threading.BoundedSemaphore(max(1, Config.PARALLEL_FETCH_MAX_CONNECTIONS))
+
+_DONE = object()
+
+
+def _load_stats(table, key, parts):
+    """Return (num_rows, sorted inner boundaries splitting the key into parts ranges)"""
+    conn = get_read_connection()
+    try:
+        cursor = tuned_cursor(conn, 'dropdown')
+        cursor.execute("SELECT num_rows FROM user_tables WHERE table_name = :t", {'t': table.upper()})
+        row = cursor.fetchone()
+        num_rows = row[0] if row and row[0] is not None else 0
+        cursor.execute("""
+            SELECT endpoint_number, endpoint_value
+            FROM user_tab_histograms
+            WHERE table_name = :t AND column_name = :c
+            ORDER BY endpoint_number
+        """, {'t': table.upper(), 'c': key.upper()})
+        endpoints = cursor.fetchall()
+        if len(endpoints) > parts:
+            # Endpoints are (cumulative bucket, value): take the values closest to each 1/parts quantile
+            last = endpoints[-1][0]
+            boundaries = []
+            for i in range(1, parts):
+                target = last * i / parts
+                boundaries.append(next(value for number, value in endpoints if number >= target))
+        else:
+            cursor.execute(f"SELECT MIN({key}), MAX({key}) FROM {table}")
+            low, high = cursor.fetchone()
+            if low is None:
+                boundaries = []
+            else:
+                step = (high - low) / parts
+                boundaries = [low + step * i for i in range(1, parts)]
+        cursor.close()
+    finally:
+        conn.close()
+    return num_rows, sorted(set(boundaries))
+
+
+def _stats(table):
+    now = time.time()
+    cached = _stats_cache.get(table)
+    if cached is None or cached[0] < now:
+        with _stats_lock:
+            cached = _stats_cache.get(table)
+            if cached is None or cached[0] < now:
+                num_rows, boundaries = _load_stats(table, SPLIT_KEYS[table], _STATS_PARTS)
+                cached = (now + _STATS_TTL, num_rows, boundaries)
+                _stats_cache[table] = cached
+    return cached[1], cached[2]
+
+
+def worthwhile(table, expected_rows=None):
+    """True when a query over table returning expected_rows (default: the whole table) should be split"""
+    if table not in SPLIT_KEYS or Config.PARALLEL_FETCH_DEGREE <= 1:
+        return False
+    try:
+        num_rows, _ = _stats(table)
+    except Exception as e:
+        print(f"Error reading statistics of {table}, fetching serially: {e}")
+        return False
+    rows = num_rows if expected_rows is None else expected_rows
+    return rows >= Config.PARALLEL_FETCH_MIN_ROWS
+
+
+def single_sql(sql):
+    """sql of a ParallelRows query for a single cursor: no range, current data"""
+    return sql.format(range='1 = 1', as_of='')
+
+
+def _range_predicates(key, boundaries):
+    """SQL predicates and binds for the ranges (-inf, b1), [b1, b2), ..., [bn, +inf)"""
+    if not boundaries:
+        return [('1 = 1', {})]
+    predicates = [(f'{key} < :range_high', {'range_high': boundaries[0]})]
+    for low, high in zip(boundaries, boundaries[1:]):
+        predicates.append((f'{key} >= :range_low AND {key} < :range_high', {'range_low': low, 'range_high': high}))
+    predicates.append((f'{key} >= :range_low', {'range_low': boundaries[-1]}))
+    return predicates
+
+
+def _merge_boundaries(boundaries, parts):
+    """Keep parts ranges out of the precomputed ones by dropping boundaries evenly"""
+    if parts >= len(boundaries) + 1:
+        return boundaries
+    if parts <= 1:
+        return []
+    step = (len(boundaries) + 1) / parts
+    return [boundaries[round(step * i) - 1] for i in range(1, parts)]
+
+
+def _snapshot():
+    """Return (dsn, scn): the database the current read goes to and its current SCN"""
+    conn, dsn = get_read_connection_with_dsn()
+    try:
+        cursor = tuned_cursor(conn, 'row')
+        cursor.execute("SELECT DBMS_FLASHBACK.GET_SYSTEM_CHANGE_NUMBER FROM DUAL")
+        scn = cursor.fetchone()[0]
+        cursor.close()
+    finally:
+        conn.close()
+    return dsn, scn
+
+
+class ParallelRows:
+    """Rows of sql over table, fetched by key range on several connections and merged.
+
+    sql must contain a {range} placeholder inside its WHERE clause; it is
+    replaced by each range's predicate on the table's key. An {as_of}
+    placeholder after the table name (before its alias) becomes the
+    AS OF SCN clause of the snapshot. With order=None
+    rows come range after range; with order=i they are k-way merged on
+    column i (reverse=True for a descending ORDER BY, which sql must have).
+    NULLs of that column merge as Oracle sorts them: last ascending, first
+    descending.
+
+    Same interface as db.RowStream: truthiness, iteration and close(), so
+    it can be passed to render_stream. The first row is fetched by the
+    constructor, so errors surface where the query is issued.
+    """
+
+    def __init__(self, sql, binds, table, order=None, reverse=False, degree=None):
+        degree = max(1, degree or Config.PARALLEL_FETCH_DEGREE)
+        self._dsn, scn = _snapshot()
+        binds = dict(binds, as_of_scn=scn)
+        reserved = 0
+        while reserved < degree and _budget.acquire(blocking=False):
+            reserved += 1
+        self._stop = threading.Event()
+        self._closed = False
+        self._timeout = Config.get_query_timeout(request.endpoint) if has_request_context() else 0
+
+        _, boundaries = _stats(table)
+        if reserved == 0:
+            boundaries = []
+        ranges = _range_predicates(SPLIT_KEYS[table], _merge_boundaries(boundaries, max(1, reserved)))
+        self.ranges = len(ranges)
+        for _ in range(reserved - len(ranges)):
+            # Fewer boundaries than reserved connections: give the spare slots back
+            _budget.release()
+        self._queues = [queue.Queue(maxsize=4) for _ in ranges]
+        self._pool = ThreadPoolExecutor(max_workers=len(ranges), thread_name_prefix='parallel-fetch')
+        futures = [self._pool.submit(self._run_range, sql.format(range=predicate, as_of='AS OF SCN :as_of_scn'),
+                                     dict(binds, **range_binds), self._queues[i], i < reserved)
+                   for i, (predicate, range_binds) in enumerate(ranges)]
+
+        streams = [self._range_rows(q, future) for q, future in zip(self._queues, futures)]
+        if order is None:
+            self._rows = (row for stream in streams for row in stream)
+        else:
+            # NULL is the largest value, as in Oracle's default NULLS LAST / DESC NULLS FIRST
+            self._rows = heapq.merge(*streams, key=lambda row: (row[order] is None, row[order]), reverse=reverse)
+        try:
+            self._first = next(self._rows, None)
+        except Exception:
+            self.close()
+            raise
+        if self._first is None:
+            self.close()
+
+    def _put(self, q, item):
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run_range(self, sql, binds, q, slot):
+        try:
+            if self._stop.is_set():
+                return
+            conn = get_read_connection(self._dsn)
+            try:
+                conn.call_timeout = int(self._timeout * 1000)
+                cursor = tuned_cursor(conn, 'export')
+                cursor.execute(sql, binds)
+                while not self._stop.is_set():
+                    rows = cursor.fetchmany()
+                    if not rows or not self._put(q, rows):
+                        break
+                cursor.close()
+            finally:
+                conn.close()
+            self._put(q, _DONE)
+        except Exception as e:
+            self._put(q, e)
+        finally:
+            if slot:
+                _budget.release()
+
+    def _range_rows(self, q, future):
+        while True:
+            try:
+                item = q.get(timeout=0.5)
+            except queue.Empty:
+                if self._stop.is_set():
+                    return
+                if future.done() and q.empty():
+                    # Everything a worker queues is queued before it ends
+                    raise future.exception() or RuntimeError('range fetch ended without its rows')
+                continue
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield from item
+
+    def __bool__(self):
+        return self._first is not None
+
+    def __iter__(self):
+        if self._first is None:
+            return
+        try:
+            yield self._first
+            if not self._closed:
+                yield from self._rows
+        finally:
+            self.close()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        # Workers see the flag between round trips, close their cursor and give back their connection and slot
+        self._stop.set()
+        self._pool.shutdown(wait=False)
@@ -0,0 +1,305 @@
+"""Execution-plan regression check for operations 2-5 and the hot list queries.
+
+For every case below the script captures the optimizer plan (EXPLAIN PLAN
+into PLAN_TABLE) and runtime statistics (rows, best elapsed time and the
+session logical reads of that run, from V$MYSTAT), then compares them with
+the stored baselines in plan_baselines.json:
+
+- plan shape: the tree of operations and the objects they access must match;
+- index usage: every index the baseline used must still be used, and the
+  indexes a case requires (idx_bd_density for op2, idx_aff_dis_bio for op4,
+  idx_pub_quality for op5) must be used even without a baseline;
+- buffer gets: logical reads may not grow by more than --tolerance
+  (default 50%) and --min-gets over the baseline.
+
+Elapsed times are reported but never fail the check. Operations 2-5 are
+checked through the queries of the proc_* procedures in sql/operations.sql,
+since a procedure call has no plan of its own; biological_data_range is one
+id range of parallel_fetch.py.
+
+    python plan_check.py [--seed] [--record] [--case NAME ...] [--baseline FILE]
+
+--seed populates an empty schema with PopulateDatabase (sql/insert_auto.sql)
+at SEED_SIZES and gathers optimizer statistics, so plans are those of a
+realistically sized database. --record writes the current results as the
+new baselines (review the diff before committing it). Without --record the
+script exits with status 1 when any case regresses. Requires SELECT on
+V$MYSTAT / V$STATNAME.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+from db import get_db_connection, tuned_cursor
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'plan_baselines.json')
+
+# Rows per table for --seed, in PopulateDatabase argument order
+SEED_SIZES = {
+    'donors': 5000,
+    'researchers': 1000,
+    'diseases': 200,
+    'drugs': 300,
+    'allergies': 100,
+    'publications': 3000,
+    'treatments': 300,
+    'experiments': 20000,
+    'biological_data': 100000,
+    'future_works': 5000,
+}
+
+# name -> (sql, binds, indexes that must appear in the plan). Bind values written as
+# ':pick <query>' are taken from the seeded data, so every case selects existing rows.
+CASES = {
+    'op2': ("""
+        SELECT b.id, b.name, b.data_type, b.density, b.donor_cf, b.is_required, b.condition
+          FROM biological_data_tab b
+         WHERE b.density < :threshold
+    """, {'threshold': 1.0}, ['IDX_BD_DENSITY']),
+    'op3': ("""
+        SELECT t.id, t.name, t.success_percentage, d.id, d.name, al.id, al.name
+          FROM treatment_tab t
+          LEFT JOIN assign_tab a ON a.treatment_id = t.id
+          LEFT JOIN drugs_tab d ON d.id = a.drug_id
+          LEFT JOIN cause_tab c ON c.drug_id = a.drug_id
+          LEFT JOIN allergy_tab al ON al.id = c.allergy_id
+         WHERE t.id = :treatment_id
+    """, {'treatment_id': ':pick SELECT MIN(treatment_id) FROM assign_tab'}, []),
+    'op4': ("""
+        SELECT DISTINCT dn.CF, dn.name, dn.surname
+          FROM affected_tab a
+          JOIN biological_data_tab b ON b.id = a.bio_id
+          JOIN donors_tab dn ON dn.CF = b.donor_cf
+         WHERE a.disease_id = :disease_id
+           AND b.is_required = 'Y'
+           AND EXISTS (SELECT 1
+                         FROM analyze_tab z
+                         JOIN future_work_tab f ON f.exp_id = z.exp_id
+                        WHERE z.bio_id = b.id)
+    """, {'disease_id': ':pick SELECT MIN(disease_id) FROM affected_tab'}, ['IDX_AFF_DIS_BIO']),
+    'op5': ("""
+        SELECT f.id, f.title, r.CF, r.name, r.surname
+          FROM consider_tab c
+          JOIN future_work_tab f ON f.id = c.future_work_id
+          JOIN (SELECT DISTINCT w.researcher_cf
+                  FROM writes_tab w
+                  JOIN publication_tab p ON p.DOI = w.publication_doi
+                 WHERE p.quality = 'top') top_researchers
+            ON c.researcher_cf = top_researchers.researcher_cf
+          JOIN researchers_tab r ON r.CF = c.researcher_cf
+    """, {}, ['IDX_PUB_QUALITY']),
+    'donors_list': ("""
+        SELECT CF, name, surname, birth, sex, age FROM donors_tab ORDER BY surname, name
+    """, {}, []),
+    'biological_data_list': ("""
+        SELECT b.id, b.name, b.data_type, b.condition, b.is_required, b.density, b.position, b.donor_cf
+          FROM biological_data_tab b
+         ORDER BY b.id
+    """, {}, []),
+    'biological_data_range': ("""
+        SELECT b.id, b.name, b.data_type, b.condition, b.is_required, b.density, b.position, b.donor_cf
+          FROM biological_data_tab AS OF SCN :as_of_scn b
+         WHERE b.id >= :range_low AND b.id < :range_high
+         ORDER BY b.id
+    """, {'as_of_scn': ':pick SELECT DBMS_FLASHBACK.GET_SYSTEM_CHANGE_NUMBER FROM DUAL',
+          'range_low': ':pick SELECT MIN(id) FROM biological_data_tab',
+          'range_high': ':pick SELECT MIN(id) + 10000 FROM biological_data_tab'}, []),
+    'experiments_list': ("""
+        SELECT id, exper_date, is_positive, SUBSTR(effect_description, 1, 100), disease_id, treatment_id
+          FROM experiment_tab
+         ORDER BY exper_date DESC
+    """, {}, []),
+    'affected_list': ("""
+        SELECT a.id, a.bio_id, b.name, a.disease_id, d.name
+          FROM affected_tab a
+          JOIN disease_tab d ON d.id = a.disease_id
+          JOIN biological_data_tab b ON b.id = a.bio_id
+         ORDER BY a.id
+    """, {}, []),
+}
+
+_RUNS = 3
+
+
+def _normalize(name):
+    """Object name without database-specific parts (system-generated constraint indexes)"""
+    if name is None:
+        return None
+    return re.sub(r'^SYS_C\d+$', 'SYS_C#', re.sub(r'^SYS_IL\d+.*$', 'SYS_IL#', name))
+
+
+def _logical_reads(cursor):
+    cursor.execute("""
+        SELECT m.value
+        FROM v$mystat m JOIN v$statname n ON n.statistic# = m.statistic#
+        WHERE n.name = 'session logical reads'
+    """)
+    return cursor.fetchone()[0]
+
+
+def _resolve_binds(cursor, binds):
+    resolved = {}
+    for name, value in binds.items():
+        if isinstance(value, str) and value.startswith(':pick '):
+            cursor.execute(value[len(':pick '):])
+            value = cursor.fetchone()[0]
+        resolved[name] = value
+    return resolved
+
+
+def _plan(cursor, name, sql):
+    """Plan lines as [depth, operation, object] in id order"""
+    statement_id = f'plan_check_{name}'[:30]
+    cursor.execute("DELETE FROM plan_table WHERE statement_id = :s", {'s': statement_id})
+    cursor.execute(f"EXPLAIN PLAN SET STATEMENT_ID = '{statement_id}' FOR {sql}")
+    cursor.execute("""
+        SELECT depth, operation || NVL2(options, ' ' || options, ''), object_name
+        FROM plan_table
+        WHERE statement_id = :s
+        ORDER BY id
+    """, {'s': statement_id})
+    lines = [[depth, operation, _normalize(object_name)] for depth, operation, object_name in cursor]
+    cursor.execute("DELETE FROM plan_table WHERE statement_id = :s", {'s': statement_id})
+    return lines
+
+
+def _run(conn, sql, binds):
+    """(rows, best elapsed seconds, logical reads of the best run)"""
+    stats_cursor = conn.cursor()
+    best = None
+    for _ in range(_RUNS):
+        cursor = tuned_cursor(conn, 'export')
+        before = _logical_reads(stats_cursor)
+        started = time.perf_counter()
+        cursor.execute(sql, binds)
+        rows = 0
+        while True:
+            batch = cursor.fetchmany()
+            if not batch:
+                break
+            rows += len(batch)
+        elapsed = time.perf_counter() - started
+        cursor.close()
+        gets = _logical_reads(stats_cursor) - before
+        if best is None or elapsed < best[1]:
+            best = (rows, elapsed, gets)
+    stats_cursor.close()
+    return best
+
+
+def capture(conn, names):
+    """Plan and runtime statistics of the named cases"""
+    cursor = conn.cursor()
+    results = {}
+    for name in names:
+        sql, binds, _ = CASES[name]
+        binds = _resolve_binds(cursor, binds)
+        plan = _plan(cursor, name, sql)
+        rows, elapsed, gets = _run(conn, sql, binds)
+        results[name] = {
+            'plan': plan,
+            'indexes': sorted({obj for _, operation, obj in plan if operation.startswith('INDEX') and obj}),
+            'rows': rows,
+            'elapsed_ms': round(elapsed * 1000, 1),
+            'buffer_gets': gets,
+        }
+    cursor.close()
+    conn.rollback()
+    return results
+
+
+def _format_plan(plan):
+    return '\n'.join(f"      {'  ' * depth}{operation}{' ' + obj if obj else ''}" for depth, operation, obj in plan)
+
+
+def compare(name, current, baseline, tolerance, min_gets):
+    """List of regression messages for one case (baseline may be None)"""
+    problems = []
+    required = CASES[name][2]
+    for index in required:
+        # Prefix match, so the covering idx_bd_density_cov of sql/oracle_partitioning.sql also counts
+        if not any(used.startswith(index) for used in current['indexes']):
+            problems.append(f"required index {index} not used")
+    if baseline is None:
+        return problems
+    if current['plan'] != baseline['plan']:
+        problems.append("plan shape changed\n    baseline:\n" + _format_plan(baseline['plan'])
+                        + "\n    current:\n" + _format_plan(current['plan']))
+    for index in baseline['indexes']:
+        if index not in current['indexes'] and not any(index.startswith(r) for r in required):
+            problems.append(f"index {index} no longer used")
+    allowed = max(baseline['buffer_gets'] * (1 + tolerance), baseline['buffer_gets'] + min_gets)
+    if current['buffer_gets'] > allowed:
+        problems.append(f"buffer gets {current['buffer_gets']} > {allowed:.0f} "
+                        f"(baseline {baseline['buffer_gets']}, rows {baseline['rows']} -> {current['rows']})")
+    return problems
+
+
+def seed(conn):
+    """Populate an empty schema at SEED_SIZES and gather optimizer statistics"""
+    cursor = conn.cursor()
+    cursor.execute("SELECT COUNT(*) FROM donors_tab")
+    if cursor.fetchone()[0] > 0:
+        print("Schema already populated, not seeding (plans are checked on the existing data)")
+    else:
+        print(f"Seeding: {', '.join(f'{k}={v}' for k, v in SEED_SIZES.items())}")
+        cursor.callproc('PopulateDatabase', list(SEED_SIZES.values()))
+        conn.commit()
+    print("Gathering optimizer statistics")
+    cursor.execute("BEGIN DBMS_STATS.GATHER_SCHEMA_STATS(USER, cascade => TRUE); END;")
+    cursor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check execution plans of the operations and list queries against baselines')
+    parser.add_argument('--seed', action='store_true', help='populate an empty schema and gather statistics first')
+    parser.add_argument('--record', action='store_true', help='store the current plans as the new baselines')
+    parser.add_argument('--case', action='append', dest='cases', choices=sorted(CASES))
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--tolerance', type=float, default=0.5, help='allowed relative growth of buffer gets')
+    parser.add_argument('--min-gets', type=int, default=100, help='allowed absolute growth of buffer gets')
+    args = parser.parse_args()
+    names = args.cases or list(CASES)
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baselines = json.load(f)
+
+    conn = get_db_connection()
+    try:
+        if args.seed:
+            seed(conn)
+        results = capture(conn, names)
+    finally:
+        conn.close()
+
+    if args.record:
+        baselines.update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"Recorded {len(results)} baselines in {args.baseline}")
+        return 0
+
+    failed = 0
+    print(f"{'case':<24}{'rows':>9}{'gets':>10}{'base gets':>11}{'ms':>9}  result")
+    for name in names:
+        current, baseline = results[name], baselines.get(name)
+        problems = compare(name, current, baseline, args.tolerance, args.min_gets)
+        base_gets = baseline['buffer_gets'] if baseline else '-'
+        verdict = 'REGRESSION' if problems else ('ok' if baseline else 'ok (no baseline)')
+        print(f"{name:<24}{current['rows']:>9}{current['buffer_gets']:>10}{base_gets:>11}{current['elapsed_ms']:>9}  {verdict}")
+        for problem in problems:
+            print(f"    - {problem}")
+        failed += bool(problems)
+    if failed:
+        print(f"{failed} of {len(names)} cases regressed")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
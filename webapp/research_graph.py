@@ -0,0 +1,435 @@
+"""In-memory researcher-publication graph for operation 5 and co-authorship analytics.
+
+writes_tab (researcher -> publication) and consider_tab (researcher ->
+future work) are loaded into CSR adjacency arrays: for each node an
+offset into one flat NumPy array of neighbour indices, in both directions
+for writes. Every query is a few slices and vectorised gathers over those
+arrays:
+
+- op5(): future works of researchers with a top-quality publication, the
+  result of func_list_fw_for_top_researchers (same columns and row order)
+  without joins or DEREF;
+- coauthors(cf): co-authors with the number of shared publications;
+- neighborhood(cf, hops) / distance(a, b): breadth-first search over
+  co-authorship (researcher -> publication -> researcher);
+- ranking(by): researchers by PageRank over the authorship graph
+  ("influence"), by publications or by top-quality publications.
+
+Like density_snapshot.py it needs NumPy and is optional; op5 falls back to
+Oracle when the graph is not loaded. The graph is rebuilt from the database
+every Config.RESEARCH_GRAPH_REFRESH_SECONDS. In between, inserted writes /
+consider pairs announced by the change bus are merged in memory: the CSR
+arrays are rebuilt from the current edges plus the new ones without a
+database round trip. Changes that add nodes (new researchers, publications
+or future works) or delete anything trigger a full reload.
+"""
+import threading
+import time
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+from config import Config
+from db import tuned_cursor
+
+# Change bus tables the graph depends on
+TABLES = ('researchers_tab', 'publication_tab', 'future_work_tab', 'writes_tab', 'consider_tab')
+
+RANKINGS = ('pagerank', 'publications', 'top_publications')
+
+_graph = None
+_update_lock = threading.Lock()
+# Inserted edges waiting to be merged: ('writes', cf, doi) / ('consider', cf, future_work_id)
+_pending = []
+_reload = threading.Event()
+_wakeup = threading.Event()
+_refresher = None
+
+
+def _csr(sources, targets, n):
+    """CSR adjacency of the edges sources[i] -> targets[i] over n source nodes: (offsets, neighbours)"""
+    order = np.argsort(sources, kind='stable')
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=n), out=offsets[1:])
+    return offsets, targets[order]
+
+
+def _sources(offsets):
+    """Source node of every edge of a CSR, in neighbour order"""
+    return np.repeat(np.arange(len(offsets) - 1, dtype=np.int32), np.diff(offsets))
+
+
+def _gather(offsets, neighbours, nodes):
+    """Neighbours of every node in nodes, concatenated, and the number of neighbours of each node"""
+    starts = offsets[nodes]
+    lengths = offsets[nodes + 1] - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return neighbours[:0], lengths
+    # Shift every output position back into its node's segment
+    shift = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return neighbours[shift + np.arange(total)], lengths
+
+
+class _Nodes:
+    """Researchers, publications and future works with their index maps"""
+
+    def __init__(self, researchers, publications, future_works):
+        self.cfs = [cf.rstrip() for cf, _, _ in researchers]
+        self.names = [(name, surname) for _, name, surname in researchers]
+        self.researcher_pos = {cf: i for i, cf in enumerate(self.cfs)}
+        self.dois = [doi for doi, _ in publications]
+        self.publication_pos = {doi: i for i, doi in enumerate(self.dois)}
+        self.top = np.array([(quality or '').lower() == 'top' for _, quality in publications], dtype=bool)
+        self.future_works = dict(future_works)
+
+
+class _Graph:
+    """Immutable CSR arrays over one _Nodes"""
+
+    def __init__(self, nodes, writes_r, writes_p, consider_r, consider_fw):
+        self.nodes = nodes
+        researchers, publications = len(nodes.cfs), len(nodes.dois)
+        self.r_off, self.r_pubs = _csr(writes_r, writes_p, researchers)
+        self.p_off, self.p_authors = _csr(writes_p, writes_r, publications)
+        self.c_off, self.c_fw = _csr(consider_r, consider_fw, researchers)
+        self.refreshed_at = time.time()
+        self._op5 = None
+        self._rankings = {}
+
+    @property
+    def edges(self):
+        return len(self.r_pubs)
+
+    def nbytes(self):
+        arrays = (self.r_off, self.r_pubs, self.p_off, self.p_authors, self.c_off, self.c_fw, self.nodes.top)
+        return sum(array.nbytes for array in arrays)
+
+    def merged(self, pending):
+        """New graph with the pending inserted edges added; edges to unknown nodes are left out"""
+        nodes = self.nodes
+        new_writes, new_consider = set(), set()
+        for kind, cf, target in pending:
+            r = nodes.researcher_pos.get(cf)
+            if r is None:
+                continue
+            # The same pair may already be there (loaded by a reload that raced the event): skip it
+            if kind == 'writes':
+                p = nodes.publication_pos.get(target)
+                if p is not None and p not in self.r_pubs[self.r_off[r]:self.r_off[r + 1]]:
+                    new_writes.add((r, p))
+            elif target in nodes.future_works and target not in self.c_fw[self.c_off[r]:self.c_off[r + 1]]:
+                new_consider.add((r, target))
+        if not new_writes and not new_consider:
+            return self
+        writes_r = np.concatenate((_sources(self.r_off), np.array([r for r, _ in new_writes], dtype=np.int32)))
+        writes_p = np.concatenate((self.r_pubs, np.array([p for _, p in new_writes], dtype=np.int32)))
+        consider_r = np.concatenate((_sources(self.c_off), np.array([r for r, _ in new_consider], dtype=np.int32)))
+        consider_fw = np.concatenate((self.c_fw, np.array([fw for _, fw in new_consider], dtype=np.int64)))
+        return _Graph(nodes, writes_r, writes_p, consider_r, consider_fw)
+
+    def warm(self):
+        """Compute op5 and every ranking now, so requests never pay for them"""
+        self.op5()
+        for by in RANKINGS:
+            self._scores(by)
+        return self
+
+    def _researcher(self, i):
+        name, surname = self.nodes.names[i]
+        return {'cf': self.nodes.cfs[i], 'name': name, 'surname': surname}
+
+    def top_researchers(self):
+        authors, _ = _gather(self.p_off, self.p_authors, np.flatnonzero(self.nodes.top))
+        return np.unique(authors)
+
+    def op5(self):
+        """Rows of func_list_fw_for_top_researchers, same columns and order:
+        (researcher_cf, name, surname, future_work_id, title) by surname, name, future_work_id"""
+        if self._op5 is None:
+            tops = self.top_researchers()
+            future_works, lengths = _gather(self.c_off, self.c_fw, tops)
+            owners = np.repeat(tops, lengths)
+            titles, cfs, names = self.nodes.future_works, self.nodes.cfs, self.nodes.names
+            pairs = set(zip(owners.tolist(), future_works.tolist()))
+            self._op5 = sorted(((cfs[r], names[r][0], names[r][1], int(fw), titles[int(fw)]) for r, fw in pairs),
+                               key=op5_order)
+        return self._op5
+
+    def coauthors(self, r, limit=None):
+        """Co-authors of researcher r, most shared publications first"""
+        pubs = self.r_pubs[self.r_off[r]:self.r_off[r + 1]]
+        authors, _ = _gather(self.p_off, self.p_authors, pubs)
+        ids, shared = np.unique(authors, return_counts=True)
+        keep = ids != r
+        ids, shared = ids[keep], shared[keep]
+        order = np.lexsort((ids, -shared))[:limit]
+        return [dict(self._researcher(i), shared_publications=int(n))
+                for i, n in zip(ids[order].tolist(), shared[order].tolist())]
+
+    def _bfs(self, start, max_hops, target=None):
+        """Hop distance of every researcher reached within max_hops (-1 = not reached)"""
+        distance = np.full(len(self.nodes.cfs), -1, dtype=np.int32)
+        seen_pubs = np.zeros(len(self.nodes.dois), dtype=bool)
+        distance[start] = 0
+        frontier = np.array([start], dtype=np.int32)
+        for hop in range(1, max_hops + 1):
+            pubs, _ = _gather(self.r_off, self.r_pubs, frontier)
+            pubs = np.unique(pubs)
+            pubs = pubs[~seen_pubs[pubs]]
+            seen_pubs[pubs] = True
+            authors, _ = _gather(self.p_off, self.p_authors, pubs)
+            authors = np.unique(authors)
+            frontier = authors[distance[authors] < 0]
+            if len(frontier) == 0:
+                break
+            distance[frontier] = hop
+            if target is not None and distance[target] >= 0:
+                break
+        return distance
+
+    def neighborhood(self, r, hops, limit=None):
+        """Researchers within hops co-authorship steps of r, nearest first"""
+        distance = self._bfs(r, hops)
+        reached = np.flatnonzero(distance > 0)
+        order = np.lexsort((reached, distance[reached]))[:limit]
+        return [dict(self._researcher(i), hops=int(distance[i])) for i in reached[order].tolist()], len(reached)
+
+    def distance(self, a, b, max_hops):
+        """Co-authorship hops between researchers a and b, or -1 if farther than max_hops"""
+        if a == b:
+            return 0
+        return int(self._bfs(a, max_hops, target=b)[b])
+
+    def _scores(self, by):
+        scores = self._rankings.get(by)
+        if scores is not None:
+            return scores
+        if by == 'publications':
+            scores = np.diff(self.r_off).astype(np.float64)
+        elif by == 'top_publications':
+            scores = np.bincount(_sources(self.r_off), weights=self.nodes.top[self.r_pubs],
+                                 minlength=len(self.nodes.cfs))
+        else:
+            scores = self._pagerank()
+        self._rankings[by] = scores
+        return scores
+
+    def _pagerank(self, damping=0.85, iterations=50, tolerance=1e-10):
+        """PageRank of the walk researcher -> one of their publications -> one of its authors"""
+        researchers, publications = len(self.nodes.cfs), len(self.nodes.dois)
+        if researchers == 0:
+            return np.zeros(0)
+        r_degree, p_degree = np.diff(self.r_off), np.diff(self.p_off)
+        r_sources, p_sources = _sources(self.r_off), _sources(self.p_off)
+        r_inverse = np.divide(1.0, r_degree, out=np.zeros(researchers), where=r_degree > 0)
+        p_inverse = np.divide(1.0, p_degree, out=np.zeros(publications), where=p_degree > 0)
+        dangling = r_degree == 0
+        rank = np.full(researchers, 1.0 / researchers)
+        for _ in range(iterations):
+            to_pubs = np.bincount(self.r_pubs, weights=(rank * r_inverse)[r_sources], minlength=publications)
+            to_authors = np.bincount(self.p_authors, weights=(to_pubs * p_inverse)[p_sources], minlength=researchers)
+            updated = (1 - damping) / researchers + damping * (to_authors + rank[dangling].sum() / researchers)
+            done = np.abs(updated - rank).sum() < tolerance
+            rank = updated
+            if done:
+                break
+        return rank
+
+    def ranking(self, by, limit):
+        scores = self._scores(by)
+        if len(scores) == 0:
+            return []
+        limit = min(limit, len(scores))
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.lexsort((top, -scores[top]))]
+        return [dict(self._researcher(i), score=float(scores[i])) for i in top.tolist()]
+
+
+def _load(conn):
+    cursor = tuned_cursor(conn, 'export')
+    cursor.execute("SELECT CF, name, surname FROM researchers_tab ORDER BY CF")
+    researchers = cursor.fetchall()
+    cursor.execute("SELECT DOI, quality FROM publication_tab ORDER BY DOI")
+    publications = cursor.fetchall()
+    cursor.execute("SELECT id, title FROM future_work_tab")
+    future_works = cursor.fetchall()
+    nodes = _Nodes(researchers, publications, future_works)
+
+    writes_r, writes_p = [], []
+    cursor.execute("SELECT researcher_cf, publication_doi FROM writes_tab")
+    for cf, doi in cursor:
+        r, p = nodes.researcher_pos.get(cf.rstrip()), nodes.publication_pos.get(doi)
+        if r is not None and p is not None:
+            writes_r.append(r)
+            writes_p.append(p)
+    consider_r, consider_fw = [], []
+    cursor.execute("SELECT researcher_cf, future_work_id FROM consider_tab")
+    for cf, fw in cursor:
+        r = nodes.researcher_pos.get(cf.rstrip())
+        if r is not None and fw in nodes.future_works:
+            consider_r.append(r)
+            consider_fw.append(fw)
+    cursor.close()
+    return _Graph(nodes, np.array(writes_r, dtype=np.int32), np.array(writes_p, dtype=np.int32),
+                  np.array(consider_r, dtype=np.int32), np.array(consider_fw, dtype=np.int64))
+
+
+def available():
+    """True when the graph is enabled and loaded"""
+    return _graph is not None
+
+
+def refresh(conn):
+    """Reload the graph from the database; inserts announced meanwhile are merged on top"""
+    global _graph
+    if np is None or not Config.RESEARCH_GRAPH:
+        return
+    graph = _load(conn)
+    with _update_lock:
+        pending = list(_pending)
+        del _pending[:]
+    # Published only once op5 and the rankings are computed, outside the lock
+    _graph = graph.merged(pending).warm()
+
+
+def merge_pending():
+    """Merge the inserted edges announced since the last merge (no database access)"""
+    global _graph
+    with _update_lock:
+        if _graph is None or not _pending:
+            return
+        pending = list(_pending)
+        del _pending[:]
+    _graph = _graph.merged(pending).warm()
+
+
+def on_change(event):
+    """Change bus subscriber: queue inserted writes/consider pairs, reload for anything else"""
+    if event.op == 'I' and event.key is not None and event.table in ('WRITES_TAB', 'CONSIDER_TAB'):
+        # Keys are 'doi/cf' and 'future_work_id/cf' (CF never contains '/', a DOI may)
+        first, _, cf = event.key.rpartition('/')
+        current = _graph
+        if current is not None and cf in current.nodes.researcher_pos:
+            if event.table == 'WRITES_TAB' and first in current.nodes.publication_pos:
+                with _update_lock:
+                    _pending.append(('writes', cf, first))
+                _wakeup.set()
+                return
+            if event.table == 'CONSIDER_TAB' and first.isdigit() and int(first) in current.nodes.future_works:
+                with _update_lock:
+                    _pending.append(('consider', cf, int(first)))
+                _wakeup.set()
+                return
+    _reload.set()
+    _wakeup.set()
+
+
+def _researcher_index(graph, cf):
+    return graph.nodes.researcher_pos.get((cf or '').strip())
+
+
+def op5_order(row):
+    """Sort key of an op5 row: ORDER BY researcher_surname, researcher_name, future_work_id of the
+    SQL function (binary collation, NULLs last as in Oracle; CF breaks the remaining ties)"""
+    cf, name, surname, future_work_id, _ = row
+    return (surname is None, surname or '', name is None, name or '', future_work_id, cf)
+
+
+def op5():
+    """Rows of operation 5, or None if the graph is not loaded"""
+    current = _graph
+    return current.op5() if current is not None else None
+
+
+def coauthors(cf, limit=None):
+    """Co-authors of a researcher, or None if the graph is not loaded; KeyError if cf is unknown"""
+    current = _graph
+    if current is None:
+        return None
+    r = _researcher_index(current, cf)
+    if r is None:
+        raise KeyError(cf)
+    return current.coauthors(r, limit)
+
+
+def neighborhood(cf, hops, limit=None):
+    """(researchers within hops, total reached), or None if the graph is not loaded"""
+    current = _graph
+    if current is None:
+        return None
+    r = _researcher_index(current, cf)
+    if r is None:
+        raise KeyError(cf)
+    return current.neighborhood(r, hops, limit)
+
+
+def distance(cf_from, cf_to, max_hops):
+    """Co-authorship hops between two researchers, -1 if not within max_hops, None if the graph is not loaded"""
+    current = _graph
+    if current is None:
+        return None
+    a, b = _researcher_index(current, cf_from), _researcher_index(current, cf_to)
+    if a is None:
+        raise KeyError(cf_from)
+    if b is None:
+        raise KeyError(cf_to)
+    return current.distance(a, b, max_hops)
+
+
+def ranking(by='pagerank', limit=20):
+    """Top researchers by one of RANKINGS, or None if the graph is not loaded"""
+    if by not in RANKINGS:
+        raise ValueError(f"Unknown ranking: {by}")
+    current = _graph
+    return current.ranking(by, limit) if current is not None else None
+
+
+def status():
+    current = _graph
+    return {
+        'enabled': np is not None and bool(Config.RESEARCH_GRAPH),
+        'loaded': current is not None,
+        'researchers': len(current.nodes.cfs) if current is not None else 0,
+        'publications': len(current.nodes.dois) if current is not None else 0,
+        'writes_edges': current.edges if current is not None else 0,
+        'consider_edges': len(current.c_fw) if current is not None else 0,
+        'array_bytes': current.nbytes() if current is not None else 0,
+        'pending_edges': len(_pending),
+        'refreshed_at': current.refreshed_at if current is not None else None,
+    }
+
+
+def start_refresher(get_connection, interval=None):
+    """Start the background reload/merge thread (once per process, only if NumPy is available)"""
+    global _refresher
+    interval = Config.RESEARCH_GRAPH_REFRESH_SECONDS if interval is None else interval
+    if _refresher is not None or np is None or not Config.RESEARCH_GRAPH or interval <= 0:
+        return
+
+    def run():
+        reload = True
+        while True:
+            try:
+                if reload or _graph is None:
+                    conn = get_connection()
+                    try:
+                        refresh(conn)
+                    finally:
+                        conn.close()
+                else:
+                    merge_pending()
+            except Exception as e:
+                print(f"Error refreshing research graph: {e}")
+            woke = _wakeup.wait(interval)
+            if woke:
+                # Let a burst of changes settle into one merge or reload
+                time.sleep(Config.CHANGES_COALESCE_SECONDS)
+                _wakeup.clear()
+            reload = not woke or _reload.is_set()
+            _reload.clear()
+
+    _refresher = threading.Thread(target=run, name='research-graph-refresher', daemon=True)
+    _refresher.start()
@@ -73,7 +73,7 @@ BEGIN
            b.name,
            b.data_type,
            b.density,
-           DEREF(b.donor_ref).CF AS donor_cf,
+           b.donor_cf,
            b.is_required,
            b.condition
       FROM biological_data_tab b
@@ -114,13 +114,13 @@ BEGIN
            al.name                   AS allergy_name
       FROM treatment_tab t
       LEFT JOIN assign_tab a
-             ON a.treatment_ref = REF(t)
+             ON a.treatment_id = t.id
       LEFT JOIN drugs_tab d
-             ON a.drug_ref = REF(d)
+             ON d.id = a.drug_id
       LEFT JOIN cause_tab c
-             ON c.drug_ref = a.drug_ref
+             ON c.drug_id = a.drug_id
       LEFT JOIN allergy_tab al
-             ON c.allergy_ref = REF(al)
+             ON al.id = c.allergy_id
      WHERE t.id = p_treatment_id
   ) LOOP
     PIPE ROW(op3_result_typ(
@@ -149,22 +149,22 @@ CREATE OR REPLACE FUNCTION func_list_donors_required_disease_with_fw (
 AS
 BEGIN
   FOR rec IN (
-    SELECT DISTINCT DEREF(b.donor_ref).CF      AS cf,
-                    DEREF(b.donor_ref).name    AS name,
-                    DEREF(b.donor_ref).surname AS surname
+    SELECT DISTINCT dn.CF      AS cf,
+                    dn.name    AS name,
+                    dn.surname AS surname
       FROM affected_tab a
-      JOIN disease_tab dis
-        ON a.disease_ref = REF(dis)
-       AND dis.id = p_disease_id
       JOIN biological_data_tab b
-        ON a.bio_ref = REF(b)
-     WHERE b.is_required = 'Y'
+        ON b.id = a.bio_id
+      JOIN donors_tab dn
+        ON dn.CF = b.donor_cf
+     WHERE a.disease_id = p_disease_id
+       AND b.is_required = 'Y'
        AND EXISTS (
              SELECT 1
                FROM analyze_tab z
                JOIN future_work_tab f
-                 ON f.exp_ref = z.exp_ref
-              WHERE z.bio_ref = REF(b)
+                 ON f.exp_id = z.exp_id
+              WHERE z.bio_id = b.id
            )
   ) LOOP
     PIPE ROW(op4_result_typ(
@@ -189,21 +189,22 @@ AS
 BEGIN
   FOR rec IN (
     WITH top_researchers AS (
-      SELECT r.CF
-      FROM researchers_tab r
-      JOIN writes_tab w ON w.researcher_ref = REF(r)
-      JOIN publication_tab p ON p.DOI = DEREF(w.publication_ref).DOI
+      SELECT w.researcher_cf AS CF
+      FROM writes_tab w
+      JOIN publication_tab p ON p.DOI = w.publication_doi
       WHERE LOWER(p.quality) = 'top'
-      GROUP BY r.CF
+      GROUP BY w.researcher_cf
     )
     SELECT DISTINCT
-           DEREF(c.researcher_ref).CF      AS researcher_cf,
-           DEREF(c.researcher_ref).name    AS researcher_name,
-           DEREF(c.researcher_ref).surname AS researcher_surname,
-           DEREF(c.future_work_ref).id     AS future_work_id,
-           DEREF(c.future_work_ref).title  AS future_work_title
+           r.CF      AS researcher_cf,
+           r.name    AS researcher_name,
+           r.surname AS researcher_surname,
+           f.id      AS future_work_id,
+           f.title   AS future_work_title
       FROM consider_tab c
-     WHERE DEREF(c.researcher_ref).CF IN (SELECT CF FROM top_researchers)
+      JOIN researchers_tab r ON r.CF = c.researcher_cf
+      JOIN future_work_tab f ON f.id = c.future_work_id
+     WHERE c.researcher_cf IN (SELECT CF FROM top_researchers)
      ORDER BY researcher_surname, researcher_name, future_work_id
   ) LOOP
     PIPE ROW(op5_result_typ(
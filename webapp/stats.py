@@ -0,0 +1,194 @@
+"""Dashboard statistics kept in memory.
+
+Counters are loaded with a handful of aggregate queries by refresh() and then
+maintained incrementally by the add_* routes (record_* functions), so the home
+page and /api/stats read them in O(1) without touching the database.
+
+A background thread re-runs refresh() every Config.STATS_REFRESH_SECONDS to
+pick up rows written by other workers or directly through SQL scripts
+(e.g. PopulateDatabase).
+"""
+import threading
+import time
+
+from config import Config
+
+# Table behind each counter, in display order
+TABLES = {
+    'donors': 'donors_tab',
+    'researchers': 'researchers_tab',
+    'diseases': 'disease_tab',
+    'biological_data': 'biological_data_tab',
+    'treatments': 'treatment_tab',
+    'drugs': 'drugs_tab',
+    'allergies': 'allergy_tab',
+    'publications': 'publication_tab',
+    'experiments': 'experiment_tab',
+    'future_works': 'future_work_tab',
+    'assign': 'assign_tab',
+    'writes': 'writes_tab',
+    'affected': 'affected_tab',
+    'cause': 'cause_tab',
+    'analyze': 'analyze_tab',
+    'consider': 'consider_tab',
+}
+
+_lock = threading.Lock()
+_state = {
+    'counts': dict.fromkeys(TABLES, 0),
+    'experiments_positive': 0,
+    'experiments_negative': 0,
+    'top_publications': 0,
+    'affected_by_disease': {},   # disease_id -> count
+    'disease_names': {},         # disease_id -> name
+    'refreshed_at': None,
+}
+_snapshot = None
+_refresher = None
+_wakeup = threading.Event()
+
+
+def _publish():
+    """Rebuild the read-only snapshot served to pages (call with _lock held)"""
+    global _snapshot
+    positive = _state['experiments_positive']
+    negative = _state['experiments_negative']
+    names = _state['disease_names']
+    top_diseases = sorted(_state['affected_by_disease'].items(), key=lambda kv: kv[1], reverse=True)[:10]
+    _snapshot = {
+        'loaded': _state['refreshed_at'] is not None,
+        'refreshed_at': _state['refreshed_at'],
+        'counts': dict(_state['counts']),
+        'experiments': {
+            'positive': positive,
+            'negative': negative,
+            'positive_ratio': round(positive / (positive + negative), 4) if positive + negative else None,
+        },
+        'top_publications': _state['top_publications'],
+        'top_affected_diseases': [
+            {'disease_id': disease_id, 'name': names.get(disease_id), 'affected': count}
+            for disease_id, count in top_diseases
+        ],
+    }
+
+
+def snapshot():
+    """Return the current statistics (a dict that must not be modified)"""
+    if _snapshot is None:
+        with _lock:
+            if _snapshot is None:
+                _publish()
+    return _snapshot
+
+
+def refresh(conn):
+    """Reload every counter from the database"""
+    cursor = conn.cursor()
+    select_list = ',\n'.join(f"(SELECT COUNT(*) FROM {table})" for table in TABLES.values())
+    cursor.execute(f"SELECT {select_list} FROM DUAL")
+    counts = dict(zip(TABLES, cursor.fetchone()))
+
+    cursor.execute("""
+        SELECT COUNT(CASE WHEN UPPER(is_positive) = 'Y' THEN 1 END),
+               COUNT(CASE WHEN UPPER(is_positive) = 'N' THEN 1 END)
+        FROM experiment_tab
+    """)
+    positive, negative = cursor.fetchone()
+
+    cursor.execute("SELECT COUNT(*) FROM publication_tab WHERE LOWER(quality) = 'top'")
+    top_publications = cursor.fetchone()[0]
+
+    cursor.execute("""
+        SELECT d.id, d.name, COUNT(a.id)
+        FROM disease_tab d
+        LEFT JOIN affected_tab a ON a.disease_id = d.id
+        GROUP BY d.id, d.name
+    """)
+    affected_by_disease = {}
+    disease_names = {}
+    for disease_id, name, count in cursor:
+        disease_names[disease_id] = name
+        if count:
+            affected_by_disease[disease_id] = count
+    cursor.close()
+
+    with _lock:
+        _state['counts'] = counts
+        _state['experiments_positive'] = positive
+        _state['experiments_negative'] = negative
+        _state['top_publications'] = top_publications
+        _state['affected_by_disease'] = affected_by_disease
+        _state['disease_names'] = disease_names
+        _state['refreshed_at'] = time.time()
+        _publish()
+
+
+def record_insert(entity, rows=1):
+    """Count rows inserted into one of the TABLES entities"""
+    with _lock:
+        _state['counts'][entity] += rows
+        _publish()
+
+
+def record_disease(disease_id, name):
+    with _lock:
+        _state['counts']['diseases'] += 1
+        _state['disease_names'][disease_id] = name
+        _publish()
+
+
+def record_experiment(is_positive):
+    with _lock:
+        _state['counts']['experiments'] += 1
+        if str(is_positive).upper() == 'Y':
+            _state['experiments_positive'] += 1
+        else:
+            _state['experiments_negative'] += 1
+        _publish()
+
+
+def record_publication(quality):
+    with _lock:
+        _state['counts']['publications'] += 1
+        if str(quality).lower() == 'top':
+            _state['top_publications'] += 1
+        _publish()
+
+
+def record_affected(disease_id):
+    with _lock:
+        _state['counts']['affected'] += 1
+        by_disease = _state['affected_by_disease']
+        by_disease[disease_id] = by_disease.get(disease_id, 0) + 1
+        _publish()
+
+
+def invalidate(event=None):
+    """Change bus subscriber: reload soon instead of at the next interval"""
+    _wakeup.set()
+
+
+def start_refresher(get_connection, interval=None):
+    """Start the background refresh thread (once per process)"""
+    global _refresher
+    interval = Config.STATS_REFRESH_SECONDS if interval is None else interval
+    if _refresher is not None or interval <= 0:
+        return
+
+    def run():
+        while True:
+            try:
+                conn = get_connection()
+                try:
+                    refresh(conn)
+                finally:
+                    conn.close()
+            except Exception as e:
+                print(f"Error refreshing dashboard statistics: {e}")
+            if _wakeup.wait(interval):
+                # Let a burst of changes (bulk load, several workers) settle into one reload
+                time.sleep(Config.CHANGES_COALESCE_SECONDS)
+                _wakeup.clear()
+
+    _refresher = threading.Thread(target=run, name='stats-refresher', daemon=True)
+    _refresher.start()
@@ -0,0 +1,43 @@
+import os
+import sys
+
+import pytest
+
+# The webapp modules are flat and imported by name, as when the app runs from webapp/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+R = [f'R{i:015d}' for i in range(7)]
+
+# Operation 5 fixture, one list of rows per table
+OP5_TABLES = {
+    'researchers_tab': [(R[1], 'Anna', 'Rossi'), (R[2], 'Bruno', 'Bianchi'), (R[3], 'Carla', 'Rossi'),
+                        (R[4], 'Dario', 'Verdi'), (R[5], 'Anna', 'Rossi'), (R[6], None, 'Bianchi')],
+    # Quality is compared case-insensitively: 'Top' counts, 'middle' and NULL do not
+    'publication_tab': [('10.1/p1', 'top'), ('10.1/p2', 'Top'), ('10.1/p3', 'middle'), ('10.1/p4', None)],
+    'future_work_tab': [(10, 'FW ten'), (11, 'FW eleven'), (12, 'FW twelve'), (13, 'FW thirteen')],
+    'writes_tab': [(R[1], '10.1/p1'), (R[2], '10.1/p2'), (R[3], '10.1/p3'), (R[3], '10.1/p1'),
+                   (R[4], '10.1/p3'), (R[4], '10.1/p4'), (R[5], '10.1/p2'), (R[6], '10.1/p1')],
+    'consider_tab': [(R[1], 11), (R[1], 10), (R[2], 12), (R[3], 10), (R[4], 13), (R[5], 10),
+                     (R[6], 13), (R[6], 10)],
+}
+
+# SELECT * FROM TABLE(func_list_fw_for_top_researchers()) on OP5_TABLES (NULL names sort last)
+OP5_EXPECTED = [
+    (R[2], 'Bruno', 'Bianchi', 12, 'FW twelve'),
+    (R[6], None, 'Bianchi', 10, 'FW ten'),
+    (R[6], None, 'Bianchi', 13, 'FW thirteen'),
+    (R[1], 'Anna', 'Rossi', 10, 'FW ten'),
+    (R[5], 'Anna', 'Rossi', 10, 'FW ten'),
+    (R[1], 'Anna', 'Rossi', 11, 'FW eleven'),
+    (R[3], 'Carla', 'Rossi', 10, 'FW ten'),
+]
+
+
+@pytest.fixture
+def op5_tables():
+    return OP5_TABLES
+
+
+@pytest.fixture
+def op5_expected():
+    return list(OP5_EXPECTED)
@@ -0,0 +1,81 @@
+"""/api/v1/operations/op5 pages: columns and row order of func_list_fw_for_top_researchers on both sources.
+
+The database source runs the endpoint's SQL on an SQLite copy of the op5
+fixture (conftest.py), with Oracle's NULLS LAST and FETCH FIRST spelled the
+SQLite way.
+"""
+import sqlite3
+
+import flask
+import pytest
+
+import api_v1
+import conditional
+import research_graph
+
+FUNCTION_COLUMNS = ('researcher_cf', 'researcher_name', 'researcher_surname', 'future_work_id', 'future_work_title')
+
+SCHEMA = {
+    'researchers_tab': '(CF, name, surname)',
+    'publication_tab': '(DOI, quality)',
+    'future_work_tab': '(id, title)',
+    'writes_tab': '(researcher_cf, publication_doi)',
+    'consider_tab': '(researcher_cf, future_work_id)',
+}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(conditional, 'table_versions', lambda tables: ({}, None))
+    app = flask.Flask(__name__)
+    app.register_blueprint(api_v1.bp)
+    return app.test_client()
+
+
+@pytest.fixture
+def database(monkeypatch, op5_tables):
+    db = sqlite3.connect(':memory:')
+    for table, columns in SCHEMA.items():
+        db.execute(f'CREATE TABLE {table} {columns}')
+        db.executemany(f"INSERT INTO {table} VALUES ({', '.join('?' * columns.count(','))}, ?)", op5_tables[table])
+
+    def query(sql, binds, expected):
+        sql = (sql.replace('ORDER BY r.surname, r.name,', 'ORDER BY r.surname NULLS LAST, r.name NULLS LAST,')
+                  .replace('FETCH FIRST :page_rows ROWS ONLY', 'LIMIT :page_rows'))
+        return db.execute(sql, binds).fetchall()
+
+    monkeypatch.setattr(research_graph, 'op5', lambda: None)
+    monkeypatch.setattr(api_v1, '_query', query)
+    return db
+
+
+def _pages(client, url):
+    items, pages = [], 0
+    while url:
+        body = client.get(url).get_json()
+        items += body['data']
+        url = body['next']
+        pages += 1
+    return items, pages, body['source']
+
+
+def test_fields_in_function_column_order(client):
+    assert tuple(client.get('/api/v1').get_json()['operations']['op5']['fields']) == FUNCTION_COLUMNS
+
+
+def test_graph_pages(client, monkeypatch, op5_expected):
+    monkeypatch.setattr(research_graph, 'op5', lambda: op5_expected)
+    items, pages, source = _pages(client, '/api/v1/operations/op5?limit=2')
+    assert source == 'graph' and pages == 4
+    assert [tuple(item[column] for column in FUNCTION_COLUMNS) for item in items] == op5_expected
+
+
+def test_database_pages(client, database, op5_expected):
+    items, pages, source = _pages(client, '/api/v1/operations/op5?limit=2')
+    assert source == 'database' and pages == 4
+    assert [tuple(item[column] for column in FUNCTION_COLUMNS) for item in items] == op5_expected
+
+
+def test_database_pages_with_fields(client, database, op5_expected):
+    items, _, _ = _pages(client, '/api/v1/operations/op5?limit=3&fields=researcher_cf,future_work_id')
+    assert items == [{'researcher_cf': cf, 'future_work_id': fw} for cf, _, _, fw, _ in op5_expected]
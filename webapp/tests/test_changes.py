@@ -0,0 +1,82 @@
+"""The change_log poller must not lose events committed below the last event_id it has read."""
+from changes import Event, _OracleSource
+
+
+class _Database:
+    """Committed change_log rows and table versions; each commit is one statement"""
+
+    def __init__(self):
+        self.events = []        # (event_id, statement_id, table, key, op)
+        self.versions = {'WRITES_TAB': 0, 'DONORS_TAB': 0}
+
+    def commit(self, table, *event_ids, key='k'):
+        for event_id in event_ids:
+            self.events.append((event_id, event_ids[0], table, f'{key}{event_id}', 'I'))
+        self.versions[table] += 1
+
+    def connect(self):
+        return _Connection(self)
+
+
+class _Connection:
+    def __init__(self, database):
+        self.database = database
+
+    def cursor(self):
+        return _Cursor(self.database)
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class _Cursor:
+    arraysize = prefetchrows = None
+
+    def __init__(self, database):
+        self.database = database
+
+    def execute(self, sql, binds=None):
+        if 'FROM table_version' in sql:
+            self.rows = list(self.database.versions.items())
+        elif 'MAX(event_id)' in sql:
+            self.rows = [(max((row[0] for row in self.database.events), default=0),)]
+        elif 'FROM change_log' in sql:
+            self.rows = sorted(row for row in self.database.events if row[0] > binds['last_id'])
+        else:
+            self.rows = []
+
+    def fetchall(self):
+        return list(self.rows)
+
+    def fetchone(self):
+        return self.rows[0]
+
+    def close(self):
+        pass
+
+
+def test_event_committed_below_last_id_widens_to_table():
+    database = _Database()
+    source = _OracleSource(database.connect)
+    assert source.poll() == []
+    # A takes event 10, B takes 11 and commits first; the poller reads past 11
+    database.commit('WRITES_TAB', 11)
+    assert source.poll() == [Event('WRITES_TAB', 'k11', 'I')]
+    # A commits in the same poll window as C (event 12): A's key is never read
+    database.commit('WRITES_TAB', 10)
+    database.commit('WRITES_TAB', 12)
+    assert source.poll() == [Event('WRITES_TAB', 'k12', 'I'), Event('WRITES_TAB', None, 'U')]
+
+
+def test_multi_row_statements_are_not_widened():
+    database = _Database()
+    source = _OracleSource(database.connect)
+    source.poll()
+    database.commit('DONORS_TAB', 1, 2, 3)
+    database.commit('WRITES_TAB', 4)
+    assert source.poll() == [Event('DONORS_TAB', 'k1', 'I'), Event('DONORS_TAB', 'k2', 'I'),
+                             Event('DONORS_TAB', 'k3', 'I'), Event('WRITES_TAB', 'k4', 'I')]
+    assert source.poll() == []
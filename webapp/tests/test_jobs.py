@@ -0,0 +1,22 @@
+"""The job store must work in processes that run no job workers (JOBS_WORKERS=0, or before warm-up)."""
+import pytest
+
+import jobs
+from config import Config
+
+
+@pytest.fixture
+def job_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'JOBS_DIR', str(tmp_path))
+    monkeypatch.setattr(Config, 'JOBS_WORKERS', 0)
+    monkeypatch.setattr(jobs, '_schema_ready', False)
+    return tmp_path
+
+
+def test_store_without_workers(job_store):
+    jobs.start_workers()
+    assert jobs.recent() == []
+    job_id = jobs.submit('op5')
+    assert jobs.get(job_id)['status'] == jobs.QUEUED
+    assert jobs.cancel(job_id)
+    assert [job['status'] for job in jobs.recent()] == [jobs.CANCELLED]
@@ -0,0 +1,68 @@
+"""ParallelRows over fake connections: merge order with NULL sort values and dead range workers."""
+import threading
+from datetime import datetime
+
+import pytest
+
+import parallel_fetch
+
+# (id, exper_date): ids 1-9 split into three ranges by the boundaries below
+ROWS = [(1, datetime(2024, 1, 5)), (2, None), (3, datetime(2024, 3, 1)), (4, datetime(2023, 7, 9)),
+        (5, None), (6, datetime(2024, 2, 2)), (7, datetime(2022, 1, 1)), (8, datetime(2024, 3, 1)),
+        (9, datetime(2025, 6, 30))]
+BOUNDARIES = [4, 7]
+
+SQL = "SELECT id, exper_date FROM experiment_tab {as_of} WHERE {range} ORDER BY exper_date DESC"
+
+
+class _Cursor:
+    arraysize = prefetchrows = None
+
+    def execute(self, sql, binds=None):
+        binds = binds or {}
+        low, high = binds.get('range_low', float('-inf')), binds.get('range_high', float('inf'))
+        rows = [row for row in ROWS if low <= row[0] < high]
+        # Oracle's ORDER BY exper_date DESC: NULLs first
+        self.rows = sorted(rows, key=lambda row: (row[1] is None, row[1] or datetime.min), reverse=True)
+
+    def fetchone(self):
+        return (1000,)
+
+    def fetchmany(self):
+        rows, self.rows = self.rows, []
+        return rows
+
+    def close(self):
+        pass
+
+
+class _Connection:
+    call_timeout = 0
+
+    def cursor(self):
+        return _Cursor()
+
+    def close(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def fake_database(monkeypatch):
+    monkeypatch.setattr(parallel_fetch, 'get_read_connection_with_dsn', lambda: (_Connection(), 'replica'))
+    monkeypatch.setattr(parallel_fetch, 'get_read_connection', lambda dsn=None: _Connection())
+    monkeypatch.setattr(parallel_fetch, '_stats', lambda table: (len(ROWS), BOUNDARIES))
+    monkeypatch.setattr(parallel_fetch, '_budget', threading.BoundedSemaphore(3))
+
+
+def test_desc_merge_puts_null_dates_first():
+    rows = list(parallel_fetch.ParallelRows(SQL, {}, 'experiment_tab', order=1, reverse=True, degree=3))
+    dates = [date for _, date in rows]
+    assert dates[:2] == [None, None]
+    assert dates[2:] == sorted(dates[2:], reverse=True)
+    assert sorted(row[0] for row in rows) == list(range(1, 10))
+
+
+def test_dead_range_worker_raises_instead_of_blocking(monkeypatch):
+    monkeypatch.setattr(parallel_fetch.ParallelRows, '_run_range', lambda self, sql, binds, q, slot: None)
+    with pytest.raises(RuntimeError):
+        parallel_fetch.ParallelRows(SQL, {}, 'experiment_tab', order=1, reverse=True, degree=3)
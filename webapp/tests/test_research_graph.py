@@ -0,0 +1,77 @@
+"""Operation 5 from the research graph must match func_list_fw_for_top_researchers.
+
+The graph is loaded by research_graph._load() from a fake connection serving
+the op5 fixture of conftest.py; the expected rows are what the SQL function returns on the
+same data (columns researcher_cf, name, surname, future_work_id, title,
+ordered by surname, name, future_work_id). With ORACLE_TESTS=1 the two paths
+are also compared on the configured database.
+"""
+import os
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+import research_graph
+
+# CFs of the conftest fixture
+R = [f'R{i:015d}' for i in range(7)]
+
+
+class _Cursor:
+    arraysize = prefetchrows = None
+
+    def __init__(self, tables):
+        self.tables = tables
+
+    def execute(self, sql):
+        self.rows = next(rows for table, rows in self.tables.items() if f'FROM {table}' in sql)
+
+    def fetchall(self):
+        return list(self.rows)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def close(self):
+        pass
+
+
+class _Connection:
+    def __init__(self, tables):
+        self.tables = tables
+
+    def cursor(self):
+        return _Cursor(self.tables)
+
+
+def test_op5_matches_sql_function(op5_tables, op5_expected):
+    assert research_graph._load(_Connection(op5_tables)).op5() == op5_expected
+
+
+def test_op5_after_merge_keeps_order(op5_tables):
+    graph = research_graph._load(_Connection(op5_tables))
+    merged = graph.merged([('consider', R[2], 10), ('writes', R[4], '10.1/p1')])
+    rows = merged.op5()
+    assert rows[0] == (R[2], 'Bruno', 'Bianchi', 10, 'FW ten')
+    assert (R[4], 'Dario', 'Verdi', 13, 'FW thirteen') == rows[-1]
+    assert rows == sorted(rows, key=research_graph.op5_order)
+
+
+@pytest.mark.skipif(os.getenv('ORACLE_TESTS') != '1', reason='needs a database (ORACLE_TESTS=1)')
+def test_op5_matches_sql_function_on_database():
+    from db import get_db_connection
+
+    conn = get_db_connection()
+    try:
+        graph_rows = research_graph._load(conn).op5()
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM TABLE(func_list_fw_for_top_researchers())")
+        sql_rows = [(cf.rstrip(), name, surname, fw, title) for cf, name, surname, fw, title in cursor]
+        cursor.close()
+    finally:
+        conn.close()
+    assert graph_rows == sorted(sql_rows, key=research_graph.op5_order)
+    # Same order up to ties on (surname, name, future_work_id), which the function leaves unordered
+    assert [research_graph.op5_order(row)[:5] for row in graph_rows] == \
+           [research_graph.op5_order(row)[:5] for row in sql_rows]